@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 30 15:10:44 2026
+
+@author: jrbrad
+
+Capital budgeting GA (capital_budgeting.py) against the greedy ratio
+heuristic of Assignments/cell_tower/solutions/cellTowerRatio.py on random
+instances with thousands of projects.  With one period cell_algo() itself
+is run, on a {project: (cost, npv)} dictionary, and the LP relaxation
+(greedy by ratio with the last project taken fractionally) bounds the best
+NPV; with several periods greedy() applies the same rule to every period.
+
+    python capital_bench.py --gens 100 --pop 100
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import capital_budgeting as cb
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'GA'))
+from galib import engine
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cell_tower', 'solutions'))
+from cellTowerRatio import cell_algo
+
+def lp_bound(npv, cost, budget):
+    ''' Best NPV of the LP relaxation with one budget '''
+    order = np.argsort(-npv/cost)
+    cum = np.cumsum(cost[order])
+    k = np.searchsorted(cum, budget, side='right')
+    bound = npv[order[:k]].sum()
+    if k < order.shape[0]:
+        bound += npv[order[k]] * (budget - (cum[k-1] if k > 0 else 0)) / cost[order[k]]
+    return bound
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Capital budgeting GA against the greedy ratio heuristic')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 5000])
+    parser.add_argument('--periods', type=int, nargs='+', default=[1, 3])
+    parser.add_argument('--pop', type=int, default=100)
+    parser.add_argument('--gens', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"projects":>8} {"periods":>7} {"greedy NPV":>12} {"s":>6} {"GA NPV":>12} {"s":>6} {"GA/greedy":>9} {"LP bound":>12}')
+    for num_proj in args.sizes:
+        for num_periods in args.periods:
+            npv, cost, budget = cb.random_instance(num_proj, num_periods, args.seed)
+            start = time.time()
+            if num_periods == 1:
+                _, picked, _ = cell_algo({j: (cost[j, 0], npv[j]) for j in range(num_proj)}, budget[0])
+                greedy_npv = npv[picked].sum()
+            else:
+                greedy_npv = cb.greedy(npv, cost, budget) @ npv
+            t_greedy = time.time() - start
+
+            start = time.time()
+            problem = cb.CapitalBudgeting(npv, cost, budget)
+            result = engine.run(problem, args.pop, args.gens, 'tournament', crossover='uniform',
+                                mutate_prob=1/num_proj, num_elite=2, seed=args.seed)
+            t_ga = time.time() - start
+            assert problem.feasible(result.best_soln)
+            bound = f'{lp_bound(npv, cost[:, 0], budget[0]):12.1f}' if num_periods == 1 else f'{"":>12}'
+            print(f'{num_proj:>8} {num_periods:>7} {greedy_npv:12.1f} {t_greedy:6.2f} {result.best_fit:12.1f} '
+                  f'{t_ga:6.2f} {result.best_fit/greedy_npv:9.4f} {bound}')
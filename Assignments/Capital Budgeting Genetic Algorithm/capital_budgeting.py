@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 30 09:34:18 2026
+
+@author: jrbrad
+
+Capital budgeting with a GA: choose projects, one 0/1 gene per project, to
+maximize total NPV while the capital spent in each period stays within that
+period's budget.  The problem runs on the galib engine (GA/galib), whose
+population, crossover and mutation follow fac_loc_ga.py:
+
+    fitness   pop @ npv, one matrix product for the whole population
+    repair    each solution over budget drops projects in one order
+              (random, or lowest NPV per unit of capital first) up to the
+              point along the cumulative cost where every period is within
+              budget, as fac_loc_ga.repair() does with one budget; with
+              fill=True it then adds the longest run of unselected projects,
+              best NPV per unit of capital first, that still fits
+
+cost has a row per project and a column per period; a single budget is a
+single column.
+
+    python capital_budgeting.py --projects 2000 --periods 3 --pop 100 --gens 200 --seed 0
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'GA'))
+from galib import engine, operators, trace
+
+def random_instance(num_proj, num_periods, seed, tightness=0.3):
+    ''' NPV, cost (num_proj x num_periods) and budgets of tightness times each period's total cost '''
+    rng = np.random.default_rng(seed)
+    cost = rng.uniform(1, 100, size=(num_proj, num_periods))
+    npv = cost.sum(axis=1) * rng.uniform(0.05, 0.5, size=num_proj) + rng.normal(0, 10, size=num_proj)
+    npv = np.maximum(npv, 1)
+    budget = tightness * cost.sum(axis=0)
+    return npv, cost, budget
+
+def _cumulative_cost(genes_sorted, cost_sorted, bound, at_least):
+    ''' For each solution (row of genes_sorted, 0/1 genes in some order) and
+        each position along the order, whether the cumulative cost of the
+        genes set up to that position is at least (or at most) bound in every
+        period; one 2D cumulative sum per period '''
+    ok = np.ones(genes_sorted.shape, dtype=bool)
+    for t in range(cost_sorted.shape[-1]):
+        cum = np.cumsum(genes_sorted * cost_sorted[..., t], axis=1)
+        ok &= cum >= bound[:, t:t+1] - 1e-9 if at_least else cum <= bound[:, t:t+1] + 1e-9
+    return ok
+
+class CapitalBudgeting(engine.Problem):
+    maximize = True
+
+    def __init__(self, npv, cost, budget, mode='greedy', fill=True):
+        self.npv, self.budget = npv, np.atleast_1d(budget)
+        self.cost = cost.reshape(npv.shape[0], -1)
+        self.mode, self.fill = mode, fill
+        self.ratio = npv / self.cost.sum(axis=1)
+        self.best_first = np.argsort(-self.ratio, kind='stable')
+        ''' expected cost of a random solution near the tightest budget '''
+        self.init_perc = min(1.0, (self.budget / self.cost.sum(axis=0)).min())
+
+    def encode(self, n, rng):
+        return (rng.random((n, self.npv.shape[0])) < self.init_perc).astype(np.float64)
+
+    def fitness(self, pop):
+        return pop @ self.npv
+
+    def repair(self, pop, rng):
+        spent = pop @ self.cost
+        over = np.flatnonzero((spent > self.budget).any(axis=1))
+        if over.size > 0:
+            sel = pop[over] == 1
+            if self.mode == 'random':
+                ''' unselected projects sort last '''
+                order = np.argsort(np.where(sel, rng.random(sel.shape), np.inf), axis=1)
+                sel_sorted = np.take_along_axis(sel, order, axis=1)
+                cost_sorted = self.cost[order]
+            else:
+                ''' the same order, worst NPV per unit of capital first, for every solution '''
+                order = np.broadcast_to(self.best_first[::-1], sel.shape)
+                sel_sorted = sel[:, self.best_first[::-1]]
+                cost_sorted = self.cost[self.best_first[::-1]]
+            ''' drop projects along the order up to the first one at which the
+                capital dropped covers the excess in every period '''
+            covered = _cumulative_cost(sel_sorted, cost_sorted, spent[over] - self.budget, True)
+            num_drop = covered.argmax(axis=1) + 1
+            rows, pos = np.nonzero(sel_sorted & (np.arange(sel.shape[1]) < num_drop[:, np.newaxis]))
+            pop[over[rows], order[rows, pos]] = 0
+        if self.fill:
+            self._fill(pop)
+
+    def _fill(self, pop):
+        ''' Add to every solution the longest run of its unselected projects,
+            best NPV per unit of capital first, that fits in the budget left '''
+        slack = self.budget - pop @ self.cost
+        free_sorted = pop[:, self.best_first] == 0
+        fits = _cumulative_cost(free_sorted, self.cost[self.best_first], slack, False)
+        num_add = np.where(fits.all(axis=1), fits.shape[1], fits.argmin(axis=1))
+        rows, pos = np.nonzero(free_sorted & (np.arange(pop.shape[1]) < num_add[:, np.newaxis]))
+        pop[rows, self.best_first[pos]] = 1
+
+    def mutate(self, pop, prob, rng):
+        operators.flip(pop, prob, rng)
+
+    def feasible(self, soln):
+        return bool((soln @ self.cost <= self.budget + 1e-9).all())
+
+def greedy(npv, cost, budget):
+    ''' Projects in order of NPV per unit of capital, each taken when it fits
+        in every period, as cellTowerRatio.py picks towers by calls per cost '''
+    cost = cost.reshape(npv.shape[0], -1)
+    spent = np.zeros(cost.shape[1])
+    soln = np.zeros(npv.shape[0])
+    for j in np.argsort(-npv / cost.sum(axis=1), kind='stable'):
+        if (spent + cost[j] <= budget).all():
+            spent += cost[j]
+            soln[j] = 1
+    return soln
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Capital budgeting GA')
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--periods', type=int, default=3)
+    parser.add_argument('--pop', type=int, default=100, help='population size')
+    parser.add_argument('--gens', type=int, default=200, help='number of generations')
+    parser.add_argument('--select', default='tournament', help='selection mode (galib/selection.py)')
+    parser.add_argument('--crossover', default='uniform', choices=list(operators.crossovers))
+    parser.add_argument('--mutate', type=float, default=None, help='mutation probability of a project (default 1/projects)')
+    parser.add_argument('--elite', type=int, default=2, help='best solutions kept unchanged')
+    parser.add_argument('--repair', default='greedy', choices=['random', 'greedy'])
+    parser.add_argument('--no-fill', action='store_true', help='only drop projects in the repair')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--trace', default=None, help='per-generation trace file (.jsonl or .csv)')
+    args = parser.parse_args()
+
+    npv, cost, budget = random_instance(args.projects, args.periods, args.seed)
+    problem = CapitalBudgeting(npv, cost, budget, args.repair, not args.no_fill)
+    mutate_prob = 1/args.projects if args.mutate is None else args.mutate
+
+    start = time.time()
+    tracer = trace.start(args.trace)
+    result = engine.run(problem, args.pop, args.gens, args.select, crossover=args.crossover,
+                        mutate_prob=mutate_prob, num_elite=args.elite, seed=args.seed, tracer=tracer)
+    if tracer:
+        print(tracer.close())
+    assert problem.feasible(result.best_soln)
+    print(f'GA: NPV {result.best_fit:.1f} with {int(result.best_soln.sum())} projects '
+          f'({time.time() - start:.2f} s)')
+    start = time.time()
+    soln = greedy(npv, cost, budget)
+    print(f'Greedy ratio: NPV {soln @ npv:.1f} with {int(soln.sum())} projects ({time.time() - start:.2f} s)')
@@ -5,8 +5,13 @@ Created on Fri Sep 29 11:38:18 2023
 @author: jrbrad
 """
 
+import os
+import sys
 import numpy as np
 import time
+import assignment_ops
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'GA'))
+from galib import engine, selection, trace
 
 def pop_gen(pop_size, num_tasks, num_workers):
     idx = np.random.randint(0, num_workers, size=(num_tasks*pop_size,))
@@ -14,60 +19,25 @@ def pop_gen(pop_size, num_tasks, num_workers):
     pop[np.repeat(np.arange(pop_size), num_tasks), np.tile(np.arange(num_tasks), pop_size), idx] = 1
     return pop
 
-def mutate(pop,mut_prob):
+def mutate(pop,mut_prob,kind='reassign'):
+    ''' Geometric-skip mutation of the whole population (assignment_ops.py) '''
+    assignment_ops.mutate(pop, mut_prob, kind)
     return
 
 def feasible(pop,calls_max):
-    for i in range(pop.shape[0]): # iterate over population members
-        for j in range(pop.shape[1]): # iterate over solution tasks
-            if sum(pop[i,j]) == 0:  # select random worker if task not assigned
-                pop[i,j,np.random.randint(0, num_workers)] = 1
-            elif sum(pop[i,j]) > 1: # pick from assigned workers if multiply assigned
-                idx = np.random.choice(np.nonzero(pop[i,j])[0])
-                pop[i,j] = 0
-                pop[i,j,idx] = 1
-    
-    for i in range(pop.shape[0]): # iterate over population members
-        for k in range(pop.shape[2]): # iterate over workers
-          num_calls = pop[i].sum(axis=0) # compute calls per worker
-          if (overage := num_calls[k] - calls_max) > 0: # check if worker assigned excess calls
-              wrkr_avail_calls = calls_max - num_calls # compute workers' remaining capacity
-              wrkr_avail = wrkr_avail_calls > 0 # create Boolean indicate of free workers
-              for w,wrkr in enumerate(wrkr_avail): # reassign worker excess calls
-                  if wrkr:
-                    # reassign calls to worker w
-                    num_reassign = int(min(overage, wrkr_avail_calls[w])) 
-                    idx_reassign = np.random.choice(np.arange(num_tasks)[pop[i,:,k]==1],size=num_reassign,replace=False)
-                    pop[i][idx_reassign,w] = 1
-                    pop[i][idx_reassign,k] = 0
-                    # recompute overage for worker k
-                    overage -= num_reassign
-        if np.any(pop[i].sum(axis=0) > calls_max):
-            print('error')
-    return 
+    ''' Batched repair of the whole population; assignment_ops.repair_loop() is the loop version '''
+    assignment_ops.repair(pop, calls_max)
+    if np.any(pop.sum(axis=1) > calls_max):
+        print('error')
+    return
 
 def fit_calc(task_time, pop):
     #return (task_time * pop).sum(axis=(1,2))
     return np.einsum('ijk,jk->i', pop, task_time)
 
-def select(fit, mode, q, elitism, num_elite=5):
-    
-    if mode == 'proportional':
-        #prob = (fit.max() - fit)/(fit.max() - fit).sum()
-        prob = (1/fit)/(1/fit).sum()
-    elif mode == 'rank_linear':
-        rank = np.zeros(pop.shape[0])
-        rank[np.argsort(fit)] = np.flip(np.arange(pop.shape[0]))
-        prob = (1 + rank)/(1+rank).sum()
-    elif mode == 'rank_nonlinear':
-        if q>1 or q<0:
-            print(f'Error in specifying q: {q}')
-        else:
-            rank = np.zeros(pop.shape[0])
-            rank[np.argsort(fit)] = np.arange(pop.shape[0])
-            prob = q**rank/(q**rank).sum()
-    else:
-        print(f'Error in specifying selection mode: {mode}')
+def select(fit, mode, q, elitism, num_elite=5, sampler='alias'):
+    ''' Parents from galib/selection.py; sampler is 'alias', 'sus' or 'choice' '''
+    parents = selection.select(fit, mode, 2*fit.shape[0], q, sampler, maximize=False)
     
     ''' old rank-linear 
     # Use rank-linear for selection
@@ -80,11 +50,10 @@ def select(fit, mode, q, elitism, num_elite=5):
     parents = np.sum(rv[:,np.newaxis] > prob,axis=1) '''
     
     if elitism:
-        parents = np.random.choice(np.arange(pop.shape[0]), size=(2*pop.shape[0]), p = prob)
-        pop2save = np.argsort(fit)[-5:]
+        ''' the num_elite smallest task times, in O(n) (galib/engine.py) '''
+        pop2save = engine.elite(fit, num_elite, maximize=False)
     else:
-        parents = np.random.choice(np.arange(pop.shape[0]), size=(2*pop.shape[0]), p = prob)
-        pop2save = np.array([])
+        pop2save = np.zeros(0, dtype=np.int64)
     return parents, pop2save
 
 def crossover(pop, parents, elitism, pop2save):
@@ -99,9 +68,8 @@ def crossover(pop, parents, elitism, pop2save):
     pop_new = np.concatenate(pop_new)
     pop_new = pop_new.reshape((-1, *shape[1:]))
     if elitism:
-        pop_new = np.concatenate((pop_new,pop[pop2save].copy()), axis=0)
-    pop[0] = pop_new[0]
-    pop[1:] = pop_new[1:]
+        pop[pop_new.shape[0]:] = pop[pop2save]
+    pop[:pop_new.shape[0]] = pop_new
     
     return
 
@@ -118,9 +86,8 @@ def crossover_col(pop, parents, elitism, pop2save):
     pop_new = np.concatenate(pop_new, axis=1)
     pop_new = pop_new.reshape((-1, *shape[1:]))
     if elitism:
-        pop_new = np.concatenate((pop_new,pop[pop2save].copy()), axis=0)
-    pop[0] = pop_new[0]
-    pop[1:] = pop_new[1:]
+        pop[pop_new.shape[0]:] = pop[pop2save]
+    pop[:pop_new.shape[0]] = pop_new
     
     return
 
@@ -136,9 +103,8 @@ def crossover_flat(pop, parents, elitism, pop2save):
     pop_new = np.concatenate(pop_new)
     pop_new = pop_new.reshape((-1, *shape[1:]))
     if elitism:
-        pop_new = np.concatenate((pop_new,pop[pop2save].copy()), axis=0)
-    pop[0] = pop_new[0] # this and the next statement to avoid creating a function scope pop
-    pop[1:] = pop_new[1:]
+        pop[pop_new.shape[0]:] = pop[pop2save]
+    pop[:pop_new.shape[0]] = pop_new # in place to avoid creating a function scope pop
     
     return
 
@@ -154,6 +120,12 @@ elitism = False
 results = []
 rep=0
 num_elite = 5
+encoding = 'onehot' # 'int': one int16 worker index per task (assignment_ops.py)
+crossover_kind = 'one_point' # 'two_point', 'uniform'
+mutate_kind = 'reassign' # 'swap': exchange the workers of two tasks
+sampler = 'alias' # 'sus', 'choice'; select_mode may also be 'tournament' (galib/selection.py)
+trace_file = None # e.g. 'results/trace.jsonl' or '.csv': per-generation operator times (galib/trace.py)
+trace_memory = False # also trace memory with tracemalloc (slow)
 
 start = time.time()
 
@@ -162,25 +134,52 @@ tt = np.genfromtxt('task_time_data.csv', delimiter=',').astype(np.int16)
 num_tasks, num_workers = tt.shape
 
 # Generate initial population
-pop = pop_gen(pop_size, num_tasks, num_workers)
-fitness = fit_calc(tt, pop)
+if encoding == 'int':
+    pop = assignment_ops.pop_gen_int(pop_size, num_tasks, num_workers)
+    assignment_ops.repair_int(pop, calls_max, num_workers) # the elite must start feasible
+    fitness = assignment_ops.fit_calc_int(tt, pop)
+else:
+    pop = pop_gen(pop_size, num_tasks, num_workers)
+    feasible(pop,calls_max) # the elite must start feasible
+    fitness = fit_calc(tt, pop)
+pop_buf = assignment_ops.PopBuffer(pop, num_workers) # current/next population for crossover
 results.append((fitness.min(),fitness.min(),fitness.mean()))
 
+tracer = trace.start(trace_file, trace_memory)
+if tracer:
+    tracer.instrument(globals(), ['select'])
+    pop_buf.crossover = tracer.wrap('crossover', pop_buf.crossover)
+    if encoding == 'int':
+        tracer.instrument(vars(assignment_ops), ['mutate_int', 'repair_int', 'fit_calc_int'])
+    else:
+        tracer.instrument(globals(), ['mutate', 'feasible', 'fit_calc'])
 
 for i in range(num_gen):
     # execute one generation
-    parents,pop2save = select(fitness, select_mode, q, elitism, num_elite)
-    #crossover(pop, parents, elitism, pop2save)
-    #crossover_col(pop, parents, elitism, pop2save)
-    crossover_flat(pop, parents, elitism, pop2save)
-    mutate(pop,mutate_prob)
-    feasible(pop,calls_max)
-    fitness = fit_calc(tt, pop)
+    parents,pop2save = select(fitness, select_mode, q, elitism, num_elite, sampler)
+    num_child = pop_size - pop2save.shape[0] # the elite fills the rows after the children
+    if encoding == 'int':
+        pop = pop_buf.crossover(parents, elitism, pop2save, 'flatten', crossover_kind)
+        assignment_ops.mutate_int(pop[:num_child], mutate_prob, num_workers, mutate_kind)
+        assignment_ops.repair_int(pop[:num_child], calls_max, num_workers)
+        fitness = assignment_ops.fit_calc_int(tt, pop)
+    else:
+        #crossover(pop, parents, elitism, pop2save)
+        #crossover_col(pop, parents, elitism, pop2save)
+        #crossover_flat(pop, parents, elitism, pop2save)
+        pop = pop_buf.crossover(parents, elitism, pop2save, 'flatten', crossover_kind)
+        mutate(pop[:num_child],mutate_prob,mutate_kind)
+        feasible(pop[:num_child],calls_max)
+        fitness = fit_calc(tt, pop)
     results.append((fitness.min(),min(fitness.min(),results[-1][1]),fitness.mean()))
     print(results[-1][1])
+    if tracer:
+        tracer.generation(i, best=results[-1][0], best_so_far=results[-1][1], mean=results[-1][2])
     
 
 results= np.array(results)
-np.savetxt(f'results/{select_mode}_{pop_size}_{num_gen}_{rep}_'+'crossflat'+'.txt',results)
+np.savetxt(f'results/{select_mode}_{pop_size}_{num_gen}_{rep}_'+'crossflat'+('_int' if encoding == 'int' else '')+'.txt',results)
+if tracer:
+    print(tracer.close())
 print(f'Execution time: {time.time()-start} seconds')
     
\ No newline at end of file
@@ -5,8 +5,13 @@ Created on Fri Sep 29 11:38:18 2023
 @author: jrbrad
 """
 
+import os
+import sys
 import numpy as np
 import time
+import assignment_ops
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'GA'))
+from galib import engine, selection
 
 def pop_gen(pop_size, num_tasks, num_workers):
     idx = np.random.randint(0, num_workers, size=(num_tasks*pop_size,))
@@ -14,58 +19,30 @@ def pop_gen(pop_size, num_tasks, num_workers):
     pop[np.repeat(np.arange(pop_size), num_tasks), np.tile(np.arange(num_tasks), pop_size), idx] = 1
     return pop
 
-def mutate(pop,mut_prob):
+def mutate(pop,mut_prob,kind='reassign'):
+    ''' Geometric-skip mutation of the whole population (assignment_ops.py) '''
+    assignment_ops.mutate(pop, mut_prob, kind)
     return
 
 def make_feasible(pop,calls_max):
-    for i in range(pop.shape[0]):
-        for j in range(pop.shape[1]):
-            if sum(pop[i,j]) == 0:
-                pop[i,j,np.random.randint(0, num_workers)] = 1
-            elif sum(pop[i,j]) > 1:
-                idx = np.random.choice(np.nonzero(pop[i,j])[0])
-                pop[i,j] = 0
-                pop[i,j,idx] = 1
-    
-    for i in range(pop.shape[0]):
-        for k in range(pop.shape[2]):
-          num_calls = pop[i].sum(axis=0)
-          if (overage := num_calls[k] - calls_max) > 0:
-              wrkr_avail_calls = calls_max - num_calls
-              wrkr_avail = wrkr_avail_calls > 0
-              for w,wrkr in enumerate(wrkr_avail):
-                  if wrkr:
-                    num_reassign = int(min(overage, wrkr_avail_calls[w]))
-                    idx_reassign = np.random.choice(np.arange(num_tasks)[pop[i,:,k]==1],size=num_reassign,replace=False)
-                    pop[i][idx_reassign,w] = 1
-                    pop[i][idx_reassign,k] = 0
-                    overage -= num_reassign
-        if np.any(pop[i].sum(axis=0) > calls_max):
-            print('error')
-    return 
+    ''' Batched repair of the whole population; assignment_ops.repair_loop() is the loop version '''
+    assignment_ops.repair(pop, calls_max)
+    if np.any(pop.sum(axis=1) > calls_max):
+        print('error')
+    return
 
 def fit_calc(task_time, pop):
     return (task_time * pop).sum(axis=(1,2))
 
-def select(fit, mode, q, elitism, num_elite=5):
-    
+def select(fit, mode, q, elitism, num_elite=5, sampler='alias'):
+    ''' Parents from galib/selection.py; sampler is 'alias', 'sus' or 'choice' '''
     if mode == 'proportional':
+        ''' distance below the worst fitness rather than the 1/fit of selection.py '''
         epsilon = 0.001
         prob = (fit.max() - fit + epsilon)/(fit.max() - fit + epsilon).sum()
-        #prob = (1/fit)/(1/fit).sum()
-    elif mode == 'rank_linear':
-        rank = np.zeros(pop.shape[0])
-        rank[np.argsort(fit)] = np.flip(np.arange(pop.shape[0]))
-        prob = (1 + rank)/(1+rank).sum()
-    elif mode == 'rank_nonlinear':
-        if q>1 or q<0:
-            print(f'Error in specifying q: {q}')
-        else:
-            rank = np.zeros(pop.shape[0])
-            rank[np.argsort(fit)] = np.arange(pop.shape[0])
-            prob = q**rank/(q**rank).sum()
+        parents = selection.sample(prob, 2*fit.shape[0], sampler)
     else:
-        print(f'Error in specifying selection mode: {mode}')
+        parents = selection.select(fit, mode, 2*fit.shape[0], q, sampler, maximize=False)
     
     ''' old rank-linear 
     # Use rank-linear for selection
@@ -78,11 +55,10 @@ def select(fit, mode, q, elitism, num_elite=5):
     parents = np.sum(rv[:,np.newaxis] > prob,axis=1) '''
     
     if elitism:
-        parents = np.random.choice(np.arange(pop.shape[0]), size=(2*pop.shape[0]), p = prob)
-        pop2save = np.argsort(fit)[-5:]
+        ''' the num_elite smallest task times, in O(n) (galib/engine.py) '''
+        pop2save = engine.elite(fit, num_elite, maximize=False)
     else:
-        parents = np.random.choice(np.arange(pop.shape[0]), size=(2*pop.shape[0]), p = prob)
-        pop2save = np.array([])
+        pop2save = np.zeros(0, dtype=np.int64)
     return parents, pop2save
 
 def crossover(pop, parents, elitism, pop2save, mode):
@@ -119,9 +95,8 @@ def crossover(pop, parents, elitism, pop2save, mode):
     pop_new = pop_new.reshape((-1, *shape[1:]))
         
     if elitism:
-        pop_new = np.concatenate((pop_new,pop[pop2save].copy()), axis=0)
-    pop[0] = pop_new[0] # this and the next statement to avoid creating a function scope pop
-    pop[1:] = pop_new[1:]
+        pop[pop_new.shape[0]:] = pop[pop2save]
+    pop[:pop_new.shape[0]] = pop_new # in place to avoid creating a function scope pop
     
     return
 
@@ -140,43 +115,66 @@ elitism = [False]
 crossover_mode = 'flatten' #['task', 'worker', 'flatten']
 num_elite = 5
 reps = 10 #2
+encoding = 'onehot' # 'int': one int16 worker index per task (assignment_ops.py)
+crossover_kind = 'one_point' # 'two_point', 'uniform'
+mutate_kind = 'reassign' # 'swap': exchange the workers of two tasks
+sampler = 'alias' # 'sus', 'choice'; select_mode may also be 'tournament' (galib/selection.py)
+
+def run_ga(tt, select_mode, pop_size, e, q, verbose=True):
+    ''' One replicate with the settings above; returns an array with one row
+        (best of generation, best so far, mean) per generation '''
+    num_tasks, num_workers = tt.shape
+    data_run = []
+    # Generate initial population
+    if encoding == 'int':
+        pop = assignment_ops.pop_gen_int(pop_size, num_tasks, num_workers)
+        assignment_ops.repair_int(pop, calls_max, num_workers) # the elite must start feasible
+        fitness = assignment_ops.fit_calc_int(tt, pop)
+    else:
+        pop = pop_gen(pop_size, num_tasks, num_workers)
+        make_feasible(pop,calls_max) # the elite must start feasible
+        fitness = fit_calc(tt, pop)
+    pop_buf = assignment_ops.PopBuffer(pop, num_workers) # current/next population for crossover
+    data_run.append((fitness.min(),fitness.min(),fitness.mean()))
+
+    for i in range(num_gen):
+        # execute one generation
+        parents,pop2save = select(fitness, select_mode, q, e, num_elite, sampler)
+        num_child = pop_size - pop2save.shape[0] # the elite fills the rows after the children
+        if encoding == 'int':
+            pop = pop_buf.crossover(parents, e, pop2save, crossover_mode, crossover_kind)
+            assignment_ops.mutate_int(pop[:num_child], mutate_prob, num_workers, mutate_kind)
+            assignment_ops.repair_int(pop[:num_child], calls_max, num_workers)
+            fitness = assignment_ops.fit_calc_int(tt, pop)
+        else:
+            pop = pop_buf.crossover(parents, e, pop2save, crossover_mode, crossover_kind)
+            mutate(pop[:num_child],mutate_prob,mutate_kind)
+            make_feasible(pop[:num_child],calls_max)
+            fitness = fit_calc(tt, pop)
+        data_run.append((fitness.min(),min(fitness.min(),data_run[-1][1]),fitness.mean()))
+        if verbose:
+            print(data_run[-1][1])
+    return np.array(data_run)
+
+if __name__ == '__main__':
+    start = time.time()
+
+    # Input task time matrix
+    tt = np.genfromtxt('task_time_data.csv', delimiter=',').astype(np.int16)
+
+    results = []
+
+    for j,select_mode in enumerate(select_alts):
+        for pop_size in pop_sizes:
+            for e in elitism:
+                for q in qs[j]:
+                    results.append([select_mode, crossover_mode, pop_size, e, q])
+                    for rep in range(reps):
+                        data_run = run_ga(tt, select_mode, pop_size, e, q)
+                        results[-1].append(data_run[-1][1])
+                        np.savetxt(f'results/{select_mode}_{pop_size}_{num_gen}_{crossover_mode}_{"_elite" if e else ""}_{int(q*1000)}_{rep}{"_int" if encoding == "int" else ""}.txt',data_run)
+                        print(f'Execution time: {time.time()-start} seconds')
 
-start = time.time()
-
-# Input task time matrix
-tt = np.genfromtxt('task_time_data.csv', delimiter=',').astype(np.int16)
-num_tasks, num_workers = tt.shape
-
-results = []
-
-for j,select_mode in enumerate(select_alts):
-    for pop_size in pop_sizes:
-        for e in elitism:
-            for q in qs[j]:
-                results.append([select_mode, crossover_mode, pop_size, e, q])
-                for rep in range(reps):
-                    data_run = []
-                    # Generate initial population
-                    pop = pop_gen(pop_size, num_tasks, num_workers)
-                    fitness = fit_calc(tt, pop)
-                    data_run.append((fitness.min(),fitness.min(),fitness.mean()))
-                               
-                    for i in range(num_gen):
-                        # execute one generation
-                        parents,pop2save = select(fitness, select_mode, q, e, num_elite)
-                        crossover(pop, parents, e, pop2save, crossover_mode)
-                        make_feasible(pop,calls_max)
-                        mutate(pop,mutate_prob)
-                        fitness = fit_calc(tt, pop)
-                        data_run.append((fitness.min(),min(fitness.min(),data_run[-1][1]),fitness.mean()))
-                        print(data_run[-1][1])
-                        
-                    
-                    results[-1].append(data_run[-1][1])
-                    data_run= np.array(data_run)
-                    np.savetxt(f'results/{select_mode}_{pop_size}_{num_gen}_{crossover_mode}_{"_elite" if e else ""}_{int(q*1000)}_{rep}.txt',data_run)
-                    print(f'Execution time: {time.time()-start} seconds')
-
-results = '\n'.join([','.join([str(y) for y in x]) for x in results])
-with open('results/result_crossover1.csv', 'w') as f:
-    f.write(results)
\ No newline at end of file
+    results = '\n'.join([','.join([str(y) for y in x]) for x in results])
+    with open('results/result_crossover1.csv', 'w') as f:
+        f.write(results)
\ No newline at end of file
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 24 10:18:44 2026
+
+@author: jrbrad
+
+Population operators for the worker-task assignment GA that work on the
+whole population at once.  A population is an array of shape
+(pop_size, num_tasks, num_workers) where pop[i,j,k] == 1 assigns task j to
+worker k in solution i.
+
+repair() makes every solution feasible with the same random choices as the
+loops in feasible(): a task assigned to no worker goes to a random worker,
+a task assigned to several workers keeps one of them at random, and each
+worker over calls_max gives randomly chosen tasks to the workers with spare
+capacity, lowest worker index first.  repair_loop() is the original loop
+version, kept for comparison in ops_bench.py.
+
+The *_int operators use a compact encoding instead: an int16 array of shape
+(pop_size, num_tasks) holding the worker of each task, which takes
+num_workers*4 times less memory than the float64 one-hot array and turns
+the fitness into a gather.  Every task always has exactly one worker, so
+repair_int() only enforces calls_max.
+
+PopBuffer does crossover without building children from slices: the
+second parents are gathered into a preallocated next population, the first
+parents into the work array first, and the genes of the first parent are
+copied from first into the children through a mask of crossover points,
+after which the current and next populations swap places.  With the int
+encoding the masks, one per parent, say whether the one-hot gene of each
+task's worker is kept, and the tasks that this leaves unassigned or
+multiply assigned are resolved with the same random choices as repair().
+
+mutate() and mutate_int() draw the mutated tasks of the whole population
+at once as geometric gaps between mutation sites in the flattened
+(pop_size, num_tasks) index, so their cost grows with the number of
+mutations rather than with pop_size*num_tasks.  A site either gets a
+different worker ('reassign') or swaps workers with another task of the
+same solution ('swap', which keeps every worker's number of calls).
+"""
+
+import numpy as np
+
+def mutation_sites(n, prob):
+    ''' Sorted indices in range(n), each included with probability prob, from
+        geometric gaps between consecutive sites '''
+    if prob <= 0 or n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if prob >= 1:
+        return np.arange(n)
+    expected = n * prob
+    sites = np.cumsum(np.random.geometric(prob, size=int(expected + 5*np.sqrt(expected) + 10))) - 1
+    while sites[-1] < n:
+        more = np.cumsum(np.random.geometric(prob, size=sites.size)) + sites[-1]
+        sites = np.concatenate((sites, more))
+    return sites[:np.searchsorted(sites, n)]
+
+def _swap_tasks(pop, sol, task):
+    ''' Swap the worker of each (sol, task) with that of a random other task of
+        the same solution; swaps that share a task wait for a later round so
+        that every swap moves workers between exactly two tasks '''
+    num_tasks = pop.shape[1]
+    other = (task + np.random.randint(1, max(2, num_tasks), size=task.size)) % num_tasks
+    while sol.size > 0:
+        keys = np.concatenate((sol*num_tasks + task, sol*num_tasks + other))
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        owner = np.full(uniq.size, sol.size)
+        swap = np.tile(np.arange(sol.size), 2)
+        np.minimum.at(owner, inverse, swap)
+        go = (owner[inverse[:sol.size]] == swap[:sol.size]) & (owner[inverse[sol.size:]] == swap[:sol.size])
+        s, t, o = sol[go], task[go], other[go]
+        pop[s, t], pop[s, o] = pop[s, o], pop[s, t]
+        sol, task, other = sol[~go], task[~go], other[~go]
+
+def mutate(pop, mut_prob, kind='reassign'):
+    ''' Mutate each task of the one-hot pop with probability mut_prob, in place
+        kind: 'reassign' gives the task a different worker
+              'swap' exchanges its worker with that of another task '''
+    pop_size, num_tasks, num_workers = pop.shape
+    sol, task = np.divmod(mutation_sites(pop_size*num_tasks, mut_prob), num_tasks)
+    if kind == 'reassign':
+        worker = pop[sol, task].argmax(axis=1)
+        pop[sol, task] = 0
+        pop[sol, task, (worker + np.random.randint(1, max(2, num_workers), size=sol.size)) % num_workers] = 1
+    elif kind == 'swap':
+        _swap_tasks(pop, sol, task)
+    else:
+        print(f'Error in specifying mutation kind: {kind}')
+    return
+
+def _one_worker(pop):
+    ''' Worker of every task after fixing unassigned and multiply assigned tasks '''
+    assigned = pop > 0
+    worker = assigned.argmax(axis=2)
+    bad = assigned.sum(axis=2) != 1
+    if bad.any():
+        ''' Random keys pick uniformly among the assigned workers, or among all
+            workers when a task has none '''
+        keys = np.random.random((int(bad.sum()), pop.shape[2]))
+        keys[assigned[bad]] += 1
+        worker[bad] = keys.argmax(axis=1)
+    return worker
+
+def _group_rank(group, keys):
+    ''' Rank of each element within its group in increasing order of keys in [0, 1) '''
+    order = np.argsort(group + keys)
+    sorted_group = group[order]
+    start = np.flatnonzero(np.r_[True, sorted_group[1:] != sorted_group[:-1]])
+    counts = np.diff(np.r_[start, group.size])
+    rank = np.empty(group.size, dtype=np.int64)
+    rank[order] = np.arange(group.size) - np.repeat(start, counts)
+    return rank
+
+def _rebalance(worker, num_workers, calls_max, rng=np.random):
+    ''' Move the excess tasks of workers over calls_max, in place on the
+        (pop_size, num_tasks) worker indices; rng is np.random or a Generator '''
+    pop_size, num_tasks = worker.shape
+    sol = np.repeat(np.arange(pop_size), num_tasks)
+    group = sol*num_workers + worker.ravel()
+    load = np.bincount(group, minlength=pop_size*num_workers).reshape(pop_size, num_workers)
+    excess = np.maximum(load - calls_max, 0)
+    if not excess.any():
+        return
+    ''' A random excess[k] of the tasks of each overloaded worker k must move '''
+    rank = _group_rank(group, rng.random(group.size))
+    moving = np.flatnonzero(rank < excess.ravel()[group])
+    ''' Moving tasks in order of solution and old worker, as the loops visit
+        them, and in random order within each worker '''
+    moving = moving[np.lexsort((rank[moving], group[moving]))]
+    move_sol = sol[moving]
+
+    ''' The m-th moving task of a solution takes the m-th free slot of that
+        solution, counting the free slots of workers in index order '''
+    free = np.maximum(calls_max - load, 0)
+    total_free = free.sum(axis=1)
+    slot_end = np.cumsum(free.ravel())
+    slot_start = slot_end.reshape(pop_size, num_workers)[:, -1] - total_free
+    first = np.searchsorted(move_sol, np.arange(pop_size))
+    m = np.arange(moving.size) - first[move_sol]
+    ''' Tasks beyond the free capacity of their solution stay where they are '''
+    fits = m < total_free[move_sol]
+    moving, m, move_sol = moving[fits], m[fits], move_sol[fits]
+    target = np.searchsorted(slot_end, slot_start[move_sol] + m, side='right')
+    np.put(worker, moving, target - move_sol*num_workers)
+
+def repair(pop, calls_max):
+    ''' Make every solution in pop feasible in place '''
+    pop_size, num_tasks, num_workers = pop.shape
+    worker = _one_worker(pop)
+    _rebalance(worker, num_workers, calls_max)
+    pop[...] = 0
+    pop[np.arange(pop_size)[:, np.newaxis], np.arange(num_tasks), worker] = 1
+    return
+
+def repair_loop(pop, calls_max):
+    ''' Original loop version of repair(), one solution, task and worker at a time '''
+    num_tasks, num_workers = pop.shape[1], pop.shape[2]
+    for i in range(pop.shape[0]): # iterate over population members
+        for j in range(pop.shape[1]): # iterate over solution tasks
+            if sum(pop[i,j]) == 0:  # select random worker if task not assigned
+                pop[i,j,np.random.randint(0, num_workers)] = 1
+            elif sum(pop[i,j]) > 1: # pick from assigned workers if multiply assigned
+                idx = np.random.choice(np.nonzero(pop[i,j])[0])
+                pop[i,j] = 0
+                pop[i,j,idx] = 1
+
+    for i in range(pop.shape[0]): # iterate over population members
+        for k in range(pop.shape[2]): # iterate over workers
+          num_calls = pop[i].sum(axis=0) # compute calls per worker
+          if (overage := num_calls[k] - calls_max) > 0: # check if worker assigned excess calls
+              wrkr_avail_calls = calls_max - num_calls # compute workers' remaining capacity
+              wrkr_avail = wrkr_avail_calls > 0 # create Boolean indicate of free workers
+              for w,wrkr in enumerate(wrkr_avail): # reassign worker excess calls
+                  if wrkr:
+                    # reassign calls to worker w
+                    num_reassign = int(min(overage, wrkr_avail_calls[w]))
+                    idx_reassign = np.random.choice(np.arange(num_tasks)[pop[i,:,k]==1],size=num_reassign,replace=False)
+                    pop[i][idx_reassign,w] = 1
+                    pop[i][idx_reassign,k] = 0
+                    # recompute overage for worker k
+                    overage -= num_reassign
+    return
+
+class PopBuffer:
+    ''' Current and next population, one-hot or int encoded, with work space
+        for crossover; crossover() fills the next population and swaps it
+        with the current one.  An int encoded pop needs num_workers '''
+    def __init__(self, pop, num_workers=None):
+        self.pop = pop
+        self.next = np.empty_like(pop)
+        self.first = np.empty_like(pop)
+        pop_size, num_tasks = pop.shape[:2]
+        if pop.ndim == 3:
+            num_workers = pop.shape[2]
+            self.mask = np.empty((pop_size, num_tasks*num_workers), dtype=bool)
+        else:
+            self.mask = np.empty((pop_size, num_tasks), dtype=bool)
+            self.mask3 = np.empty_like(self.mask)
+            self.pos = np.empty((pop_size, num_tasks), dtype=np.intp)
+            self.task_pos = np.arange(num_tasks) * num_workers
+            self.row_pos = np.arange(pop_size)[:, np.newaxis] * num_workers
+        self.mask2 = np.empty_like(self.mask)
+        self.num_workers = num_workers
+
+    def _mask(self, num_child, mode, kind):
+        ''' True where a child takes its genes from the first parent, shaped to
+            broadcast against (num_child, num_tasks, num_workers) '''
+        pop_size, num_tasks, num_workers = self.pop.shape
+        units = {'task': num_tasks, 'worker': num_workers, 'flatten': num_tasks*num_workers}[mode]
+        mask = self.mask[:num_child, :units]
+        pos = np.arange(units)
+        if kind == 'one_point':
+            np.less(pos, np.random.randint(0, units, size=(num_child, 1)), out=mask)
+        elif kind == 'two_point':
+            cut = np.sort(np.random.randint(0, units, size=(num_child, 2)), axis=1)
+            np.less(pos, cut[:, :1], out=mask)
+            np.greater_equal(pos, cut[:, 1:], out=self.mask2[:num_child, :units])
+            mask |= self.mask2[:num_child, :units]
+        elif kind == 'uniform':
+            mask[...] = np.random.randint(0, 2, size=(num_child, units), dtype=bool)
+        else:
+            raise ValueError(f'unknown crossover kind {kind!r}')
+        if mode == 'task':
+            return mask[:, :, np.newaxis]
+        elif mode == 'worker':
+            return mask[:, np.newaxis, :]
+        return mask.reshape(num_child, num_tasks, num_workers)
+
+    def _gene_pos(self, parent, mode):
+        ''' Position of the one-hot gene of each task's worker in parent among
+            the units that the crossover points cut '''
+        num_child, num_tasks = parent.shape
+        if mode == 'task':
+            return np.arange(num_tasks)
+        elif mode == 'worker':
+            return parent
+        return np.add(parent, self.task_pos, out=self.pos[:num_child])
+
+    def _before(self, pos, cut, out):
+        ''' True in out where pos is before the crossover point, or outside the
+            two points, of each row of cut '''
+        np.less(pos, cut[:, :1], out=out)
+        if cut.shape[1] == 2:
+            work = self.mask3[:out.shape[0]]
+            np.greater_equal(pos, cut[:, 1:], out=work)
+            out |= work
+
+    def _kept_int(self, first, second, mode, kind):
+        ''' Whether the one-hot gene of the worker of each task of the first
+            and of the second parent is kept, in mask and mask2 '''
+        num_child, num_tasks = first.shape
+        from_a, from_b = self.mask[:num_child], self.mask2[:num_child]
+        units = {'task': num_tasks, 'worker': self.num_workers, 'flatten': num_tasks*self.num_workers}.get(mode)
+        if units is None:
+            raise ValueError(f'unknown crossover mode {mode!r}')
+        if kind in ('one_point', 'two_point'):
+            cut = np.random.randint(0, units, size=(num_child, 1 if kind == 'one_point' else 2))
+            cut.sort(axis=1)
+            self._before(self._gene_pos(first, mode), cut, from_a)
+            self._before(self._gene_pos(second, mode), cut, from_b)
+            np.logical_not(from_b, out=from_b)
+        elif kind == 'uniform':
+            if mode == 'worker':
+                coin = np.random.randint(0, 2, size=(num_child, self.num_workers), dtype=bool).ravel()
+                pos = self.pos[:num_child]
+                np.take(coin, np.add(first, self.row_pos[:num_child], out=pos), out=from_a)
+                np.take(coin, np.add(second, self.row_pos[:num_child], out=pos), out=from_b)
+                np.logical_not(from_b, out=from_b)
+            else:
+                ''' No two tasks share a gene, so only the genes of the parents'
+                    workers are drawn, one coin when both have the same worker '''
+                from_a[...] = np.random.randint(0, 2, size=(num_child, num_tasks), dtype=bool)
+                np.logical_not(from_a, out=from_b)
+                if mode == 'flatten':
+                    other = np.flatnonzero(np.not_equal(first, second, out=self.mask3[:num_child]))
+                    from_b.flat[other] = np.random.randint(0, 2, size=other.size, dtype=bool)
+        else:
+            raise ValueError(f'unknown crossover kind {kind!r}')
+        return from_a, from_b
+
+    def _crossover_int(self, child, first, mode, kind):
+        ''' Worker of each task of the int encoded children, in place on child,
+            which holds the second parents: that of the first parent where only
+            its gene is kept, that of the second where only its gene is, one of
+            them at random where both are and a random worker where neither is '''
+        from_a, from_b = self._kept_int(first, child, mode, kind)
+        work = self.mask3[:child.shape[0]]
+        np.logical_not(from_b, out=work)
+        work &= from_a
+        np.copyto(child, first, where=work)
+        both = np.flatnonzero(np.logical_and(from_a, from_b, out=work))
+        both = both[np.random.random(both.size) < 0.5]
+        child.flat[both] = first.flat[both]
+        neither = np.flatnonzero(np.logical_not(np.logical_or(from_a, from_b, out=work), out=work))
+        child.flat[neither] = np.random.randint(0, self.num_workers, size=neither.size)
+
+    def crossover(self, parents, elitism, pop2save, mode='flatten', kind='one_point'):
+        ''' Children of parents[2*i] and parents[2*i+1], then the elite pop2save
+            when elitism is True, as the next population
+            mode: 'task', 'worker' or 'flatten' (cut points over tasks, workers
+                  or the flattened one-hot array)
+            kind: 'one_point', 'two_point' or 'uniform'
+            returns the new current population '''
+        num_child = self.pop.shape[0] - pop2save.shape[0]
+        child = self.next[:num_child]
+        first = self.first[:num_child]
+        ''' mode='clip' lets take() write straight into out (the indices are valid) '''
+        np.take(self.pop, parents[1:2*num_child:2], axis=0, out=child, mode='clip')
+        np.take(self.pop, parents[0:2*num_child:2], axis=0, out=first, mode='clip')
+        if self.pop.ndim == 3:
+            np.copyto(child, first, where=self._mask(num_child, mode, kind))
+        else:
+            self._crossover_int(child, first, mode, kind)
+        if elitism and pop2save.shape[0] > 0:
+            np.take(self.pop, pop2save, axis=0, out=self.next[num_child:], mode='clip')
+        self.pop, self.next = self.next, self.pop
+        return self.pop
+
+def pop_gen_int(pop_size, num_tasks, num_workers):
+    return np.random.randint(0, num_workers, size=(pop_size, num_tasks)).astype(np.int16)
+
+def fit_calc_int(task_time, pop):
+    ''' Total task time of each solution: task_time[j, pop[i,j]] summed over tasks j '''
+    return task_time[np.arange(pop.shape[1]), pop].sum(axis=1)
+
+def to_onehot(pop, num_workers):
+    ''' One-hot population with the same assignments as the int encoded pop '''
+    onehot = np.zeros((*pop.shape, num_workers))
+    onehot[np.arange(pop.shape[0])[:, np.newaxis], np.arange(pop.shape[1]), pop] = 1
+    return onehot
+
+def mutate_int(pop, mut_prob, num_workers, kind='reassign'):
+    ''' Mutate each task of the int encoded pop with probability mut_prob, in place '''
+    sol, task = np.divmod(mutation_sites(pop.size, mut_prob), pop.shape[1])
+    if kind == 'reassign':
+        pop[sol, task] = (pop[sol, task] + np.random.randint(1, max(2, num_workers), size=sol.size)) % num_workers
+    elif kind == 'swap':
+        _swap_tasks(pop, sol, task)
+    else:
+        print(f'Error in specifying mutation kind: {kind}')
+    return
+
+def repair_int(pop, calls_max, num_workers, rng=np.random):
+    ''' Move tasks off workers over calls_max as repair() does, in place;
+        rng is np.random or a Generator '''
+    _rebalance(pop, num_workers, calls_max, rng)
+    return
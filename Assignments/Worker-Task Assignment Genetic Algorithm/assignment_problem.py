@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 29 14:26:31 2026
+
+@author: jrbrad
+
+The worker-task assignment as a galib.engine problem: one int16 worker
+index per task (the 'int' encoding of assignment_ops.py), total task time
+to be minimized, and repair_int() moving tasks off workers with more than
+calls_max tasks.  Crossover of int rows is the 'task' crossover mode.
+
+    python assignment_problem.py --pop 2000 --gens 200 --select rank_linear --seed 0
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import assignment_ops
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'GA'))
+from galib import engine, operators, trace
+
+class WorkerTask(engine.Problem):
+    maximize = False
+
+    def __init__(self, task_time, calls_max):
+        self.task_time, self.calls_max = task_time, calls_max
+        self.num_tasks, self.num_workers = task_time.shape
+        self.reassign = operators.reassign(self.num_workers)
+
+    def encode(self, n, rng):
+        return rng.integers(0, self.num_workers, size=(n, self.num_tasks), dtype=np.int16)
+
+    def fitness(self, pop):
+        return assignment_ops.fit_calc_int(self.task_time, pop)
+
+    def repair(self, pop, rng):
+        assignment_ops.repair_int(pop, self.calls_max, self.num_workers, rng)
+
+    def mutate(self, pop, prob, rng):
+        self.reassign(pop, prob, rng)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Worker-task assignment on the galib engine')
+    parser.add_argument('--pop', type=int, default=2000, help='population size')
+    parser.add_argument('--gens', type=int, default=200, help='number of generations')
+    parser.add_argument('--select', default='rank_linear', help='selection mode (galib/selection.py)')
+    parser.add_argument('--q', type=float, default=0.999, help='q of rank_nonlinear selection')
+    parser.add_argument('--crossover', default='one_point', choices=list(operators.crossovers))
+    parser.add_argument('--mutate', type=float, default=0.002, help='mutation probability of a task')
+    parser.add_argument('--elite', type=int, default=0, help='best solutions kept unchanged')
+    parser.add_argument('--calls-max', type=int, default=45, help='most tasks per worker')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--trace', default=None, help='per-generation trace file (.jsonl or .csv)')
+    parser.add_argument('--data', default='task_time_data.csv', help='task time matrix')
+    args = parser.parse_args()
+
+    tt = np.genfromtxt(args.data, delimiter=',').astype(np.int16)
+    problem = WorkerTask(tt, args.calls_max)
+
+    start = time.time()
+    tracer = trace.start(args.trace)
+    result = engine.run(problem, args.pop, args.gens, args.select, args.q, crossover=args.crossover,
+                        mutate_prob=args.mutate, num_elite=args.elite, seed=args.seed, tracer=tracer)
+    if tracer:
+        print(tracer.close())
+    print(f'Best total time: {result.best_fit}')
+    for gen in range(0, args.gens + 1, max(1, args.gens//10)):
+        print(f'Generation {gen}: best {result.history[gen, 0]}, best so far {result.history[gen, 1]}, mean {result.history[gen, 2]:.1f}')
+    print(f'Execution time: {time.time() - start} seconds')
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 24 14:52:07 2026
+
+@author: jrbrad
+
+Time the population operators in assignment_ops.py on random populations:
+
+    repair      loop version against the batched version, and the largest
+                difference in how often each (task, worker) pair results
+    encoding    memory and fitness time of one-hot float64 against int16
+    crossover   children built from slices against PopBuffer
+    mutation    mutation sites from a Bernoulli draw for every task
+                against geometric skips
+"""
+
+import time
+import numpy as np
+import assignment_ops
+
+def random_pop(pop_size, num_tasks, num_workers, density=0.02):
+    ''' Children as crossover leaves them: some tasks unassigned, some multiply assigned '''
+    return (np.random.random((pop_size, num_tasks, num_workers)) < density).astype(np.float64)
+
+def crossover_flat_slices(pop, parents, elitism, pop2save):
+    ''' crossover_flat() from assignment.py: children built from slices '''
+    cross_pt = np.random.randint(0, pop[0].size, size=(pop.shape[0]-pop2save.shape[0],))
+    pop_new = []
+    shape = pop.shape
+    for i,cpt in enumerate(cross_pt):
+        pop_new.append(pop[parents[2*i]].flatten()[:cpt])
+        pop_new.append(pop[parents[2*i+1]].flatten()[cpt:])
+    pop_new = np.concatenate(pop_new)
+    pop_new = pop_new.reshape((-1, *shape[1:]))
+    if elitism:
+        pop_new = np.concatenate((pop_new,pop[pop2save].copy()), axis=0)
+    pop[0] = pop_new[0]
+    pop[1:] = pop_new[1:]
+    return
+
+def time_op(op, pop, *args, reps=3):
+    best = np.inf
+    for _ in range(reps):
+        work = pop.copy()
+        start = time.time()
+        op(work, *args)
+        best = min(best, time.time() - start)
+    return best
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    pop_size, num_tasks, num_workers, calls_max = 2000, 200, 50, 5
+
+    ''' Speed of one generation's repair '''
+    pop = random_pop(pop_size, num_tasks, num_workers)
+    pop[:, :, 0] = np.random.random((pop_size, num_tasks)) < 0.2
+    t_loop = time_op(assignment_ops.repair_loop, pop, calls_max, reps=1)
+    t_vec = time_op(assignment_ops.repair, pop, calls_max)
+    print(f'repair of {pop_size} x {num_tasks} x {num_workers}: loops {t_loop:.3f} s, '
+          f'batched {t_vec:.4f} s, speedup {t_loop/t_vec:.0f}x')
+
+    ''' Frequency of every (task, worker) pair over repeated repairs of the same population '''
+    reps = 2000
+    pop = random_pop(4, 30, 6, density=0.2)
+    pop[0, :, 0] = 1
+    freq_loop, freq_vec = np.zeros(pop.shape), np.zeros(pop.shape)
+    for _ in range(reps):
+        work = pop.copy()
+        assignment_ops.repair_loop(work, 6)
+        freq_loop += work
+        work = pop.copy()
+        assignment_ops.repair(work, 6)
+        freq_vec += work
+    print(f'largest difference in (task, worker) frequency over {reps} repairs: '
+          f'{np.abs(freq_loop - freq_vec).max()/reps:.3f}')
+
+    ''' One-hot float64 against int16 encoding '''
+    task_time = np.random.randint(1, 100, size=(num_tasks, num_workers)).astype(np.int16)
+    genes = assignment_ops.pop_gen_int(pop_size, num_tasks, num_workers)
+    onehot = assignment_ops.to_onehot(genes, num_workers)
+    start = time.time()
+    fit_onehot = np.einsum('ijk,jk->i', onehot, task_time)
+    t_onehot = time.time() - start
+    start = time.time()
+    fit_int = assignment_ops.fit_calc_int(task_time, genes)
+    t_int = time.time() - start
+    assert np.array_equal(fit_onehot, fit_int)
+    print(f'population memory: one-hot {onehot.nbytes/1024**2:.1f} MB, int16 {genes.nbytes/1024**2:.2f} MB; '
+          f'fitness: einsum {t_onehot:.4f} s, gather {t_int:.4f} s')
+
+    ''' Crossover of the one-hot population '''
+    parents = np.random.randint(0, pop_size, size=2*pop_size)
+    t_slices = time_op(crossover_flat_slices, onehot, parents, False, np.array([]))
+    pop_buf = assignment_ops.PopBuffer(onehot.copy())
+    ''' the first two calls touch the buffers for the first time '''
+    pop_buf.crossover(parents, False, np.array([]))
+    pop_buf.crossover(parents, False, np.array([]))
+    print(f'flatten crossover: slices {t_slices:.3f} s', end='')
+    for kind in ['one_point', 'two_point', 'uniform']:
+        start = time.time()
+        pop_buf.crossover(parents, False, np.array([]), 'flatten', kind)
+        print(f', PopBuffer {kind} {time.time() - start:.3f} s', end='')
+    print()
+
+    ''' Mutation sites for the population '''
+    mutate_prob = 0.002
+    start = time.time()
+    mask = np.random.random((pop_size, num_tasks)) < mutate_prob
+    t_bernoulli = time.time() - start
+    start = time.time()
+    sites = assignment_ops.mutation_sites(pop_size*num_tasks, mutate_prob)
+    t_skip = time.time() - start
+    print(f'{mask.sum()} and {sites.size} mutation sites: Bernoulli draws {t_bernoulli:.4f} s, geometric skips {t_skip:.5f} s')
+    for kind in ['reassign', 'swap']:
+        start = time.time()
+        assignment_ops.mutate(onehot, mutate_prob, kind)
+        print(f'mutate {kind}: {time.time() - start:.5f} s')
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 25 10:31:26 2026
+
+@author: jrbrad
+
+Run the parameter sweep of assignment_elite_repeat.py (select_alts x
+pop_sizes x elitism x qs x reps) as independent jobs on a process pool.
+
+Each job has its own seed derived from --seed and the job's settings, so a
+replicate gives the same curve whichever worker runs it and in whatever
+order.  Every finished job is appended to a checkpoint file (one JSON line
+per job); running the sweep again skips the jobs already in the checkpoint,
+so an interrupted sweep resumes where it stopped.  At the end the curves of
+all jobs are written to one .npz file with a column per field and a row per
+(job, generation); load_results() reads it back.
+
+    python sweep.py --processes 8 --seed 0
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+import zlib
+import numpy as np
+import assignment_elite_repeat as ga
+
+''' Fields of the results file with one value per job '''
+job_fields = ['select_mode', 'pop_size', 'elitism', 'q', 'rep', 'seed', 'crossover_mode',
+              'crossover_kind', 'mutate_kind', 'sampler', 'encoding', 'mutate_prob', 'calls_max']
+
+def expand_grid(base_seed):
+    ''' One job (a dictionary of settings and seed) per replicate of the sweep '''
+    fixed = {'crossover_mode': ga.crossover_mode, 'crossover_kind': ga.crossover_kind,
+             'mutate_kind': ga.mutate_kind, 'sampler': ga.sampler, 'encoding': ga.encoding, 'num_gen': ga.num_gen,
+             'mutate_prob': ga.mutate_prob, 'calls_max': ga.calls_max}
+    jobs = []
+    for j, select_mode in enumerate(ga.select_alts):
+        for pop_size in ga.pop_sizes:
+            for e in ga.elitism:
+                for q in ga.qs[j]:
+                    for rep in range(ga.reps):
+                        job = {'select_mode': select_mode, 'pop_size': pop_size, 'elitism': bool(e),
+                               'q': q, 'rep': rep, **fixed}
+                        job['key'] = json.dumps(job, sort_keys=True)
+                        entropy = [base_seed, zlib.crc32(job['key'].encode())]
+                        job['seed'] = int(np.random.SeedSequence(entropy).generate_state(1)[0])
+                        jobs.append(job)
+    return jobs
+
+def read_checkpoint(path):
+    ''' {key: record} of the jobs finished so far; a line cut short by an
+        interruption is ignored '''
+    done = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[record['key']] = record
+    return done
+
+_tt = None
+
+def _init(task_time_file):
+    global _tt
+    _tt = np.genfromtxt(task_time_file, delimiter=',').astype(np.int16)
+
+def run_job(job):
+    np.random.seed(job['seed'])
+    start = time.time()
+    curve = ga.run_ga(_tt, job['select_mode'], job['pop_size'], job['elitism'], job['q'], verbose=False)
+    return {**job, 'seconds': time.time() - start, 'curve': curve.tolist()}
+
+def write_results(path, records):
+    ''' Columnar results: one array per field, one row per (job, generation) '''
+    columns = {field: [] for field in job_fields + ['gen', 'best', 'best_so_far', 'mean']}
+    for record in records:
+        curve = np.array(record['curve'])
+        for field in job_fields:
+            columns[field].extend([record[field]] * curve.shape[0])
+        columns['gen'].extend(range(curve.shape[0]))
+        for k, field in enumerate(['best', 'best_so_far', 'mean']):
+            columns[field].extend(curve[:, k])
+    np.savez_compressed(path, **{field: np.array(values) for field, values in columns.items()})
+
+def load_results(path):
+    ''' {field: array} from a results file written by write_results() '''
+    with np.load(path) as data:
+        return {field: data[field] for field in data.files}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Parallel parameter sweep of the worker-task GA')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--seed', type=int, default=0, help='base seed of the sweep')
+    parser.add_argument('--data', default='task_time_data.csv', help='task time matrix')
+    parser.add_argument('--checkpoint', default='results/sweep_checkpoint.jsonl', help='finished jobs, one JSON line each')
+    parser.add_argument('--out', default='results/sweep.npz', help='columnar results file')
+    args = parser.parse_args()
+
+    for path in [args.checkpoint, args.out]:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    jobs = expand_grid(args.seed)
+    done = read_checkpoint(args.checkpoint)
+    pending = [job for job in jobs if job['key'] not in done or done[job['key']]['seed'] != job['seed']]
+    print(f'{len(jobs)} jobs, {len(jobs) - len(pending)} already in {args.checkpoint}')
+
+    start = time.time()
+    with open(args.checkpoint, 'a') as ckpt, mp.Pool(args.processes, initializer=_init, initargs=(args.data,)) as pool:
+        for n, record in enumerate(pool.imap_unordered(run_job, pending)):
+            ckpt.write(json.dumps(record) + '\n')
+            ckpt.flush()
+            done[record['key']] = record
+            print(f'{n+1}/{len(pending)} {record["select_mode"]} pop {record["pop_size"]} elite {record["elitism"]} '
+                  f'q {record["q"]} rep {record["rep"]}: {record["curve"][-1][1]} ({record["seconds"]:.1f} s)')
+    print(f'Execution time: {time.time()-start} seconds')
+
+    write_results(args.out, [done[job['key']] for job in jobs])
+    print(f'Results of {len(jobs)} jobs written to {args.out}')
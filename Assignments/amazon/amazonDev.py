@@ -5,78 +5,25 @@ Spyder Editor
 This is a temporary script file.
 """
 
-import mysql.connector as mySQL
-import datetime
+import os
 import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Grading'))
+from bin_check import checkCapacity, checkAllPoints    # vectorized cart checks
+import grade_pool
+import problem_db
 
 """ global MySQL settings """
 mysql_user_name = ''
 mysql_password = ''
 mysql_ip = ''
 mysql_db = 'amazon'
+db_backend = 'mysql'   # 'sqlite' uses the offline stand-in created by Grading/make_problems.py
 
-def checkCapacity(items, cart_contents, cart_cap):
-    """ articles: a dictionary of the items to be loaded into carts: the key is the item id and the value is the item volume """
-    """ cart_contents is output expected expected in teh form of a list of lists, where each sub-list is the contents of each cart denoted by item ids  """
-    """ cart_cap: capacity of each cart """
-    """ This function returns two parameters, the first of which is the number of bins that are within capacity and, the second, the number of overloaded bins """
-    
-    num_ok = 0
-    num_over = 0
-    if isinstance(items,dict):
-        if isinstance(cart_contents,list):
-            item_key_good = True
-            for this_cart in cart_contents:
-                if isinstance(this_cart,list):
-                    load = 0.0
-                    for this_item in this_cart:
-                        if this_item not in items.keys():
-                            item_key_good = False
-                        else:
-                            load += items[this_item]
-                    if item_key_good == False:
-                        print("function checkCapacity(), bad item key")
-                        return 'bad_key', 'bad_key'
-                    elif load <= cart_cap:
-                        num_ok += 1
-                    else:
-                        num_over += 1
-                else:
-                    print("Data type error: contents of each cart must be in a sub-list")
-                    return 'sublist_error','sublist_error'
-            return num_ok, num_over
-        else:
-            print("Data type error: cart_contents must be a list of lists")
-            return 'list_needed', 'list_needed'
-    else:
-        print("Internal error in function checkCapacity(), items argument must be a dictionary")
-        return 'dict_needed', 'dict_needed'
-        
-def checkAllPoints(items, bin_contents):
-    """ Check to be sure that all items are packed in exactly one bin """
-    
-    err_mess = ""
-    err_mult= False
-    checkit = {}
-    for this_cart in bin_contents:
-        for item in this_cart:
-            checkit[item] = checkit.get(item,0) + 1
-    item_count = [(k,v) for k,v in checkit.items()]
-    item_count.sort(key = lambda x:x[1], reverse = True)
-    if item_count[0][1] > 1:
-        err_mult = True
-        err_mess += "At least one item is assigned multiple times.  "
-                
-    err_all = False
-    if len(items.keys() - checkit.keys()) > 0:
-        err_all = True
-        err_mess += "Some items not assigned to carts.  "
-    #for key_art in items.keys():
-    #    if key_art not in checkit.keys():
-    #        err_all = True
-    #        err_mess += "Some items not assigned to carts"
-            
-    return err_mult, err_all, err_mess
+""" local problem cache settings (see Grading/problem_cache.py) """
+use_cache = True       # read problems from the local cache when available
+refresh_cache = False  # set to True to re-download problems after the server copy changes
 
 def amazon_algo(items,cart_cap):
     """ You write your heuristic bin packing algorithm in this function using the argument values that are passed
@@ -103,44 +50,60 @@ def amazon_algo(items,cart_cap):
     return my_username, cart_contents, my_nickname       # use this return statement when you have items to load in the knapsack
 
 def getDBDataList():
-    cnx = db_connect()
-    cursor = cnx.cursor()
-    cursor.callproc('spGetProblemIds')
-    items = []
-    for result in cursor.stored_results():
-        for item in result.fetchall():
-            items.append(item[0])
-        break
-    cursor.close()
-    cnx.close()
-    return items
+    return problem_db.load_problem_ids(db_connect, 'spGetProblemIds',
+                                       cache=mysql_db if use_cache and db_backend == 'mysql' else None, refresh=refresh_cache)
+
+def db_get_all_data(problem_ids):
+    """ Capacity and items for all problems, read from the cache or fetched over one pooled connection """
+    problems = problem_db.load_problems(db_connect, problem_ids, 'spGetCartCap', 'spGetData',
+                                        cache=mysql_db if use_cache and db_backend == 'mysql' else None, refresh=refresh_cache)
+    return {problem_id: (cart_cap, {row[0]:row[1] for row in rows}) for problem_id, (cart_cap, rows) in problems.items()}
    
 """ db_get_data connects with the database and returns a dictionary with the knapsack items """
 def db_get_data(problem_id):
-    cnx = db_connect()
-    cursor = cnx.cursor()  
-    
-    cursor.callproc("spGetCartCap", args=[problem_id])
-    for result in cursor.stored_results():
-        cart_cap = result.fetchall()[0][0]
-        break
-    cursor.close()
-    cursor = cnx.cursor()
-    cursor.callproc('spGetData',args=[problem_id])
-    items = {}
-    for result in cursor.stored_results():
-        blank = result.fetchall()
-        break
-    for row in blank:
-        items[row[0]] = row[1]
-    cursor.close()
-    cnx.close()
-    return cart_cap, items
+    return db_get_all_data([problem_id])[problem_id]
     
 def db_connect():
-    cnx = mySQL.connect(user=mysql_user_name, passwd=mysql_password,
-                        host=mysql_ip, db=mysql_db)
-    return cnx
+    return problem_db.db_connect(mysql_user_name, mysql_password, mysql_ip, mysql_db, db_backend)
+
+def grade_result(problem_id, cart_cap, items, result, silent_mode=False):
+    """ Check the tuple returned by amazon_algo() for one problem and return the message to print """
+    username, response, nickname = result
+    errors = False
+    messages = []
+    status = ''
+    
+    if isinstance(response,list):
+        num_ok, num_over = checkCapacity(items, response, cart_cap)
+        if not isinstance(num_ok,int) or not isinstance(num_over,int):
+            errors = True
+            if silent_mode:
+                status = num_ok
+            else:
+                messages.append("P"+str(problem_id)+num_ok+"_")
+                
+        err_mult, err_all, err_mess = checkAllPoints(items, response)
+        if err_mult or err_all:
+            errors = True
+            if silent_mode:
+                status += "_" + err_mess
+            else:
+                messages.append("Problem "+ str(problem_id) + ': ' + err_mess)
+    else:
+        errors = True
+        if silent_mode:
+            status = "Solution is not of the list data type.  Other errors may also exist."
+        else:
+            messages.append("Problem "+ str(problem_id) + ": Solution is not of the list data type.  Other errors may also exist.")
+            
+    if errors == False:
+        if silent_mode:
+            status = "Problem "+ str(problem_id) + ": "
+            messages.append(status+"; num_ok: " + str(num_ok) + "; num_over: " + str(num_over))
+        else:
+            messages.append(('/').join([str(problem_id),str(num_ok),str(num_over)])) 
+    
+    return '\n'.join(messages)
 
 def print_find(f_name):
     #print(__file__)
@@ -170,49 +133,20 @@ def print_find(f_name):
 if __name__ == '__main__':    
     """ Get, and evaluate solutions based on algorithm """
     problems = getDBDataList() 
+    problem_data = db_get_all_data(problems)
     silent_mode = False    # use this variable to turn on/off appropriate messaging depending on student or instructor use
+    num_processes = 1      # number of worker processes used to solve the problems in parallel
+    time_limit = 60        # seconds allowed for amazon_algo() on each problem (None for no limit)
+    mem_limit = 4096       # megabytes allowed for amazon_algo() on each problem (None for no limit)
     
     print('\n\nProblem Number/Num. Carts within Capacity/Num. Carts Overcapacity')
+    graded = grade_pool.grade({'amazon_algo':amazon_algo}, problem_data,
+                              lambda *args: grade_result(*args, silent_mode=silent_mode),
+                              'amazon_algo', num_processes, time_limit, mem_limit)
     for problem_id in problems:
-        cart_cap, items = db_get_data(problem_id)
-        errors = False
-        response = None
-        
-        #while finished == False:
-        username, response, nickname = amazon_algo(items.copy(),cart_cap)
-        #if not isinstance(response,str):
-        if isinstance(response,list):
-            num_ok, num_over = checkCapacity(items, response, cart_cap)
-            if not isinstance(num_ok,int) or not isinstance(num_over,int):
-                errors = True
-                if silent_mode:
-                    status = num_ok
-                else:
-                    print("P"+str(problem_id)+num_ok+"_")
-                    
-            err_mult, err_all, err_mess = checkAllPoints(items, response)
-            if err_mult or err_all:
-                errors = True
-                if silent_mode:
-                    status += "_" + err_mess
-                else:
-                    print("Problem "+ str(problem_id) + ': ' + err_mess)
-        else:
-            errors = True
-            if silent_mode:
-                status = "Solution is not of the list data type.  Other errors may also exist."
-            else:
-                print("Problem "+ str(problem_id) + ": Solution is not of the list data type.  Other errors may also exist.")
-                
-        if errors == False:
-            
-            if silent_mode:
-                status = "Problem "+ str(problem_id) + ": "
-                print(status+"; num_ok: " + num_ok + "; num_over: " + num_over)
-            else:
-                print(('/').join([str(problem_id),str(num_ok),str(num_over)])) 
-            
-            this_time = datetime.datetime.now()
+        status, message, seconds = graded[('amazon_algo', problem_id)]
+        if message:
+            print(message)
     
     msg = print_find('amazon_algo')
     if msg:
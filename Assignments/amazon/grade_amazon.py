@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 11:02:47 2026
+
+@author: jrbrad
+
+Grade a batch of amazon_algo() submissions on every problem in parallel.
+The problems are loaded once with the settings in amazonDev.py and each
+(submission, problem) pair is solved in a process pool.
+
+    python grade_amazon.py submissions/*.py --processes 8 --timeout 60 --memory 4096
+"""
+
+import argparse
+import os
+import time
+import amazonDev
+import grade_pool
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Grade amazon_algo() submissions in parallel')
+    parser.add_argument('submissions', nargs='+', help='submission .py files defining amazon_algo()')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--timeout', type=float, default=None, help='seconds allowed per problem')
+    parser.add_argument('--memory', type=float, default=None, help='megabytes allowed per worker')
+    args = parser.parse_args()
+
+    problems = amazonDev.getDBDataList()
+    problem_data = amazonDev.db_get_all_data(problems)
+    submissions = {os.path.splitext(os.path.basename(f))[0]:os.path.abspath(f) for f in args.submissions}
+
+    start = time.time()
+    graded = grade_pool.grade(submissions, problem_data, amazonDev.grade_result, 'amazon_algo',
+                              args.processes, args.timeout, args.memory)
+    for name in submissions:
+        print(f'\n\n{name}\nProblem Number/Num. Carts within Capacity/Num. Carts Overcapacity')
+        for problem_id in problems:
+            status, message, seconds = graded[(name, problem_id)]
+            if message:
+                print(message)
+    print(f'\nGraded {len(submissions)} submissions x {len(problems)} problems in {time.time() - start:.2f} seconds')
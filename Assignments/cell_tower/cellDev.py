@@ -3,14 +3,24 @@
 Spyder Editor
 """
 
-import mysql.connector as mySQL
+import os
 import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Grading'))
+import problem_db
+import sandbox
 
 """ global MySQL settings """
 mysql_user_name = 'root'
 mysql_password = 'MySQL'
 mysql_ip = '34.145.197.191'
 mysql_db = 'cell_tower'
+db_backend = 'mysql'   # 'sqlite' uses the offline stand-in created by Grading/make_problems.py
+
+""" local problem cache settings (see Grading/problem_cache.py) """
+use_cache = True       # read problems from the local cache when available
+refresh_cache = False  # set to True to re-download problems after the server copy changes
 
 def checkBudget(towers,budget):
     """ contents is expected as a dictionary of the form {tower_id:(cost,calls), ...} """
@@ -64,47 +74,21 @@ def cell_algo(towers,budget):
     return my_user_name, towers_to_pick, my_nickname    
 
 def getDBDataList():
-    cnx = db_connect()
-    cursor = cnx.cursor()
-    #cursor.execute(commandString)
-    cursor.callproc('spGetProblems')
-    items = []
-    for result in cursor.stored_results(): #list(cursor):
-        for item in result.fetchall():
-            items.append(item[0])
-        break
-    cursor.close()
-    cnx.close()
-    return items
+    return problem_db.load_problem_ids(db_connect, 'spGetProblems',
+                                       cache=mysql_db if use_cache and db_backend == 'mysql' else None, refresh=refresh_cache)
+
+def db_get_all_data(problem_ids):
+    """ Budget and towers for all problems, read from the cache or fetched over one pooled connection """
+    problems = problem_db.load_problems(db_connect, problem_ids, 'spGetBudget', 'spGetData',
+                                        cache=mysql_db if use_cache and db_backend == 'mysql' else None, refresh=refresh_cache)
+    return {problem_id: (budget, {row[0]:(row[1],row[2]) for row in rows}) for problem_id, (budget, rows) in problems.items()}
    
 """ db_get_data connects with the database and returns a dictionary with the problem data """
 def db_get_data(problem_id):
-    cnx = db_connect()
-                        
-    cursor = cnx.cursor()
-    cursor.callproc("spGetBudget", args=[problem_id])
-    for result in cursor.stored_results():
-        knap_cap = result.fetchall()[0][0]
-        break
-    cursor.close()
-    cnx.close()
-    cnx = db_connect()
-    cursor = cnx.cursor()
-    cursor.callproc('spGetData',args=[problem_id])
-    items = {}
-    for result in cursor.stored_results():
-        blank = result.fetchall()
-        break
-    for row in blank:
-        items[row[0]] = (row[1],row[2])
-    cursor.close()
-    cnx.close()
-    return knap_cap, items
+    return db_get_all_data([problem_id])[problem_id]
     
 def db_connect():
-    cnx = mySQL.connect(user=mysql_user_name, passwd=mysql_password,
-                        host=mysql_ip, db=mysql_db)
-    return cnx
+    return problem_db.db_connect(mysql_user_name, mysql_password, mysql_ip, mysql_db, db_backend)
 
 def print_find(f_name):
     #print(__file__)
@@ -130,60 +114,67 @@ def print_find(f_name):
     
     return msg
     
-""" Error Messages """
-error_bad_list_key = """ 
-The towers_to_pick list received from cell_algo() either contained an element that was not a valid tower key or a valid tower key was included multiple times. Please check the towers_to_pick list that your cell_algo() function is returning for these errors. Other errors may also exist.
-"""
-error_response_not_list = """
-cell_algo() returned a response for towers to be built that was not of the list data type.  Scoring will be terminated.  Other errors may also exist.   """
+if __name__ == '__main__':
+    """ Error Messages """
+    error_bad_list_key = """ 
+    The towers_to_pick list received from cell_algo() either contained an element that was not a valid tower key or a valid tower key was included multiple times. Please check the towers_to_pick list that your cell_algo() function is returning for these errors. Other errors may also exist.
+    """
+    error_response_not_list = """
+    cell_algo() returned a response for towers to be built that was not of the list data type.  Scoring will be terminated.  Other errors may also exist.   """
 
-error_over_budget = '''Cell towers in towers_to_pick exceed the budget. '''
-silent_mode = False    # use this variable to turn on/off appropriate messaging depending on student or instructor use
+    error_over_budget = '''Cell towers in towers_to_pick exceed the budget. '''
+    silent_mode = False    # use this variable to turn on/off appropriate messaging depending on student or instructor use
+    time_limit = 60        # seconds allowed for cell_algo() on each problem (None for no limit)
+    mem_limit = 4096       # megabytes allowed for cell_algo() on each problem (None for no limit)
 
-''' Get problem IDs to solve '''
-problems = getDBDataList() 
+    ''' Get problem IDs to solve '''
+    problems = getDBDataList() 
 
-''' First, check to ensure that function cell_algo() exists '''
-''' Print message if no function; otherwise: solve problems in database '''
-msg = print_find('cell_algo')
-if msg:
-    print('\n\n' + msg)
-else:
-    print('Cell Tower Problems to Solve:', problems)
-    for problem_id in problems:
-        print("Cell Tower Problem ", str(problem_id)," ....")
-        towers_selected = {}
-        budget, towers = db_get_data(problem_id)
-        #finished = False
-        errors = False
-        response = None
+    ''' First, check to ensure that function cell_algo() exists '''
+    ''' Print message if no function; otherwise: solve problems in database '''
+    msg = print_find('cell_algo')
+    if msg:
+        print('\n\n' + msg)
+    else:
+        print('Cell Tower Problems to Solve:', problems)
+        problem_data = db_get_all_data(problems)
+        for problem_id in problems:
+            print("Cell Tower Problem ", str(problem_id)," ....")
+            towers_selected = {}
+            budget, towers = problem_data[problem_id]
+            #finished = False
+            errors = False
+            response = None
         
-        #print('function')
-        team_num, response, nicname = cell_algo(towers.copy(),budget)
-        if isinstance(response,list):
-            for this_key in response:
-                if this_key in towers.keys():
-                    towers_selected[this_key] = towers[this_key]
-                    del towers[this_key]
-                else:
-                    errors = True
-                    if silent_mode:
-                        status = error_bad_list_key #"Cell tower ID not valid (other errors may exist)"
+            #print('function')
+            run_status, result, run_time = sandbox.run_limited(cell_algo, (towers.copy(),budget), time_limit, mem_limit)
+            if run_status != 'ok':
+                print("Problem " + str(problem_id) + ": cell_algo() " + sandbox.describe(run_status, result, time_limit, mem_limit))
+                continue
+            team_num, response, nicname = result
+            if isinstance(response,list):
+                for this_key in response:
+                    if this_key in towers.keys():
+                        towers_selected[this_key] = towers[this_key]
+                        del towers[this_key]
                     else:
-                        print("Problem " + str(problem_id) + ': ' + error_bad_list_key)
-                    #finished = True
-        else:
-            errors = True
-            if silent_mode:
-                status = "Problem "+str(problem_id) + ': ' + error_response_not_list
+                        errors = True
+                        if silent_mode:
+                            status = error_bad_list_key #"Cell tower ID not valid (other errors may exist)"
+                        else:
+                            print("Problem " + str(problem_id) + ': ' + error_bad_list_key)
+                        #finished = True
             else:
-                print(error_response_not_list)
+                errors = True
+                if silent_mode:
+                    status = "Problem "+str(problem_id) + ': ' + error_response_not_list
+                else:
+                    print(error_response_not_list)
                     
-        if errors == False:
-            budget_ok = checkBudget(towers_selected,budget)
-            if budget_ok:
-                towers_result = compute_added_calls(towers_selected)
-                print("Problem " + str(problem_id) + ': Selected tower locations are within budget, Total Calls Added : ' + str(towers_result))
-            else:
-                print("Problem " + str(problem_id) + ': ' + error_over_budget)
-
+            if errors == False:
+                budget_ok = checkBudget(towers_selected,budget)
+                if budget_ok:
+                    towers_result = compute_added_calls(towers_selected)
+                    print("Problem " + str(problem_id) + ': Selected tower locations are within budget, Total Calls Added : ' + str(towers_result))
+                else:
+                    print("Problem " + str(problem_id) + ': ' + error_over_budget)
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 31 10:06:27 2026
+
+@author: jrbrad
+
+cell_algo() as a greedy ratio fill followed by a swap local search, on NumPy
+arrays instead of lists of tuples.
+
+greedy() picks the same towers as cellTowerRatio.py, in order of calls per
+cost, each taken when it still fits the budget, but a round at a time: the
+cumulative cost of the towers that still fit gives, by binary search, the
+run of towers taken before the first one that does not fit.  That tower and
+every tower dearer than the budget left can never be taken, so the next
+round starts after it without them.
+
+local_search() then improves the selection with the best exchange of up to
+max_swap selected towers for up to max_swap unselected ones until no
+exchange adds calls.  Instead of rescanning the tower list for each
+candidate (as the [t for t in tow if t[0] not in towers_to_pick[-n:]] of
+cellTowerRatioPostProcess.py does), the unselected towers are kept sorted by
+cost with the running maximum of their calls, so the best towers to add in
+place of the towers removed are at a binary search for the budget left
+plus the cost removed.  Single towers come from the whole list; pairs from
+the width towers on each side of the ratio order's break point, where the
+greedy fill is most likely to be wrong.
+
+    python cellTowerLocalSearch.py     compares it on random instances with
+                                       cellTowerRatio.py,
+                                       cellTowerRatioPostProcess.py and the
+                                       LP bound
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+def _arrays(towers):
+    ''' Keys, costs and calls of towers {tower_id: (cost, calls), ...} '''
+    keys = list(towers.keys())
+    cost = np.array([towers[k][0] for k in keys], dtype=np.float64)
+    calls = np.array([towers[k][1] for k in keys], dtype=np.float64)
+    return keys, cost, calls
+
+def greedy(cost, calls, budget):
+    ''' Boolean selection of the ratio greedy and the budget left '''
+    order = np.argsort(-calls/cost, kind='stable')
+    sel = np.zeros(cost.shape[0], dtype=bool)
+    left = budget
+    while order.size > 0:
+        order = order[cost[order] <= left]
+        cum = np.cumsum(cost[order])
+        num = np.searchsorted(cum, left, side='right')
+        sel[order[:num]] = True
+        if num == order.size:
+            break
+        left -= cum[num-1] if num > 0 else 0.0
+        order = order[num+1:]
+    return sel, budget - cost[sel].sum()
+
+def _best_add(add_cost, add_calls):
+    ''' add_cost sorted, with the running maximum of add_calls and where it occurs '''
+    order = np.argsort(add_cost, kind='stable')
+    calls_sorted = add_calls[order]
+    best = np.maximum.accumulate(calls_sorted)
+    pos = np.where(calls_sorted == best, np.arange(order.size), 0)
+    return add_cost[order], best, order[np.maximum.accumulate(pos)]
+
+def _pairs(idx):
+    ''' All pairs of the towers idx, as two index arrays '''
+    i, j = np.triu_indices(idx.size, 1)
+    return idx[i], idx[j]
+
+def local_search(cost, calls, sel, left, max_swap=2, width=40, max_iter=10000, eps=1e-9):
+    ''' Best-improvement exchange of up to max_swap (1 or 2) selected towers
+        for up to max_swap unselected ones, in place on sel; returns the budget left.
+        An exchange must fit the budget exactly and add more than eps calls '''
+    ratio = calls/cost
+    by_cost = np.argsort(cost, kind='stable')
+    cost_sorted = cost[by_cost]
+    for _ in range(max_iter):
+        ''' removals: nothing, one selected tower, or a pair of the width
+            selected towers with the lowest ratio '''
+        out1 = np.flatnonzero(sel)
+        rem = [(np.full(out1.size + 1, -1), np.r_[-1, out1])]
+        free = np.flatnonzero(~sel)
+        if free.size == 0:
+            break
+        adds = []
+        ''' one unselected tower: the running maximum over by_cost, with the
+            selected towers at -inf, sorted once '''
+        calls_free = np.where(sel[by_cost], -np.inf, calls[by_cost])
+        best = np.maximum.accumulate(calls_free)
+        pos = np.maximum.accumulate(np.where(calls_free == best, np.arange(best.size), 0))
+        adds.append((cost_sorted, best, np.full(best.size, -1), by_cost[pos]))
+        if max_swap >= 2:
+            core_out = out1[np.argsort(ratio[out1], kind='stable')[:width]]
+            rem.append(_pairs(core_out))
+            core_in = free[np.argsort(-ratio[free], kind='stable')[:width]]
+            a, b = _pairs(core_in)
+            if a.size > 0:
+                pair_cost, pair_best, at = _best_add(cost[a] + cost[b], calls[a] + calls[b])
+                adds.append((pair_cost, pair_best, a[at], b[at]))
+
+        best_gain, move = eps, None
+        for r1, r2 in rem:
+            if r1.size == 0:
+                continue
+            rem_cost = np.where(r1 >= 0, cost[r1], 0.0) + np.where(r2 >= 0, cost[r2], 0.0)
+            rem_calls = np.where(r1 >= 0, calls[r1], 0.0) + np.where(r2 >= 0, calls[r2], 0.0)
+            for add_cost, add_best, a1, a2 in adds:
+                ''' the best towers to add that fit once r1 and r2 are removed '''
+                pos = np.searchsorted(add_cost, left + rem_cost, side='right') - 1
+                gain = np.where(pos >= 0, add_best[np.maximum(pos, 0)], -np.inf) - rem_calls
+                k = gain.argmax()
+                if gain[k] > best_gain:
+                    best_gain, move = gain[k], (r1[k], r2[k], a1[pos[k]], a2[pos[k]])
+        if move is None:
+            break
+        for t in move[:2]:
+            if t >= 0:
+                sel[t] = False
+                left += cost[t]
+        for t in move[2:]:
+            if t >= 0:
+                sel[t] = True
+                left -= cost[t]
+    return left
+
+def solve(cost, calls, budget, max_swap=2, width=40):
+    ''' Greedy ratio fill, then local_search() when max_swap > 0; boolean selection '''
+    sel, left = greedy(cost, calls, budget)
+    if max_swap > 0:
+        local_search(cost, calls, sel, left, max_swap, width)
+    return sel
+
+def cell_algo(towers, budget):
+    """ Greedy ratio fill plus 1-swap/2-swap local search; see the module docstring
+             towers: a dictionary of the possible cell towers {tower_id: (cost, calls), ...}
+             budget: budget for adding cell towers, which total cost cannot exceed
+   """
+
+    my_user_name = 'jrbrad'
+    my_nickname = 'nickname'
+    keys, cost, calls = _arrays(towers)
+    sel = solve(cost, calls, budget)
+    towers_to_pick = [keys[i] for i in np.flatnonzero(sel)]
+
+    return my_user_name, towers_to_pick, my_nickname
+
+if __name__ == '__main__':
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    import cellTowerRatio
+    import cellTowerRatioPostProcess
+
+    def lp_bound(cost, calls, budget):
+        ''' Fractional knapsack: the ratio prefix plus a fraction of the next tower '''
+        order = np.argsort(-calls/cost)
+        cum = np.cumsum(cost[order])
+        num = np.searchsorted(cum, budget, side='right')
+        bound = calls[order[:num]].sum()
+        if num < order.size:
+            bound += calls[order[num]] * (budget - (cum[num-1] if num > 0 else 0.0)) / cost[order[num]]
+        return bound
+
+    rng = np.random.default_rng(0)
+    algos = [('ratio', cellTowerRatio.cell_algo), ('post process', cellTowerRatioPostProcess.cell_algo),
+             ('1-swap', lambda t, b: ('', [k for k, s in zip(t, solve(*_arrays(t)[1:], b, 1)) if s], '')),
+             ('2-swap', cell_algo)]
+    print(f'{"towers":>7}' + ''.join(f'{name:>14}{"s":>7}' for name, _ in algos) + f'{"LP bound":>12}')
+    for num_towers in [100, 1000, 10000]:
+        cost = rng.integers(50, 500, size=num_towers)
+        calls = np.round(cost * rng.uniform(0.5, 2, size=num_towers) + rng.integers(0, 100, size=num_towers))
+        towers = {int(k): (int(c), float(v)) for k, c, v in zip(rng.permutation(num_towers), cost, calls)}
+        budget = 0.1 * cost.sum()
+        line = f'{num_towers:7d}'
+        for name, algo in algos:
+            start = time.time()
+            _, picked, _ = algo(dict(towers), budget)
+            seconds = time.time() - start
+            assert len(set(picked)) == len(picked) and sum(towers[k][0] for k in picked) <= budget
+            line += f'{sum(towers[k][1] for k in picked):14.0f}{seconds:7.3f}'
+        print(line + f'{lp_bound(*_arrays(towers)[1:], budget):12.1f}')
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Nov  1 15:40:12 2026
+
+@author: jrbrad
+
+cellTowerLocalSearch.py must never go over the budget, not even by less
+than the eps that an exchange has to gain.
+
+    python -m pytest Assignments/cell_tower/solutions/test_cellTowerLocalSearch.py
+"""
+
+import numpy as np
+import cellTowerLocalSearch as ls
+
+''' The three towers cost the budget plus 5e-10 together and have the best
+    ratio in the order a, b, c '''
+towers = {'a': (1.0, 10.5), 'b': (2.0, 20.5), 'c': (3.0 + 5e-10, 30.0)}
+budget = 6.0
+
+def test_greedy_stops_at_the_budget():
+    keys, cost, calls = ls._arrays(towers)
+    assert cost.sum() == budget + 5e-10
+    sel, left = ls.greedy(cost, calls, budget)
+    assert [keys[i] for i in np.flatnonzero(sel)] == ['a', 'b']
+    assert left == budget - 3.0
+
+def test_local_search_stays_within_the_budget():
+    keys, cost, calls = ls._arrays(towers)
+    sel = ls.solve(cost, calls, budget)
+    assert cost[sel].sum() <= budget
+    ''' b and c (50 calls) beat a and b (31) and a and c (40.5) '''
+    assert [keys[i] for i in np.flatnonzero(sel)] == ['b', 'c']
+
+def test_cell_algo_takes_towers_that_fit_exactly():
+    exact = {'a': (1.0, 10.5), 'b': (2.0, 20.5), 'c': (3.0, 30.0)}
+    _, picked, _ = ls.cell_algo(exact, budget)
+    assert sorted(picked) == ['a', 'b', 'c']
+    _, picked, _ = ls.cell_algo(towers, budget)
+    assert sum(towers[k][0] for k in picked) <= budget
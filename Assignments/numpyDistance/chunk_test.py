@@ -5,44 +5,29 @@ Created on Wed Feb 28 08:57:24 2024
 @author: jrbrad
 """
 
-import numpy as np
 import time
-import multiprocessing as mp
+import dist_engine
 
-def chunk(idx_beg, idx_end):
+if __name__ == '__main__':
     size = 60000
-    p = np.load(f'data/mnist1_{size}.npy').astype(np.float32)
-    q = np.load(f'data/mnist2_{size}.npy').astype(np.float32)[idx_beg:idx_end]
-    
-    return np.einsum('ij,jk->ik',-2*q,p.T)
+    processes = 5
+    ''' Memory for each tile of each process in MB '''
+    budget_mb = 512
 
-if __name__ == '__main__':    
-    chunks = 30
-    size = 60000
-    chunksize = int(size/chunks)
-    idx = [(i*chunksize, (i+1)*chunksize) for i in range(chunks)] 
+    ''' Workers memory-map both image arrays and write their rows of the
+        size x size result straight into a memory-mapped file '''
     start = time.time()
-    
-    pool = mp.Pool(5)
-    result = pool.starmap(chunk, idx)
-    pool.close()
-    pool.join()
-    result = np.vstack(result)
-    
-    ''' Square images in q and delete data'''
-    q = np.load(f'data/mnist2_{size}.npy').astype(np.float32)
-    n = q.shape[0]
-    result += np.einsum('ij,ij->i',q,q)[:,np.newaxis]
-    del q
-    
-    ''' Square images in p and delete data'''
-    p = np.load(f'data/mnist1_{size}.npy').astype(np.float32)
-    result += np.einsum('ij,ij->i',p,p) 
-    del p
-    
-    ''' Take square root '''
-    result = np.sqrt(result)
-    
+    result = dist_engine.pairwise(f'data/mnist2_{size}.npy', f'data/mnist1_{size}.npy',
+                                  out=f'data/dist_{size}.npy', budget_mb=budget_mb, processes=processes)
+    n = result.shape[0]
+
     ''' Print results '''
     print(f'Exec. time: {time.time() - start} for {n}x{n}' )
-    print(result[0,:5])
\ No newline at end of file
+    print(result[0,:5])
+
+    ''' Nearest neighbor of each image without storing the distance matrix '''
+    start = time.time()
+    dist, idx = dist_engine.pairwise(f'data/mnist2_{size}.npy', f'data/mnist1_{size}.npy',
+                                     reduce='min', budget_mb=budget_mb, processes=processes)
+    print(f'Exec. time for nearest neighbors: {time.time() - start} for {n}x{n}' )
+    print(idx[:5], dist[:5])
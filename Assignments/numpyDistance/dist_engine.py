@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 16:05:42 2026
+
+@author: jrbrad
+
+Pairwise Euclidean distances between the rows of p and the rows of q with
+a bounded memory footprint.  Each tile of rows of p uses the linear algebra
+identity of dist_la() in Compiling/demo.py
+
+    dist[i,j]**2 = p[i]@p[i] - 2*p[i]@q[j] + q[j]@q[j]
+
+where the norms q[j]@q[j] are computed once per call and handed to every
+tile and block along with the inputs.  Inputs may be arrays or paths to .npy files.  Worker processes open .npy
+inputs as read-only memory maps and attach to in-memory arrays through
+shared memory (shm_data.py) instead of loading their own copies, the
+number of rows per tile is chosen so that one tile fits in budget_mb, and
+the full matrix can be written straight into a memory-mapped .npy file.
+Instead of the full matrix, callers may ask for a reduction per row of p:
+
+    reduce=None    the full len(p) x len(q) distance matrix
+    reduce='min'   (distance, index) of the nearest row of q
+    reduce='knn'   (distances, indices) of the k nearest rows of q, nearest first
+
+knn() is the streaming form of the k nearest neighbor search: it walks
+blocks of rows of p against blocks of rows of q and keeps a running top k
+per row of p, so memory is O(n*k + block**2) however long q is.  The block
+size is tuned to the CPU cache (L2 plus this core's share of L3).
+"""
+
+import glob
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import numpy as np
+import shm_data
+
+''' Copy inputs to temporary files in blocks of this many bytes '''
+copy_block_bytes = 64 * 1024**2
+
+def _open(src):
+    ''' Array for a source: a .npy path is opened as a read-only memory map
+        and a shm_data.Descriptor is attached from shared memory '''
+    if isinstance(src, str):
+        return np.load(src, mmap_mode='r')
+    if isinstance(src, shm_data.Descriptor):
+        return shm_data.attach(src)
+    return src
+
+def _prepare(x, dtype, tmp_dir, name, shm_blocks):
+    ''' Source for input x in dtype: when workers need to open it (tmp_dir is
+        not None) a .npy path for files and a shared memory descriptor for
+        arrays (its block is appended to shm_blocks), an array otherwise '''
+    if isinstance(x, str):
+        arr = np.load(x, mmap_mode='r')
+        if arr.dtype == dtype:
+            return x
+    else:
+        arr = np.asarray(x)
+        if tmp_dir is None:
+            return arr.astype(dtype, copy=False)
+        shm_block, descriptor = shm_data.share_array(arr, dtype)
+        shm_blocks.append(shm_block)
+        return descriptor
+    if tmp_dir is None:
+        return np.asarray(arr, dtype=dtype)
+    ''' Converted copy, written in blocks so that x is never loaded whole '''
+    path = os.path.join(tmp_dir, f'{name}.npy')
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=arr.shape)
+    step = max(1, copy_block_bytes // max(1, arr[:1].nbytes))
+    for lo in range(0, arr.shape[0], step):
+        out[lo:lo+step] = arr[lo:lo+step]
+    out.flush()
+    del out
+    return path
+
+def _sq_norms(x, dtype):
+    ''' Squared norm of every row of x in dtype, converting copy_block_bytes
+        of x at a time '''
+    norms = np.empty(x.shape[0], dtype=dtype)
+    step = max(1, copy_block_bytes // max(1, x[:1].nbytes))
+    for lo in range(0, x.shape[0], step):
+        rows = np.asarray(x[lo:lo+step], dtype=dtype)
+        norms[lo:lo+step] = np.einsum('ij,ij->i', rows, rows)
+    return norms
+
+def tile_rows(n_q, dim, budget_mb, itemsize=4):
+    ''' Rows of p per tile so that one tile (the squared distances, one temporary
+        of the same size, index work space for reductions and the rows of p)
+        stays within budget_mb '''
+    per_row = n_q * (2*itemsize + 8) + dim * itemsize
+    return max(1, int(budget_mb * 1024**2) // per_row)
+
+def _sq_dist(p, q, qq):
+    ''' Squared distances between the rows of p and q (negative rounding errors set to 0) '''
+    pp = np.einsum('ij,ij->i', p, p)
+    d2 = p @ q.T
+    d2 *= -2
+    d2 += pp[:, np.newaxis]
+    d2 += qq
+    np.maximum(d2, 0, out=d2)
+    return d2
+
+def _smallest(d2, k):
+    ''' Column indices of the k smallest entries of each row of d2, smallest first '''
+    if k < d2.shape[1]:
+        idx = np.argpartition(d2, k - 1, axis=1)[:, :k]
+    else:
+        idx = np.broadcast_to(np.arange(d2.shape[1]), d2.shape).copy()
+    order = np.argsort(np.take_along_axis(d2, idx, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(idx, order, axis=1)
+
+def _tile(job):
+    ''' Distances (or their reduction) for rows lo:hi of p; qq_src holds the
+        squared norms of the rows of q '''
+    p_src, q_src, qq_src, lo, hi, out, reduce, k = job
+    p = _open(p_src)
+    q = _open(q_src)
+    d2 = _sq_dist(np.asarray(p[lo:hi]), q, _open(qq_src))
+    if reduce is None:
+        np.sqrt(d2, out=d2)
+        if isinstance(out, str):
+            ''' workers write their rows straight into the memory-mapped output '''
+            result = np.load(out, mmap_mode='r+')
+            result[lo:hi] = d2
+            result.flush()
+            return lo, hi, None
+        return lo, hi, d2
+    idx = _smallest(d2, k)
+    return lo, hi, (np.sqrt(np.take_along_axis(d2, idx, axis=1)), idx)
+
+def pairwise(p, q, reduce=None, k=1, out=None, budget_mb=512, processes=1, dtype=np.float32):
+    ''' p, q: 2-D arrays or paths to .npy files with the same number of columns
+        reduce: None, 'min' or 'knn' (k nearest rows of q)
+        out: path of a .npy file for the full matrix (reduce=None only); the
+             file is returned as a memory map.  Without out the matrix is
+             returned as an array.
+        budget_mb: memory allowed for one tile in each process
+        processes: number of worker processes (1 computes in this process)
+        returns the distance matrix, (dist, idx) for 'min' with shape len(p),
+        or (dist, idx) for 'knn' with shape (len(p), k) '''
+    if reduce not in (None, 'min', 'knn'):
+        raise ValueError(f'unknown reduction {reduce!r}')
+    dtype = np.dtype(dtype)
+    k = 1 if reduce == 'min' else int(k)
+    n_p, dim = _open(p).shape
+    n_q, dim_q = _open(q).shape
+    if dim != dim_q:
+        raise ValueError(f'p has {dim} columns and q has {dim_q}')
+    k = min(k, n_q)
+
+    tmp_dir = tempfile.mkdtemp(prefix='dist_engine_') if processes > 1 else None
+    shm_blocks = []
+    try:
+        p_src = _prepare(p, dtype, tmp_dir, 'p', shm_blocks)
+        q_src = _prepare(q, dtype, tmp_dir, 'q', shm_blocks)
+        qq_src = _prepare(_sq_norms(_open(q), dtype), dtype, tmp_dir, 'qq', shm_blocks)
+        if out is not None and reduce is None:
+            result = np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=(n_p, n_q))
+            del result
+        rows = tile_rows(n_q, dim, budget_mb, dtype.itemsize)
+        jobs = [(p_src, q_src, qq_src, lo, min(lo + rows, n_p), out, reduce, k) for lo in range(0, n_p, rows)]
+
+        if reduce is None:
+            result = np.load(out, mmap_mode='r+') if out is not None else np.empty((n_p, n_q), dtype=dtype)
+        else:
+            dist = np.empty((n_p, k), dtype=dtype)
+            idx = np.empty((n_p, k), dtype=np.int64)
+
+        if processes > 1:
+            pool = mp.Pool(processes)
+            tiles = pool.imap_unordered(_tile, jobs)
+        else:
+            pool = None
+            tiles = map(_tile, jobs)
+        try:
+            for lo, hi, tile in tiles:
+                if reduce is not None:
+                    dist[lo:hi], idx[lo:hi] = tile
+                elif tile is not None:
+                    result[lo:hi] = tile
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    finally:
+        for shm_block in shm_blocks:
+            shm_data.release(shm_block)
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if reduce is None:
+        return result
+    if reduce == 'min':
+        return dist[:, 0], idx[:, 0]
+    return dist, idx
+
+def _cpu_count(cpu_list):
+    ''' Number of CPUs in a sysfs list such as "0-3,8-11" '''
+    count = 0
+    for part in cpu_list.strip().split(','):
+        lo, _, hi = part.partition('-')
+        count += int(hi or lo) - int(lo) + 1
+    return count
+
+def cache_bytes():
+    ''' L2 cache plus this core's share of L3 in bytes (1 MB when unknown) '''
+    units = {'K':1024, 'M':1024**2, 'G':1024**3}
+    total = 0
+    for index in glob.glob('/sys/devices/system/cpu/cpu0/cache/index*'):
+        try:
+            with open(os.path.join(index, 'level')) as f:
+                level = int(f.read())
+            with open(os.path.join(index, 'size')) as f:
+                size = f.read().strip()
+            with open(os.path.join(index, 'shared_cpu_list')) as f:
+                shared = _cpu_count(f.read())
+            size = int(size[:-1]) * units[size[-1]] if size[-1] in units else int(size)
+        except (OSError, ValueError, IndexError):
+            continue
+        if level == 2:
+            total += size
+        elif level == 3:
+            total += size // max(1, shared)
+    return total if total > 0 else 1024**2
+
+''' Bounds on the rows per knn() block: fewer rows pay more for the Python
+    loop over blocks than they save in cache, and more rows than max_block
+    mean a misread cache size (a float32 tile of max_block rows is 1 GB) '''
+min_block = 64
+max_block = 16384
+
+def block_size(dim, itemsize=4, cache=None):
+    ''' Rows per block so that a block x block distance tile and one block of
+        each input fit in cache bytes (cache_bytes() by default) '''
+    cache = cache_bytes() if cache is None else cache
+    ''' largest b with b*b*itemsize + 2*b*dim*itemsize <= cache '''
+    b = int(np.sqrt(dim*dim + cache/itemsize) - dim)
+    return min(max_block, max(min_block, b))
+
+def _knn_block(job):
+    ''' Running top k of rows lo:hi of p over q, one block of q at a time;
+        qq_src holds the squared norms of the rows of q '''
+    p_src, q_src, qq_src, lo, hi, k, block = job
+    p = np.asarray(_open(p_src)[lo:hi])
+    q = _open(q_src)
+    qq = _open(qq_src)
+    best_d = np.full((hi - lo, k), np.inf, dtype=p.dtype)
+    best_i = np.full((hi - lo, k), -1, dtype=np.int64)
+    for q_lo in range(0, q.shape[0], block):
+        q_blk = np.asarray(q[q_lo:q_lo+block])
+        d2 = _sq_dist(p, q_blk, qq[q_lo:q_lo+block])
+        cand_d = np.concatenate((best_d, d2), axis=1)
+        cand_i = np.concatenate((best_i, np.broadcast_to(np.arange(q_lo, q_lo + q_blk.shape[0]), d2.shape)), axis=1)
+        keep = np.argpartition(cand_d, k - 1, axis=1)[:, :k]
+        best_d = np.take_along_axis(cand_d, keep, axis=1)
+        best_i = np.take_along_axis(cand_i, keep, axis=1)
+    order = np.argsort(best_d, axis=1, kind='stable')
+    return lo, hi, np.take_along_axis(best_i, order, axis=1), np.sqrt(np.take_along_axis(best_d, order, axis=1))
+
+def knn(p, q, k=1, block=None, processes=1, dtype=np.float32):
+    ''' k nearest rows of q for every row of p, nearest first
+        p, q: 2-D arrays or paths to .npy files with the same number of columns
+        block: rows per block of p and of q (tuned to the CPU cache by default)
+        processes: number of worker processes (1 computes in this process)
+        returns (indices, distances), both with shape (len(p), k) '''
+    dtype = np.dtype(dtype)
+    n_p, dim = _open(p).shape
+    n_q, dim_q = _open(q).shape
+    if dim != dim_q:
+        raise ValueError(f'p has {dim} columns and q has {dim_q}')
+    k = min(int(k), n_q)
+    block = block_size(dim, dtype.itemsize) if block is None else int(block)
+    indices = np.empty((n_p, k), dtype=np.int64)
+    distances = np.empty((n_p, k), dtype=dtype)
+
+    tmp_dir = tempfile.mkdtemp(prefix='dist_engine_') if processes > 1 else None
+    shm_blocks = []
+    try:
+        p_src = _prepare(p, dtype, tmp_dir, 'p', shm_blocks)
+        q_src = _prepare(q, dtype, tmp_dir, 'q', shm_blocks)
+        qq_src = _prepare(_sq_norms(_open(q), dtype), dtype, tmp_dir, 'qq', shm_blocks)
+        jobs = [(p_src, q_src, qq_src, lo, min(lo + block, n_p), k, block) for lo in range(0, n_p, block)]
+        if processes > 1:
+            with mp.Pool(processes) as pool:
+                for lo, hi, idx, dist in pool.imap_unordered(_knn_block, jobs):
+                    indices[lo:hi], distances[lo:hi] = idx, dist
+        else:
+            for lo, hi, idx, dist in map(_knn_block, jobs):
+                indices[lo:hi], distances[lo:hi] = idx, dist
+    finally:
+        for shm_block in shm_blocks:
+            shm_data.release(shm_block)
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return indices, distances
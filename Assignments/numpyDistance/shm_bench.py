@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 11:40:05 2026
+
+@author: jrbrad
+
+Compare three ways of giving pool workers a data set, with a light
+computation per task so that the data handoff dominates:
+
+    reload   every task calls np.load() and .astype(np.float32), as in
+             dist_mnist() in Multiprocessing/mp_mnist.py
+    pickle   the parent passes the float32 array with every task
+    shared   the parent loads the array once into shared memory and the
+             workers get zero-copy views (shm_data.py)
+
+The bytes pickled per task are the task arguments sent to the workers.
+"""
+
+import multiprocessing as mp
+import os
+import pickle
+import tempfile
+import time
+import numpy as np
+import shm_data
+
+def work(p, lo, hi):
+    ''' Squared distance from each row in lo:hi to its nearest row among the first 100 '''
+    ref = p[:100]
+    d2 = (p[lo:hi]*p[lo:hi]).sum(axis=1)[:, np.newaxis] - 2*p[lo:hi] @ ref.T + (ref*ref).sum(axis=1)
+    return float(d2.min(axis=1).sum())
+
+def task_reload(path, lo, hi):
+    return work(np.load(path).astype(np.float32), lo, hi)
+
+def task_pickle(p, lo, hi):
+    return work(p, lo, hi)
+
+def task_shared(lo, hi):
+    return work(shm_data.data['p'], lo, hi)
+
+if __name__ == '__main__':
+    n, dim, tasks, processes = 20000, 784, 40, 4
+    rng = np.random.default_rng(0)
+    path = os.path.join(tempfile.mkdtemp(), 'images.npy')
+    np.save(path, rng.integers(0, 256, size=(n, dim), dtype=np.uint8))
+    bounds = [(i*n//tasks, (i+1)*n//tasks) for i in range(tasks)]
+
+    results = {}
+    start = time.time()
+    args = [(path, lo, hi) for lo, hi in bounds]
+    with mp.Pool(processes) as pool:
+        results['reload'] = pool.starmap(task_reload, args)
+    times = {'reload': time.time() - start}
+    sent = {'reload': len(pickle.dumps(args[0]))}
+
+    start = time.time()
+    p = np.load(path).astype(np.float32)
+    args = [(p, lo, hi) for lo, hi in bounds]
+    with mp.Pool(processes) as pool:
+        results['pickle'] = pool.starmap(task_pickle, args)
+    times['pickle'] = time.time() - start
+    sent['pickle'] = len(pickle.dumps(args[0]))
+    del p, args
+
+    start = time.time()
+    with shm_data.shared({'p': path}, dtype=np.float32) as descriptors:
+        with mp.Pool(processes, initializer=shm_data.init_pool, initargs=(descriptors,)) as pool:
+            results['shared'] = pool.starmap(task_shared, bounds)
+    times['shared'] = time.time() - start
+    sent['shared'] = len(pickle.dumps(bounds[0])) + len(pickle.dumps(descriptors)) * processes / tasks
+
+    os.remove(path)
+    assert results['reload'] == results['pickle'] == results['shared']
+    print(f'{n} x {dim} images, {tasks} tasks, {processes} processes')
+    print(f'{"handoff":>8} {"seconds":>9} {"bytes pickled per task":>24}')
+    for name in times:
+        print(f'{name:>8} {times[name]:>9.3f} {sent[name]:>24.0f}')
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 09:12:30 2026
+
+@author: jrbrad
+
+Hand datasets to multiprocessing pools through shared memory.  The parent
+loads (and converts) each array once into multiprocessing.shared_memory and
+passes only small descriptors (name, shape, dtype) to the pool initializer;
+workers then see zero-copy NumPy views instead of reloading the data from
+disk or receiving pickled copies with every task.
+
+    with shm_data.shared({'p': 'data/mnist1_100.npy'}, dtype=np.float32) as descriptors:
+        with mp.Pool(5, initializer=shm_data.init_pool, initargs=(descriptors,)) as pool:
+            pool.map(work, tasks)          # work() reads shm_data.data['p']
+"""
+
+import contextlib
+import sys
+from collections import namedtuple
+from multiprocessing import shared_memory
+import numpy as np
+
+''' What a worker needs to attach to a shared array '''
+Descriptor = namedtuple('Descriptor', ['name', 'shape', 'dtype'])
+
+''' Arrays attached by init_pool() in a worker, by key '''
+data = {}
+
+''' Shared memory blocks behind attached views; a view must not outlive its block '''
+_blocks = {}
+
+def share_array(arr, dtype=None):
+    ''' Copy arr (an array or a .npy path) into a new shared memory block
+        returns (block, descriptor); the caller must release(block) when done '''
+    if isinstance(arr, str):
+        arr = np.load(arr, mmap_mode='r')
+    dtype = np.dtype(arr.dtype if dtype is None else dtype)
+    block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(arr.shape)) * dtype.itemsize))
+    view = np.ndarray(arr.shape, dtype=dtype, buffer=block.buf)
+    view[...] = arr
+    del view
+    return block, Descriptor(block.name, tuple(arr.shape), dtype.str)
+
+def attach(descriptor):
+    ''' Zero-copy view of a shared array in this process '''
+    block = _blocks.get(descriptor.name)
+    if block is None:
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=descriptor.name, track=False)
+        else:
+            block = shared_memory.SharedMemory(name=descriptor.name)
+        _blocks[descriptor.name] = block
+    return np.ndarray(descriptor.shape, dtype=np.dtype(descriptor.dtype), buffer=block.buf)
+
+def release(block):
+    ''' Close and remove a block created by share_array() '''
+    block.close()
+    block.unlink()
+
+def init_pool(descriptors):
+    ''' Pool initializer: attach every descriptor of a {key: descriptor} dictionary to data '''
+    for key, descriptor in descriptors.items():
+        data[key] = attach(descriptor)
+
+@contextlib.contextmanager
+def shared(arrays, dtype=None):
+    ''' Share a {key: array or .npy path} dictionary for the duration of a with block
+        yields {key: descriptor}; the blocks are removed on exit '''
+    blocks = []
+    try:
+        descriptors = {}
+        for key, arr in arrays.items():
+            block, descriptors[key] = share_array(arr, dtype)
+            blocks.append(block)
+        yield descriptors
+    finally:
+        for block in blocks:
+            release(block)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 27 09:05:41 2026
+
+@author: jrbrad
+
+Time the fitness evaluation of fac_loc_ga.py on a large random instance:
+every generation, fitness() recomputes pop@A for the whole population,
+while update_coverage() keeps each solution's destination coverage counts
+and adds, for each solution, only the rows of A of the location bits
+changed by crossover (relative to its nearest parent) and by mutation and
+repair, so its cost follows the number of changed genes printed below.  Both are run on the same generations and must give
+the same fitness.  The last lines compare the float64 population and A
+with the bit-packed ones of fac_loc_bits.py, and the budget repair loop
+feasible_loop() with the population-wide repair().
+
+    python fac_loc_bench.py --num-loc 2000 --num-dest 20000 --gens 50
+"""
+
+import argparse
+import time
+import numpy as np
+import fac_loc_ga as fga
+import fac_loc_bits
+from fac_loc_islands import random_instance
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Full against incremental fitness of the facility location GA')
+    parser.add_argument('--num-loc', type=int, default=2000)
+    parser.add_argument('--num-dest', type=int, default=20000)
+    parser.add_argument('--pop', type=int, default=50)
+    parser.add_argument('--gens', type=int, default=50)
+    parser.add_argument('--budget', type=float, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    A, c = random_instance(args.num_loc, args.num_dest, 0.01, args.seed)
+    np.random.seed(args.seed)
+    pop = fga.init(args.pop, args.num_loc, 0.05)
+    fga.feasible(pop, c, args.budget)
+    cov = fga.coverage(pop, A)
+    fit = fga.fitness_cov(cov)
+    t_full, t_cross, t_mut = 0.0, 0.0, 0.0
+    changed_cross, changed_mut = 0, 0
+    for i in range(args.gens):
+        parents = fga.select(pop, fit)
+        old_pop = pop
+        pop = fga.crossover(parents, pop)
+        start = time.time()
+        ref = fga.nearest_parent(parents, pop, old_pop)
+        cov = fga.update_coverage(cov[ref], old_pop[ref], pop, A)
+        t_cross += time.time() - start
+        changed_cross += int((pop != old_pop[ref]).sum())
+        old_pop = pop.copy()
+        fga.mutate(pop, 0.001)
+        fga.feasible(pop, c, args.budget)
+        start = time.time()
+        cov = fga.update_coverage(cov, old_pop, pop, A)
+        fit = fga.fitness_cov(cov)
+        t_mut += time.time() - start
+        changed_mut += int((pop != old_pop).sum())
+        start = time.time()
+        fit_full = fga.fitness(pop, A)
+        t_full += time.time() - start
+        assert np.array_equal(fit, fit_full)
+
+    print(f'{args.num_loc} locations x {args.num_dest} destinations, population {args.pop}, {args.gens} generations')
+    print(f'changed genes per generation: crossover {changed_cross/args.gens:.0f}, '
+          f'mutation and repair {changed_mut/args.gens:.0f}, of {pop.size}')
+    print(f'full recompute:           {t_full/args.gens:.4f} s per generation')
+    print(f'incremental, crossover:   {t_cross/args.gens:.4f} s per generation')
+    print(f'incremental, mutation:    {t_mut/args.gens:.4f} s per generation')
+    print(f'incremental, total:       {(t_cross + t_mut)/args.gens:.4f} s per generation '
+          f'({t_full/(t_cross + t_mut):.1f}x)')
+
+    pop_bits, A_bits = fac_loc_bits.pack(pop), fac_loc_bits.pack(A)
+    start = time.time()
+    fit_bits = fac_loc_bits.fitness(pop_bits, A_bits)
+    t_bits = time.time() - start
+    assert np.array_equal(fit_bits, fit_full)
+    print(f'memory: A {A.nbytes/1024**2:.1f} MB, packed {A_bits.nbytes/1024**2:.2f} MB; '
+          f'population {pop.nbytes/1024:.0f} kB, packed {pop_bits.nbytes/1024:.1f} kB')
+    print(f'bit-packed fitness:       {t_bits:.4f} s per generation ({t_full/args.gens/t_bits:.1f}x)')
+
+    over = fga.init(args.pop, args.num_loc, 0.05)
+    times = {}
+    for name, op in [('feasible_loop', lambda x: fga.feasible_loop(x, c, args.budget)),
+                     ('repair random', lambda x: fga.repair(x, c, args.budget)),
+                     ('repair greedy', lambda x: fga.repair(x, c, args.budget, 'greedy', A))]:
+        x = over.copy()
+        start = time.time()
+        op(x)
+        times[name] = time.time() - start
+        assert (x @ c <= args.budget + 1e-9).all()
+    print('budget repair of a new population: ' + ', '.join(f'{name} {t:.4f} s' for name, t in times.items()))
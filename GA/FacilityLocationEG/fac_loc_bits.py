@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 27 14:22:10 2026
+
+@author: jrbrad
+
+Bit-packed version of fac_loc_ga.py.  Each row of the population and of the
+coverage matrix A is stored as uint64 words, 64 locations or destinations
+per word, instead of one float64 per 0/1 value.  The destinations covered by
+a solution are the bitwise OR of the rows of A of its selected locations,
+and its fitness is the popcount of that OR.  A is read from A.txt once and
+kept in a binary .npz cache next to it.
+
+The GA works on the words without unpacking them: the selected locations
+are read from the nonzero words only, the cost of a solution is summed
+byte by byte from a table of the cost of every byte value at every byte
+position (as the popcount table counts bits), and mutation XORs the bits
+at geometric-skip sites straight into the words.
+
+    python fac_loc_bits.py
+    python fac_loc_bits.py --num-loc 20000 --num-dest 50000 --budget 300   (random instance)
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import fac_loc_ga as fga
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from galib import operators
+
+def pack(x):
+    ''' 0/1 array to uint64 words along the last axis, bit j of word k being element 64*k + j '''
+    x = np.asarray(x) != 0
+    num_words = -(-x.shape[-1] // 64)
+    pad = [(0, 0)] * (x.ndim - 1) + [(0, 64*num_words - x.shape[-1])]
+    bytes_ = np.packbits(np.pad(x, pad), axis=-1, bitorder='little')
+    return np.ascontiguousarray(bytes_).view('<u8')
+
+def unpack(words, size):
+    ''' pack() reversed: 0/1 uint8 array with size elements along the last axis '''
+    return np.unpackbits(words.view(np.uint8), axis=-1, count=size, bitorder='little')
+
+''' bits of every byte value, bit j of the byte in column j '''
+_byte_bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1, bitorder='little')
+_byte_count = _byte_bits.sum(axis=1)
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(words):
+        ''' Number of set bits of words, summed along the last axis '''
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+else:
+    ''' numpy < 2.0: look up the bit count of every byte '''
+    def popcount(words):
+        ''' Number of set bits of words, summed along the last axis '''
+        return _byte_count[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+def load_A(fname_A):
+    ''' Packed coverage matrix and number of destinations; A.txt is parsed
+        only when its .npz cache is missing or older '''
+    cache = os.path.splitext(fname_A)[0] + '.npz'
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(fname_A):
+        with np.load(cache) as data:
+            return data['A_bits'], int(data['num_dest'])
+    A = np.loadtxt(fname_A)
+    A_bits = pack(A)
+    np.savez(cache, A_bits=A_bits, num_dest=A.shape[1])
+    return A_bits, A.shape[1]
+
+def random_instance(num_loc, num_dest, density, seed, chunk=1000):
+    ''' fac_loc_islands.random_instance() with A packed chunk rows at a time,
+        so the float64 matrix never exists; the same seed gives the same instance '''
+    rng = np.random.default_rng(seed)
+    A_bits = np.concatenate([pack(rng.random((min(chunk, num_loc - i), num_dest)) < density)
+                             for i in range(0, num_loc, chunk)])
+    c = rng.uniform(1, 20, size=num_loc)
+    return A_bits, c
+
+def init(n, m, perc):
+    return pack(np.random.random(size=(n, m)) <= perc)
+
+def cost_table(c):
+    ''' Cost of the locations of every byte value at every byte position of a
+        packed solution, shape (8*words, 256) '''
+    num_bytes = -(-c.shape[0] // 64) * 8
+    c_pad = np.zeros(8*num_bytes)
+    c_pad[:c.shape[0]] = c
+    return c_pad.reshape(num_bytes, 8) @ _byte_bits.T
+
+def cost(pop_bits, table):
+    ''' Cost of each packed solution, one table lookup per byte '''
+    pop_bytes = pop_bits.view(np.uint8)
+    return table[np.arange(table.shape[0]), pop_bytes].sum(axis=-1)
+
+def selected(pop_bits):
+    ''' (solution, location) of every set bit, from the nonzero words only '''
+    rows, words = np.nonzero(pop_bits)
+    bits = np.unpackbits(pop_bits[rows, words].view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    k, bit = np.nonzero(bits)
+    return rows[k], 64*words[k] + bit
+
+def feasible(pop_bits, c, budget, table=None):
+    ''' fac_loc_ga.feasible() on the unpacked solutions over budget; table
+        is cost_table(c), made here when not given '''
+    table = cost_table(c) if table is None else table
+    over = np.flatnonzero(cost(pop_bits, table) > budget)
+    if over.size > 0:
+        sub = unpack(pop_bits[over], c.shape[0]).astype(np.float64)
+        fga.feasible(sub, c, budget)
+        pop_bits[over] = pack(sub)
+
+def fitness(pop_bits, A_bits):
+    ''' Popcount of the OR of the rows of A of each solution's selected locations '''
+    rows, locs = selected(pop_bits)
+    fit = np.zeros(pop_bits.shape[0], dtype=np.int64)
+    if rows.size > 0:
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        fit[rows[starts]] = popcount(np.bitwise_or.reduceat(A_bits[locs], starts, axis=0))
+    return fit
+
+def prefix_mask(cuts, num_words):
+    ''' Packed masks with the bits 0..cut set, one row per crossover point '''
+    word = np.arange(num_words)
+    full = word < (cuts // 64)[:, np.newaxis]
+    shift = (cuts % 64 + 1).astype(np.uint64)
+    ''' bits 0..cut%64 of the crossover point's word; a shift of 64 is done in two steps '''
+    partial = (np.uint64(1) << (shift - np.uint64(1)) << np.uint64(1)) - np.uint64(1)
+    mask = np.where(full, ~np.uint64(0), np.uint64(0))
+    mask[word == (cuts // 64)[:, np.newaxis]] = partial
+    return mask
+
+def crossover(parents, pop_bits, m):
+    ''' One-point crossover of fac_loc_ga.crossover(): locations 0..cut from the first parent '''
+    crosspts = np.random.randint(0, m, size=pop_bits.shape[0])
+    left = prefix_mask(crosspts, pop_bits.shape[1])
+    return (pop_bits[parents[:,0]] & left) | (pop_bits[parents[:,1]] & ~left)
+
+def mutate(pop_bits, perc, m):
+    ''' Flip each of the m location bits of every solution with probability
+        perc, at sites drawn by geometric skips (from np.random) '''
+    sol, loc = np.divmod(operators.mutation_sites(pop_bits.shape[0]*m, perc, np.random), m)
+    np.bitwise_xor.at(pop_bits, (sol, loc // 64), np.uint64(1) << (loc % 64).astype(np.uint64))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bit-packed GA for the facility location example')
+    parser.add_argument('--gens', type=int, default=200, help='number of generations')
+    parser.add_argument('--pop', type=int, default=20, help='population size')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--num-loc', type=int, default=None, help='random instance with this many locations instead of A.txt')
+    parser.add_argument('--num-dest', type=int, default=1000, help='destinations of the random instance')
+    parser.add_argument('--budget', type=float, default=30)
+    args = parser.parse_args()
+
+    if args.num_loc is None:
+        A_bits, num_dest = load_A('A.txt')
+        c = np.loadtxt('c.txt')
+    else:
+        A_bits, c = random_instance(args.num_loc, args.num_dest, 0.01, args.seed or 0)
+        num_dest = args.num_dest
+        print(f'A: float64 {8*args.num_loc*num_dest/1024**2:.1f} MB, packed {A_bits.nbytes/1024**2:.2f} MB')
+    num_loc = A_bits.shape[0]
+    if args.seed is not None:
+        np.random.seed(args.seed)
+
+    init_perc = 0.05
+    mutate_perc = 0.001
+
+    start = time.time()
+    table = cost_table(c)
+    pop_bits = init(args.pop, num_loc, init_perc)
+    feasible(pop_bits, c, args.budget, table)
+    fit = fitness(pop_bits, A_bits)
+    best_fit, best_soln = fga.stat(pop_bits, fit, 0, np.zeros(pop_bits.shape[1], dtype=np.uint64))
+    for i in range(args.gens):
+        fga.report(i, best_fit, fit)
+        parents = fga.select(pop_bits, fit)
+        pop_bits = crossover(parents, pop_bits, num_loc)
+        mutate(pop_bits, mutate_perc, num_loc)
+        feasible(pop_bits, c, args.budget, table)
+        fit = fitness(pop_bits, A_bits)
+        best_fit, best_soln = fga.stat(pop_bits, fit, best_fit, best_soln)
+    print(f'Best solution: {np.flatnonzero(unpack(best_soln, num_loc)).tolist()}')
+    print(f'Execution time: {time.time() - start} seconds')
@@ -5,7 +5,11 @@ Created on Wed Jan  3 08:56:03 2024
 @author: jrbrad
 """
 
+import os
+import sys
 import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from galib import trace
 
 def read_data(fname_A, fname_c):
     A = np.loadtxt(fname_A)
@@ -22,6 +26,38 @@ def init(n, m, perc):
     return pop
 
 def feasible(pop,c,budget):
+    repair(pop, c, budget)
+
+def repair(pop, c, budget, mode='random', A=None, rng=None):
+    ''' Population-wide feasible(): the selected locations of each solution over
+        budget are ordered once, and the first ones in that order are removed
+        until the remaining cost is within budget.  mode 'random' orders them
+        at random, as feasible_loop() removes them; mode 'greedy' removes the
+        locations with the fewest destinations covered (rows of A) per unit
+        cost first, ties in random order.  rng is np.random by default, or an
+        np.random.Generator '''
+    cost = pop*c
+    total = cost.sum(axis=1)
+    over = np.flatnonzero(total > budget)
+    if over.size == 0:
+        return
+    sel = pop[over] == 1
+    rng = np.random if rng is None else rng
+    tie = rng.random(sel.shape)
+    ''' unselected locations sort last and are never removed '''
+    if mode == 'random':
+        order = np.argsort(np.where(sel, tie, np.inf), axis=1)
+    elif mode == 'greedy':
+        order = np.lexsort((tie, np.where(sel, A.sum(axis=1)/c, np.inf)), axis=1)
+    else:
+        raise ValueError(f'unknown repair mode {mode!r}')
+    cost_sorted = np.take_along_axis(cost[over], order, axis=1)
+    removed_before = np.cumsum(cost_sorted, axis=1) - cost_sorted
+    drop = np.take_along_axis(sel, order, axis=1) & (total[over,np.newaxis] - removed_before > budget)
+    rows, pos = np.nonzero(drop)
+    pop[over[rows], order[rows, pos]] = 0
+
+def feasible_loop(pop,c,budget):
     for i in range(pop.shape[0]):
         ''' randomly delete locations until within budget '''
         while pop[i]@c > budget:
@@ -32,6 +68,41 @@ def feasible(pop,c,budget):
 def fitness(pop,A):
     return ((pop@A)>0).sum(axis=1)
 
+def coverage(pop, A):
+    ''' Number of selected locations covering each destination, for each solution '''
+    return pop@A
+
+def fitness_cov(cov):
+    ''' fitness() from coverage counts '''
+    return (cov>0).sum(axis=1)
+
+def update_coverage(cov, ref, pop, A, max_changed=0.05):
+    ''' Coverage counts of pop from the counts cov of the solutions ref, one
+        reference solution per row of pop: each row adds only the rows of A of
+        its own changed location bits, so the cost grows with the number of
+        changed genes.  Rows with more than max_changed of their bits changed
+        are recomputed in full, one matrix product for all of them (on the
+        fac_loc_bench.py instance the time is about the same for any
+        max_changed from 0.02 to 1, and higher below 0.02) '''
+    diff = pop - ref
+    rows, locs = np.nonzero(diff)
+    counts = np.bincount(rows, minlength=pop.shape[0])
+    cov = cov.copy()
+    full = counts > max_changed * pop.shape[1]
+    if full.any():
+        cov[full] = pop[full] @ A
+    starts = np.r_[0, np.cumsum(counts)]
+    for r in np.flatnonzero((counts > 0) & ~full):
+        l = locs[starts[r]:starts[r+1]]
+        cov[r] += diff[r, l] @ A[l]
+    return cov
+
+def nearest_parent(parents, pop, old_pop):
+    ''' Parent of each child in pop with fewer differing bits, as the reference for update_coverage() '''
+    first = (pop != old_pop[parents[:,0]]).sum(axis=1)
+    second = (pop != old_pop[parents[:,1]]).sum(axis=1)
+    return np.where(first <= second, parents[:,0], parents[:,1])
+
 def select(pop, fit):
     ''' Compute probability distribution for choosing parents '''
     prob = fit/sum(fit)
@@ -59,31 +130,49 @@ def stat(pop, fit, best_fit, best_soln):
 def report(i, best_fit, fit):
     print(f'Generation {i}: Best fit: {best_fit}; Max fit gen:{fit.max()}; Avg fit gen: {fit.mean()}')
     
-''' Input data '''
-A,budget,c = read_data('A.txt', 'c.txt')
-num_loc = A.shape[0]
-num_dest = A.shape[1]
-
-''' GA parameters '''
-n = 20 # population size
-num_gen = 200
-init_perc = 0.05 # expected percentage of possible locations 
-                 # selected in initial candidate solutions
-mutate_perc = 0.001
-
-''' Initialize population '''
-pop = init(n, num_loc, init_perc)
-feasible(pop,c,budget) # note that function modifies population directly
-fit = fitness(pop,A)
-best_fit, best_soln = stat(pop, fit, 0, np.zeros(num_loc))
-
-''' Evolution '''
-for i in range(num_gen):
-    report(i, best_fit, fit)
-    parents = select(pop, fit)
-    pop = crossover(parents,pop) # replace population with offspring
-    mutate(pop, mutate_perc)
-    feasible(pop,c,budget)
-    fit = fitness(pop,A)
-    best_fit, best_soln = stat(pop, fit, best_fit, best_soln)
+if __name__ == '__main__':
+    ''' Input data '''
+    A,budget,c = read_data('A.txt', 'c.txt')
+    num_loc = A.shape[0]
+    num_dest = A.shape[1]
+
+    ''' GA parameters '''
+    n = 20 # population size
+    num_gen = 200
+    init_perc = 0.05 # expected percentage of possible locations 
+                     # selected in initial candidate solutions
+    mutate_perc = 0.001
+    repair_mode = 'random'  # 'greedy': remove the fewest destinations per unit cost first
+    trace_file = None # e.g. 'trace.jsonl' or 'trace.csv': per-generation operator times (galib/trace.py)
+    trace_memory = False # also trace memory with tracemalloc (slow)
+
+    ''' Initialize population '''
+    pop = init(n, num_loc, init_perc)
+    repair(pop,c,budget,repair_mode,A) # note that function modifies population directly
+    cov = coverage(pop,A) # destination coverage counts, updated incrementally
+    fit = fitness_cov(cov)
+    best_fit, best_soln = stat(pop, fit, 0, np.zeros(num_loc))
+
+    ''' Evolution '''
+    tracer = trace.start(trace_file, trace_memory)
+    if tracer:
+        tracer.instrument(globals(), ['select', 'crossover', 'nearest_parent', 'update_coverage',
+                                      'mutate', 'repair', 'fitness_cov'])
+    for i in range(num_gen):
+        report(i, best_fit, fit)
+        parents = select(pop, fit)
+        old_pop = pop
+        pop = crossover(parents,pop) # replace population with offspring
+        ref = nearest_parent(parents, pop, old_pop)
+        cov = update_coverage(cov[ref], old_pop[ref], pop, A)
+        old_pop = pop.copy()
+        mutate(pop, mutate_perc)
+        repair(pop,c,budget,repair_mode,A)
+        cov = update_coverage(cov, old_pop, pop, A)
+        fit = fitness_cov(cov)
+        best_fit, best_soln = stat(pop, fit, best_fit, best_soln)
+        if tracer:
+            tracer.generation(i, best=best_fit, max=fit.max(), mean=fit.mean())
+    if tracer:
+        print(tracer.close())
     
\ No newline at end of file
@@ -5,8 +5,11 @@ Created on Wed Jan  3 08:56:03 2024
 @author: jrbrad
 """
 
+import os
 import numpy as np
 import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from galib import selection
 
 def read_data(fname_A, fname_c):
     A = np.loadtxt(fname_A)
@@ -33,23 +36,13 @@ def feasible(pop,c,budget):
 def fitness(pop,A):
     return ((pop@A)>0).sum(axis=1)
 
-def select(pop, fit, select_mode, q):
-    ''' Compute probability distribution for choosing parents '''
-    if select_mode=='proportional':
-        prob = fit/sum(fit)
-    elif select_mode=='rank-linear':
-        r = np.zeros(pop.shape[0])
-        r[np.argsort(fit)] = np.arange(pop.shape[0])
-        prob = (1+r)/(1+r).sum()
-    elif select_mode=='rank-nonlinear':
-        r = np.zeros(pop.shape[0])
-        r[np.argsort(fit)] = np.flip(np.arange(pop.shape[0]))
-        prob = (q**(1+r))/(q**(1+r)).sum()
-    else:
-        print('Invalid selection parameter')
+def select(pop, fit, select_mode, q, sampler='alias'):
+    ''' Parents from galib/selection.py; sampler is 'alias', 'sus' or 'choice' '''
+    try:
+        return selection.select(fit, select_mode, (pop.shape[0],2), q, sampler)
+    except ValueError as err:
+        print(f'Invalid selection parameter: {err}')
         sys.exit(1)
-    parents = np.random.choice(np.arange(pop.shape[0]), size=(pop.shape[0],2), p = prob)
-    return parents
 
 def crossover(parents,pop):
     crosspts = np.random.randint(0,pop.shape[1],size=pop.shape[0])
@@ -85,6 +78,7 @@ init_perc = 0.05 # expected percentage of possible locations
 mutate_perc = 0.001
 select_mode = 'rank-nonlinear'
 q = 0.9
+sampler = 'alias' # 'sus', 'choice'; select_mode may also be 'tournament'
 
 ''' Initialize population '''
 pop = init(n, num_loc, init_perc)
@@ -95,7 +89,7 @@ best_fit, best_soln = stat(pop, fit, 0, np.zeros(num_loc))
 ''' Evolution '''
 for i in range(num_gen):
     report(i, best_fit, fit)
-    parents = select(pop, fit, select_mode, q)
+    parents = select(pop, fit, select_mode, q, sampler)
     pop = crossover(parents,pop) # replace population with offspring
     mutate(pop, mutate_perc)
     feasible(pop,c,budget)
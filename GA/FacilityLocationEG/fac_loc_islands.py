@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 26 09:14:52 2026
+
+@author: jrbrad
+
+Island model version of fac_loc_ga.py: K populations evolve in K processes
+with the init/select/crossover/mutate/feasible/fitness functions of
+fac_loc_ga.py, and every migrate_every generations each island sends copies
+of its num_migrants best solutions to other islands, where they replace the
+worst solutions.  Migrants travel over one multiprocessing queue per island.
+
+The topology decides where migrants go:
+
+    ring     island k sends to island k+1
+    full     every island sends to every other island
+    random   a ring over a new random order of the islands at each migration
+
+    python fac_loc_islands.py --islands 8 --gens 200 --migrate-every 10 --migrants 2 --topology ring
+    python fac_loc_islands.py --num-loc 500 --num-dest 2000 --budget 300     (random instance)
+"""
+
+import argparse
+import multiprocessing as mp
+import time
+import numpy as np
+import fac_loc_ga as fga
+
+def random_instance(num_loc, num_dest, density, seed):
+    ''' Random coverage matrix A and location costs c for larger experiments '''
+    rng = np.random.default_rng(seed)
+    A = (rng.random((num_loc, num_dest)) < density).astype(np.float64)
+    c = rng.uniform(1, 20, size=num_loc)
+    return A, c
+
+def targets(k, num_islands, topology, epoch, seed):
+    ''' Islands that island k sends its migrants to at migration number epoch '''
+    if topology == 'ring':
+        return [(k + 1) % num_islands]
+    elif topology == 'full':
+        return [j for j in range(num_islands) if j != k]
+    elif topology == 'random':
+        ''' every island draws the same order from (seed, epoch) '''
+        order = np.random.default_rng([seed, epoch]).permutation(num_islands)
+        pos = np.flatnonzero(order == k)[0]
+        return [order[(pos + 1) % num_islands]]
+    raise ValueError(f'unknown topology {topology!r}')
+
+def num_sources(num_islands, topology):
+    ''' Number of islands that send migrants to each island at every migration '''
+    return num_islands - 1 if topology == 'full' else 1
+
+def island(k, num_islands, inboxes, results, A, c, budget, settings, seed):
+    ''' Evolve one population, exchanging migrants with the other islands '''
+    np.random.seed(seed + k)
+    n, num_gen = settings['n'], settings['num_gen']
+    migrate_every, num_migrants = settings['migrate_every'], settings['num_migrants']
+    topology = settings['topology']
+    num_loc = A.shape[0]
+
+    pop = fga.init(n, num_loc, settings['init_perc'])
+    fga.feasible(pop, c, budget)
+    cov = fga.coverage(pop, A)
+    fit = fga.fitness_cov(cov)
+    best_fit, best_soln = fga.stat(pop, fit, 0, np.zeros(num_loc))
+    history = []
+    early = []
+    for i in range(num_gen):
+        parents = fga.select(pop, fit)
+        old_pop = pop
+        pop = fga.crossover(parents, pop)
+        ref = fga.nearest_parent(parents, pop, old_pop)
+        cov = fga.update_coverage(cov[ref], old_pop[ref], pop, A)
+        old_pop = pop.copy()
+        fga.mutate(pop, settings['mutate_perc'])
+        fga.feasible(pop, c, budget)
+        cov = fga.update_coverage(cov, old_pop, pop, A)
+        fit = fga.fitness_cov(cov)
+        best_fit, best_soln = fga.stat(pop, fit, best_fit, best_soln)
+        history.append(best_fit)
+
+        if num_islands > 1 and migrate_every > 0 and (i + 1) % migrate_every == 0:
+            epoch = (i + 1) // migrate_every
+            best = np.argsort(fit)[-num_migrants:]
+            for j in targets(k, num_islands, topology, epoch, seed):
+                inboxes[j].put((epoch, pop[best].copy(), fit[best].copy()))
+            ''' Wait for this migration's migrants; a faster island's next
+                migration can arrive first and is kept for later '''
+            arrived = [m for m in early if m[0] == epoch]
+            early = [m for m in early if m[0] != epoch]
+            while len(arrived) < num_sources(num_islands, topology):
+                message = inboxes[k].get()
+                (arrived if message[0] == epoch else early).append(message)
+            for _, mig_pop, mig_fit in arrived:
+                worst = np.argsort(fit)[:mig_pop.shape[0]]
+                pop[worst] = mig_pop
+                fit[worst] = mig_fit
+                cov[worst] = fga.coverage(mig_pop, A)
+    results.put((k, best_fit, best_soln, history))
+
+def run_islands(A, c, budget, num_islands, settings, seed=0):
+    ''' Run the islands in parallel; returns {island: (best_fit, best_soln, history)} '''
+    inboxes = [mp.Queue() for _ in range(num_islands)]
+    results = mp.Queue()
+    procs = [mp.Process(target=island, args=(k, num_islands, inboxes, results, A, c, budget, settings, seed))
+             for k in range(num_islands)]
+    for proc in procs:
+        proc.start()
+    out = {}
+    for _ in range(num_islands):
+        k, best_fit, best_soln, history = results.get()
+        out[k] = (best_fit, best_soln, history)
+    for proc in procs:
+        proc.join()
+    return out
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Island model GA for the facility location example')
+    parser.add_argument('--islands', type=int, default=mp.cpu_count(), help='number of islands (processes)')
+    parser.add_argument('--pop', type=int, default=20, help='population size of each island')
+    parser.add_argument('--gens', type=int, default=200, help='number of generations')
+    parser.add_argument('--migrate-every', type=int, default=10, help='generations between migrations (0: none)')
+    parser.add_argument('--migrants', type=int, default=2, help='best solutions sent at each migration')
+    parser.add_argument('--topology', default='ring', choices=['ring', 'full', 'random'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--num-loc', type=int, default=None, help='random instance with this many locations instead of A.txt')
+    parser.add_argument('--num-dest', type=int, default=1000, help='destinations of the random instance')
+    parser.add_argument('--budget', type=float, default=None, help='budget (default: that of read_data())')
+    args = parser.parse_args()
+
+    if args.num_loc is None:
+        A, budget, c = fga.read_data('A.txt', 'c.txt')
+    else:
+        A, c = random_instance(args.num_loc, args.num_dest, 0.01, args.seed)
+        budget = 30
+    budget = budget if args.budget is None else args.budget
+    settings = {'n': args.pop, 'num_gen': args.gens, 'init_perc': 0.05, 'mutate_perc': 0.001,
+                'migrate_every': args.migrate_every, 'num_migrants': args.migrants, 'topology': args.topology}
+
+    start = time.time()
+    out = run_islands(A, c, budget, args.islands, settings, args.seed)
+    best = max(out, key=lambda k: out[k][0])
+    for k in sorted(out):
+        print(f'Island {k}: Best fit: {out[k][0]}')
+    print(f'Best fit over {args.islands} islands: {out[best][0]} (island {best}); '
+          f'locations {np.flatnonzero(out[best][1]).tolist()}')
+    print(f'Execution time: {time.time() - start} seconds')
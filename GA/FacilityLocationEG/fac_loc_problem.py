@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 29 13:02:45 2026
+
+@author: jrbrad
+
+The facility location example as a galib.engine problem: 0/1 location
+genes, the fitness and budget repair of fac_loc_ga.py.
+
+    python fac_loc_problem.py --gens 200 --pop 20 --select tournament --seed 0
+    python fac_loc_problem.py --num-loc 2000 --num-dest 20000 --budget 300   (random instance)
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import fac_loc_ga as fga
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from galib import engine, operators, trace
+
+class FacilityLocation(engine.Problem):
+    maximize = True
+
+    def __init__(self, A, c, budget, init_perc=0.05, repair_mode='random'):
+        self.A, self.c, self.budget = A, c, budget
+        self.init_perc, self.repair_mode = init_perc, repair_mode
+
+    def encode(self, n, rng):
+        return (rng.random((n, self.A.shape[0])) <= self.init_perc).astype(np.float64)
+
+    def fitness(self, pop):
+        return fga.fitness(pop, self.A)
+
+    def repair(self, pop, rng):
+        fga.repair(pop, self.c, self.budget, self.repair_mode, self.A, rng)
+
+    def mutate(self, pop, prob, rng):
+        operators.flip(pop, prob, rng)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Facility location example on the galib engine')
+    parser.add_argument('--pop', type=int, default=20, help='population size')
+    parser.add_argument('--gens', type=int, default=200, help='number of generations')
+    parser.add_argument('--select', default='proportional', help='selection mode (galib/selection.py)')
+    parser.add_argument('--q', type=float, default=0.9, help='q of rank-nonlinear selection')
+    parser.add_argument('--crossover', default='one_point', choices=list(operators.crossovers))
+    parser.add_argument('--mutate', type=float, default=0.001, help='mutation probability of a location')
+    parser.add_argument('--elite', type=int, default=0, help='best solutions kept unchanged')
+    parser.add_argument('--repair', default='random', choices=['random', 'greedy'])
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--trace', default=None, help='per-generation trace file (.jsonl or .csv)')
+    parser.add_argument('--num-loc', type=int, default=None, help='random instance with this many locations instead of A.txt')
+    parser.add_argument('--num-dest', type=int, default=1000, help='destinations of the random instance')
+    parser.add_argument('--budget', type=float, default=None, help='budget (default: that of read_data())')
+    args = parser.parse_args()
+
+    if args.num_loc is None:
+        A, budget, c = fga.read_data('A.txt', 'c.txt')
+    else:
+        from fac_loc_islands import random_instance
+        A, c = random_instance(args.num_loc, args.num_dest, 0.01, args.seed or 0)
+        budget = 30
+    budget = budget if args.budget is None else args.budget
+    problem = FacilityLocation(A, c, budget, repair_mode=args.repair)
+
+    start = time.time()
+    tracer = trace.start(args.trace)
+    result = engine.run(problem, args.pop, args.gens, args.select, args.q, crossover=args.crossover,
+                        mutate_prob=args.mutate, num_elite=args.elite, seed=args.seed,
+                        tracer=tracer, report=fga.report)
+    if tracer:
+        print(tracer.close())
+    print(f'Best fit: {result.best_fit}; locations {np.flatnonzero(result.best_soln).tolist()}')
+    print(f'Execution time: {time.time() - start} seconds')
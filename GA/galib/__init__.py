@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 28 09:12:40 2026
+
+@author: jrbrad
+
+Shared pieces of the genetic algorithms in GA/ and Assignments/:
+
+    selection   parent selection (proportional, rank-linear, rank-nonlinear,
+                tournament) with alias-table and stochastic universal sampling
+    trace       per-generation operator times, generations per second and
+                tracemalloc counters, written as JSON lines or CSV
+    operators   vectorized crossover and mutation of 2D populations
+    engine      one GA main loop for any problem with encode, fitness,
+                repair and mutate (engine.Problem)
+
+Scripts outside GA/ add GA/ to sys.path and import from galib.
+"""
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 29 10:18:53 2026
+
+@author: jrbrad
+
+One GA main loop for any problem.  A problem supplies
+
+    maximize            True to maximize fitness, False to minimize it
+    encode(n, rng)      n random solutions, a 2D array with a row per solution
+    fitness(pop)        fitness of each row of pop
+    repair(pop, rng)    make the rows of pop feasible, in place
+    mutate(pop, prob, rng)
+                        mutate the rows of pop in place, e.g. operators.flip
+
+and run() evolves it with selection.py and a crossover of operators.py:
+
+    result = engine.run(problem, pop_size=200, num_gen=100, select_mode='tournament', seed=0)
+
+The loop keeps two populations, two fitness arrays and the crossover work
+arrays, allocated once, and swaps them every generation.  The num_elite
+best solutions are carried over unchanged.  Every random draw comes from
+np.random.Generator streams spawned from one SeedSequence, one stream each
+for encode, select, crossover, mutate and repair, so changing one operator
+does not change the draws of the others.  A problem must draw from the rng
+it is given: the global np.random state is neither seeded nor used.
+"""
+
+from collections import namedtuple
+import numpy as np
+from . import operators, selection
+
+Result = namedtuple('Result', ['best_fit', 'best_soln', 'history'])
+Result.__doc__ = ''' history has a row (best of generation, best so far, mean) per generation, initial population first '''
+
+class Problem:
+    ''' Defaults for the problems run() solves (see the module docstring): a
+        problem adds encode() and fitness() and may replace the rest '''
+    maximize = True
+
+    def repair(self, pop, rng):
+        pass
+
+    def mutate(self, pop, prob, rng):
+        operators.flip(pop, prob, rng)
+
+def elite(fit, num_elite, maximize):
+    ''' Indices of the num_elite best solutions, in no particular order '''
+    if num_elite == 0:
+        return np.zeros(0, dtype=np.int64)
+    if maximize:
+        return np.argpartition(fit, fit.shape[0] - num_elite)[-num_elite:]
+    return np.argpartition(fit, num_elite - 1)[:num_elite]
+
+def run(problem, pop_size, num_gen, select_mode='proportional', q=None, sampler='alias',
+        crossover='one_point', mutate_prob=0.001, num_elite=0, tournament_size=2, seed=None,
+        tracer=None, report=None):
+    ''' Evolve problem for num_gen generations; returns a Result.  crossover is
+        a name in operators.crossovers or a crossover operator; tracer is a
+        galib.trace.Trace or None; report(gen, best_fit, fit) is called
+        before every generation when given '''
+    seq = np.random.SeedSequence(seed)
+    rng_encode, rng_select, rng_cross, rng_mutate, rng_repair = [np.random.default_rng(s) for s in seq.spawn(5)]
+    if isinstance(crossover, str):
+        crossover = operators.crossovers[crossover]
+    select, mutate, repair, fitness = selection.select, problem.mutate, problem.repair, problem.fitness
+    if tracer:
+        select, crossover = tracer.wrap('select', select), tracer.wrap('crossover', crossover)
+        mutate, repair, fitness = tracer.wrap('mutate', mutate), tracer.wrap('repair', repair), tracer.wrap('fitness', fitness)
+
+    pop = problem.encode(pop_size, rng_encode)
+    problem.repair(pop, rng_repair)
+    fit = np.asarray(problem.fitness(pop), dtype=np.float64)
+    num_child = pop_size - num_elite
+    pop_next = np.empty_like(pop)
+    fit_next = np.empty_like(fit)
+    other = np.empty_like(pop[:num_child])
+    mask = np.empty(other.shape, dtype=bool)
+    children = pop_next[:num_child]
+
+    best_of = np.max if problem.maximize else np.min
+    arg_best = np.argmax if problem.maximize else np.argmin
+    better = np.greater if problem.maximize else np.less
+    best_fit, best_soln = fit[arg_best(fit)], pop[arg_best(fit)].copy()
+    history = np.empty((num_gen + 1, 3))
+    history[0] = best_fit, best_fit, fit.mean()
+    for i in range(num_gen):
+        if report is not None:
+            report(i, best_fit, fit)
+        parents = select(fit, select_mode, (num_child, 2), q, sampler, problem.maximize,
+                         tournament_size, rng_select)
+        crossover(pop, parents, children, other, mask, rng_cross)
+        mutate(children, mutate_prob, rng_mutate)
+        repair(children, rng_repair)
+        fit_next[:num_child] = fitness(children)
+        keep = elite(fit, num_elite, problem.maximize)
+        np.take(pop, keep, axis=0, out=pop_next[num_child:])
+        fit_next[num_child:] = fit[keep]
+        pop, pop_next, fit, fit_next = pop_next, pop, fit_next, fit
+        children = pop_next[:num_child]
+
+        gen_best = arg_best(fit)
+        if better(fit[gen_best], best_fit):
+            best_fit, best_soln = fit[gen_best], pop[gen_best].copy()
+        history[i+1] = best_of(fit), best_fit, fit.mean()
+        if tracer:
+            tracer.generation(i, best=history[i+1, 0], best_so_far=best_fit, mean=history[i+1, 2])
+    return Result(best_fit, best_soln, history)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 29 09:41:26 2026
+
+@author: jrbrad
+
+Vectorized crossover and mutation for populations stored as 2D arrays, one
+solution per row and one gene per column, of any dtype.
+
+A crossover operator fills preallocated arrays instead of building a new
+population:
+
+    op(pop, parents, out, other, mask, rng)
+
+with parents of shape (num_child, 2) and out, other and mask of shape
+(num_child, num_genes).  out receives the first parents, other the second
+parents and mask the genes that come from the second parent; out is then
+the children.
+
+A mutation operator changes genes in place at sites drawn by geometric
+skips (as assignment_ops.mutation_sites() in the worker-task folder):
+
+    op(pop, prob, rng)
+
+The sites are indices into the flattened population, turned into (row,
+gene) pairs, so the genes are written into pop itself even when it is a
+view that is not C-contiguous.
+"""
+
+import numpy as np
+
+def _parents(pop, parents, out, other):
+    np.take(pop, parents[:, 0], axis=0, out=out, mode='clip')
+    np.take(pop, parents[:, 1], axis=0, out=other, mode='clip')
+
+def one_point(pop, parents, out, other, mask, rng):
+    ''' Genes 0..cut from the first parent, as crossover() in fac_loc_ga.py '''
+    _parents(pop, parents, out, other)
+    cut = rng.integers(0, pop.shape[1], size=(parents.shape[0], 1))
+    np.greater(np.arange(pop.shape[1]), cut, out=mask)
+    np.copyto(out, other, where=mask)
+
+def two_point(pop, parents, out, other, mask, rng):
+    ''' Genes between two cuts from the second parent '''
+    _parents(pop, parents, out, other)
+    cut = np.sort(rng.integers(0, pop.shape[1] + 1, size=(parents.shape[0], 2)), axis=1)
+    gene = np.arange(pop.shape[1])
+    np.greater_equal(gene, cut[:, :1], out=mask)
+    mask &= gene < cut[:, 1:]
+    np.copyto(out, other, where=mask)
+
+def uniform(pop, parents, out, other, mask, rng):
+    ''' Each gene from either parent with probability 1/2 '''
+    _parents(pop, parents, out, other)
+    np.less(rng.random(mask.shape), 0.5, out=mask)
+    np.copyto(out, other, where=mask)
+
+crossovers = {'one_point': one_point, 'two_point': two_point, 'uniform': uniform}
+
+def mutation_sites(n, prob, rng):
+    ''' Sorted indices in range(n), each included with probability prob '''
+    if prob <= 0 or n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if prob >= 1:
+        return np.arange(n)
+    expected = n * prob
+    sites = np.cumsum(rng.geometric(prob, size=int(expected + 5*np.sqrt(expected) + 10))) - 1
+    while sites[-1] < n:
+        more = np.cumsum(rng.geometric(prob, size=sites.size)) + sites[-1]
+        sites = np.concatenate((sites, more))
+    return sites[:np.searchsorted(sites, n)]
+
+def flip(pop, prob, rng):
+    ''' 0/1 genes: flip each gene with probability prob '''
+    sol, gene = np.divmod(mutation_sites(pop.size, prob, rng), pop.shape[1])
+    pop[sol, gene] = 1 - pop[sol, gene]
+
+def reassign(num_values):
+    ''' Integer genes in range(num_values): mutation operator changing each
+        gene with probability prob to one of the other values '''
+    def op(pop, prob, rng):
+        sol, gene = np.divmod(mutation_sites(pop.size, prob, rng), pop.shape[1])
+        pop[sol, gene] = (pop[sol, gene] + rng.integers(1, max(2, num_values), size=sol.size)) % num_values
+    return op
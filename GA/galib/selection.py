@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 28 09:20:15 2026
+
+@author: jrbrad
+
+Parent selection for the GAs.  The selection modes of fac_loc_gaS2.py and
+the worker-task assignment.py give each solution a selection probability:
+
+    proportional     fitness (maximize) or 1/fitness (minimize)
+    rank-linear      1 + rank, the worst solution having rank 0
+    rank-nonlinear   q**rank, the best solution having rank 0
+
+and 'tournament' draws tournament_size solutions at random per parent and
+keeps the best of them.  The probabilities are sampled with one of
+
+    choice   np.random.choice(..., p=prob), as the scripts did: a CDF is
+             built and binary-searched on every call
+    alias    Walker alias table: O(n) to build, then O(1) per parent
+    sus      stochastic universal sampling: one random number, evenly spaced
+             pointers along the CDF, O(n + number of parents); the parents
+             are returned in random order
+
+The probability of each rank does not change between generations, so for
+the rank modes select() builds the sampler's table in rank order once per
+(mode, n, q, sampler) and draws rank positions from it; each generation
+only orders the solutions.  rank-nonlinear weights q**rank that underflow
+to 0 are never drawn, and when there are such ranks the solutions that can
+be drawn are picked by np.argpartition before they are sorted.
+
+The random draws go through rng, np.random by default, or an
+np.random.Generator.
+"""
+
+import functools
+import numpy as np
+
+modes = ['proportional', 'rank-linear', 'rank-nonlinear', 'tournament']
+samplers = ['choice', 'alias', 'sus']
+
+def _mode(mode):
+    ''' worker-task scripts spell the modes with underscores '''
+    mode = mode.replace('_', '-')
+    if mode not in modes:
+        raise ValueError(f'unknown selection mode {mode!r}')
+    return mode
+
+def rank(fit, maximize=True):
+    ''' Rank of each solution, 0 for the worst and n-1 for the best '''
+    r = np.empty(fit.shape[0], dtype=np.int64)
+    order = np.argsort(fit) if maximize else np.argsort(-fit)
+    r[order] = np.arange(fit.shape[0])
+    return r
+
+def ranked(fit, num=None, maximize=True):
+    ''' Indices of the num best solutions (all of them by default), best first '''
+    n = fit.shape[0]
+    key = -fit if maximize else fit
+    if num is None or num >= n:
+        return np.argsort(key)
+    best = np.argpartition(key, num - 1)[:num]
+    return best[np.argsort(key[best])]
+
+def _check_q(q):
+    if q is None or q > 1 or q <= 0:
+        raise ValueError(f'rank-nonlinear selection needs 0 < q <= 1, not {q}')
+
+@functools.lru_cache(maxsize=16)
+def _rank_table(mode, n, q, sampler):
+    ''' Probability of each rank position, best first, without the positions
+        of weight 0, and the sampler's table for it '''
+    if mode == 'rank-linear':
+        weight = np.arange(n, 0, -1, dtype=np.float64)
+    else:
+        _check_q(q)
+        weight = q**np.arange(n, dtype=np.float64)
+        weight = weight[weight > 0]
+    prob = weight/weight.sum()
+    return prob, (alias_table(prob) if sampler == 'alias' else None)
+
+def probabilities(fit, mode, q=None, maximize=True):
+    ''' Selection probability of each solution '''
+    mode = _mode(mode)
+    if mode == 'proportional':
+        weight = fit if maximize else 1/fit
+    elif mode == 'rank-linear':
+        weight = 1 + rank(fit, maximize)
+    elif mode == 'rank-nonlinear':
+        _check_q(q)
+        weight = q**(fit.shape[0] - 1 - rank(fit, maximize))
+    else:
+        raise ValueError('tournament selection has no selection probabilities')
+    return weight/weight.sum()
+
+def alias_table(prob):
+    ''' Walker alias table (threshold, alias) of prob: bin k is drawn with
+        probability 1/n and gives k when a uniform number is below
+        threshold[k], alias[k] otherwise.
+
+        Vose's construction moves the deficit of one small bin at a time to
+        a large bin.  Here every small bin is moved at once: the deficits
+        and the excesses of the large bins are laid end to end, and each
+        small bin takes as alias the large bin under the start of its
+        deficit.  A large bin left below 1 becomes small for the next
+        round, so each round leaves at most one small bin per large bin. '''
+    n = prob.shape[0]
+    scaled = prob * (n/prob.sum())
+    threshold = np.ones(n)
+    alias = np.arange(n)
+    small = np.flatnonzero(scaled < 1)
+    large = np.flatnonzero(scaled >= 1)
+    while small.size > 0 and large.size > 0:
+        deficit = 1 - scaled[small]
+        start = np.cumsum(deficit) - deficit
+        j = np.searchsorted(np.cumsum(scaled[large] - 1), start, side='right')
+        j = np.minimum(j, large.size - 1)  # rounding at the end of the excess
+        threshold[small] = scaled[small]
+        alias[small] = large[j]
+        scaled[large] -= np.bincount(j, weights=deficit, minlength=large.size)
+        small = large[scaled[large] < 1]
+        large = large[scaled[large] >= 1]
+    ''' bins still small only by rounding keep themselves '''
+    threshold[small] = 1
+    return threshold, alias
+
+def alias_draw(threshold, alias, size, rng=None):
+    rng = np.random if rng is None else rng
+    n = threshold.shape[0]
+    k = np.minimum((rng.random(size)*n).astype(np.int64), n - 1)
+    return np.where(rng.random(size) < threshold[k], k, alias[k])
+
+def sus(prob, num, rng=None):
+    ''' num parents by stochastic universal sampling, in random order '''
+    rng = np.random if rng is None else rng
+    ''' number of the pointers u, u+1, ..., u+num-1 below num*cdf '''
+    edges = np.clip(np.floor(num*np.cumsum(prob) - rng.random()), -1, num - 1)
+    edges[-1] = num - 1
+    counts = np.diff(edges, prepend=-1).astype(np.int64)
+    return rng.permutation(np.repeat(np.arange(prob.shape[0]), counts))
+
+def tournament(fit, num, tournament_size=2, maximize=True, rng=None):
+    ''' num parents, each the best of tournament_size solutions drawn with replacement '''
+    rng = np.random if rng is None else rng
+    n = fit.shape[0]
+    entrants = np.minimum((rng.random((num, tournament_size))*n).astype(np.int64), n - 1)
+    f = fit[entrants]
+    best = f.argmax(axis=1) if maximize else f.argmin(axis=1)
+    return entrants[np.arange(num), best]
+
+def sample(prob, size, sampler='alias', rng=None, table=None):
+    ''' Indices drawn with probabilities prob, an array of shape size; table
+        is the alias table of prob when it is already built '''
+    rng = np.random if rng is None else rng
+    num = int(np.prod(size))
+    if sampler == 'choice':
+        idx = rng.choice(prob.shape[0], size=num, p=prob)
+    elif sampler == 'alias':
+        idx = alias_draw(*(alias_table(prob) if table is None else table), num, rng)
+    elif sampler == 'sus':
+        idx = sus(prob, num, rng)
+    else:
+        raise ValueError(f'unknown sampler {sampler!r}')
+    return idx.reshape(size)
+
+def select(fit, mode, size, q=None, sampler='alias', maximize=True, tournament_size=2, rng=None):
+    ''' Indices of parents, an array of shape size (an int or a tuple such as
+        (pop_size, 2)), drawn by selection mode with sampler '''
+    mode = _mode(mode)
+    if mode == 'tournament':
+        return tournament(fit, int(np.prod(size)), tournament_size, maximize, rng).reshape(size)
+    if mode == 'proportional':
+        return sample(probabilities(fit, mode, q, maximize), size, sampler, rng)
+    prob, table = _rank_table(mode, fit.shape[0], q if mode == 'rank-nonlinear' else None, sampler)
+    return ranked(fit, prob.shape[0], maximize)[sample(prob, size, sampler, rng, table)]
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 28 11:03:52 2026
+
+@author: jrbrad
+
+Time one generation's parent selection (2 parents per solution) against
+population size for every selection mode and sampler of selection.py.
+'choice' is np.random.choice(..., p=prob) as in fac_loc_gaS2.py and the
+worker-task assignment.py.
+
+    python selection_bench.py
+"""
+
+import time
+import numpy as np
+import selection
+
+def best_time(f, reps):
+    best = np.inf
+    for _ in range(reps):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    sizes = [100, 1000, 10000, 100000, 1000000]
+    cases = [(mode, sampler) for mode in ['proportional', 'rank-linear', 'rank-nonlinear']
+             for sampler in selection.samplers] + [('tournament', '')]
+    print(f'{"mode":>15} {"sampler":>7}' + ''.join(f'{n:>11}' for n in sizes) + '   (ms)')
+    for mode, sampler in cases:
+        row = f'{mode:>15} {sampler:>7}'
+        for n in sizes:
+            fit = np.random.random(n)*100
+            reps = max(3, 100000 // n)
+            t = best_time(lambda: selection.select(fit, mode, (n, 2), q=0.99, sampler=sampler or 'alias'), reps)
+            row += f'{1000*t:>11.3f}'
+        print(row)
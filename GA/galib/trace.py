@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 28 15:37:09 2026
+
+@author: jrbrad
+
+Per-generation trace of a GA: time spent in each operator, generations per
+second and, optionally, memory from tracemalloc.  One record per generation
+goes to a JSON lines file (.jsonl) or a CSV file (.csv).
+
+Operators are timed by replacing them with timing wrappers, so a script
+pays nothing when tracing is off: start(None) returns None and the
+operators are left as they are.  The clock starts with start(), so a
+script starts the trace just before its first generation.
+
+    tracer = trace.start(trace_file, memory=trace_memory)
+    if tracer:
+        tracer.instrument(globals(), ['select', 'crossover', 'mutate', 'feasible', 'fitness'])
+    for i in range(num_gen):
+        ...
+        if tracer:
+            tracer.generation(i, best=fit.max(), mean=fit.mean())
+    if tracer:
+        print(tracer.close())
+
+With memory=True every generation record also has the traced memory and
+the number and size of the blocks allocated since the previous generation,
+from a tracemalloc snapshot comparison, and each operator the peak of the
+memory it allocated on top of what was already traced when it was called.
+Tracing memory slows the GA down considerably; the timings of such a run
+are not representative.
+"""
+
+import csv
+import functools
+import json
+import time
+import tracemalloc
+
+def start(path, memory=False):
+    ''' Trace writing to path, or None when path is None (tracing off) '''
+    return None if path is None else Trace(path, memory)
+
+class Trace:
+
+    def __init__(self, path, memory=False):
+        self.path = path
+        self.memory = memory
+        self.f = open(path, 'w', newline='')
+        self.writer = None
+        self.seconds = {}  # operator: seconds in the current generation
+        self.totals = {}   # operator: seconds over the run
+        self.peaks = {}    # operator: peak bytes allocated in the current generation
+        self.num_gen = 0
+        if memory:
+            tracemalloc.start()
+            self.snapshot = tracemalloc.take_snapshot()
+        self.start = self.last = time.perf_counter()
+
+    def wrap(self, name, func):
+        ''' func timed as operator name '''
+        self.seconds.setdefault(name, 0.0)
+        self.totals.setdefault(name, 0.0)
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if self.memory:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            begin = time.perf_counter()
+            out = func(*args, **kwargs)
+            self.seconds[name] += time.perf_counter() - begin
+            if self.memory:
+                self.peaks[name] = max(self.peaks.get(name, 0), tracemalloc.get_traced_memory()[1] - base)
+            return out
+        return timed
+
+    def instrument(self, namespace, names):
+        ''' Replace the functions names of namespace (globals() of a script, or
+            vars() of a module) with timing wrappers '''
+        for name in names:
+            namespace[name] = self.wrap(name, namespace[name])
+
+    def generation(self, gen, **fields):
+        ''' Write the record of generation gen, with extra fields such as the best fitness '''
+        now = time.perf_counter()
+        self.num_gen += 1
+        record = {'gen': gen, 'seconds': now - self.last,
+                  'gens_per_sec': self.num_gen/(now - self.start)}
+        for name, seconds in self.seconds.items():
+            record[name] = seconds
+            self.totals[name] += seconds
+            self.seconds[name] = 0.0
+        if self.memory:
+            for name in self.seconds:
+                record[f'{name}_peak'] = self.peaks.get(name, 0)
+            self.peaks = {}
+            snapshot = tracemalloc.take_snapshot()
+            diff = snapshot.compare_to(self.snapshot, 'filename')
+            record['alloc_blocks'] = sum(d.count_diff for d in diff if d.count_diff > 0)
+            record['alloc_bytes'] = sum(d.size_diff for d in diff if d.size_diff > 0)
+            record['mem_current'] = tracemalloc.get_traced_memory()[0]
+            self.snapshot = snapshot
+        record.update({k: v.item() if hasattr(v, 'item') else v for k, v in fields.items()})
+        self.write(record)
+        ''' the trace's own work is not counted in the next generation '''
+        self.last = time.perf_counter()
+
+    def write(self, record):
+        if self.path.endswith('.csv'):
+            if self.writer is None:
+                self.writer = csv.DictWriter(self.f, fieldnames=list(record))
+                self.writer.writeheader()
+            self.writer.writerow(record)
+        else:
+            self.f.write(json.dumps(record) + '\n')
+
+    def summary(self):
+        ''' Total seconds and share of the run of every operator, largest first '''
+        elapsed = time.perf_counter() - self.start
+        lines = [f'{self.num_gen} generations in {elapsed:.3f} s ({self.num_gen/elapsed:.2f} generations/s)']
+        for name, seconds in sorted(self.totals.items(), key=lambda item: -item[1]):
+            lines.append(f'{name:>16} {seconds:10.3f} s {100*seconds/elapsed:6.1f} %')
+        return '\n'.join(lines)
+
+    def close(self):
+        ''' Close the trace file; returns summary() '''
+        text = self.summary()
+        self.f.close()
+        if self.memory:
+            tracemalloc.stop()
+        return text
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 14:50:09 2026
+
+@author: jrbrad
+
+Vectorized versions of checkCapacity() and checkAllPoints() from the amazon
+harness.  The cart contents are flattened once into NumPy arrays of item
+positions (a lookup table when the item ids are dense integers) and cart
+numbers; cart loads come from np.bincount and duplicate and missing items
+from the counts of each item, so validation is O(n) array work instead of
+a Python loop per item.  Both functions return the
+same values and print the same messages as the original loops.
+"""
+
+from itertools import chain
+import numpy as np
+
+def _int_array(values):
+    ''' values as an int64 array, or None unless every element is an int '''
+    if len(values) == 0 or not set(map(type, values)) <= {int, np.int64}:
+        return None
+    try:
+        return np.fromiter(values, dtype=np.int64, count=len(values))
+    except OverflowError:
+        return None
+
+def _positions(keys, flat):
+    ''' Position of each element of flat in the list keys (-1 if not a key) '''
+    ids = _int_array(keys)
+    arr = _int_array(flat)
+    if ids is not None and arr is not None:
+        lo, hi = ids.min(), ids.max()
+        if hi - lo < 4*len(ids) + 1024:
+            ''' dense ids: direct lookup table '''
+            table = np.full(hi - lo + 1, -1, dtype=np.int64)
+            table[ids - lo] = np.arange(len(ids))
+            inside = (arr >= lo) & (arr <= hi)
+            pos = np.full(len(arr), -1, dtype=np.int64)
+            pos[inside] = table[arr[inside] - lo]
+            return pos
+        order = np.argsort(ids, kind='stable')
+        sorted_ids = ids[order]
+        idx = np.clip(np.searchsorted(sorted_ids, arr), 0, len(ids) - 1)
+        return np.where(sorted_ids[idx] == arr, order[idx], -1)
+    ''' keys or cart contents that are not all integers '''
+    index = {k:i for i,k in enumerate(keys)}
+    return np.array([index.get(x, -1) for x in flat], dtype=np.int64)
+
+def checkCapacity(items, cart_contents, cart_cap):
+    """ articles: a dictionary of the items to be loaded into carts: the key is the item id and the value is the item volume """
+    """ cart_contents is output expected expected in teh form of a list of lists, where each sub-list is the contents of each cart denoted by item ids  """
+    """ cart_cap: capacity of each cart """
+    """ This function returns two parameters, the first of which is the number of bins that are within capacity and, the second, the number of overloaded bins """
+
+    if not isinstance(items,dict):
+        print("Internal error in function checkCapacity(), items argument must be a dictionary")
+        return 'dict_needed', 'dict_needed'
+    if not isinstance(cart_contents,list):
+        print("Data type error: cart_contents must be a list of lists")
+        return 'list_needed', 'list_needed'
+
+    ''' Carts are checked in order, so only carts before the first non-list cart count '''
+    num_list = 0
+    for this_cart in cart_contents:
+        if not isinstance(this_cart,list):
+            break
+        num_list += 1
+    carts = cart_contents[:num_list]
+
+    cart_len = np.fromiter((len(this_cart) for this_cart in carts), dtype=np.int64, count=num_list)
+    pos = _positions(list(items.keys()), list(chain.from_iterable(carts)))
+    if np.any(pos < 0):
+        print("function checkCapacity(), bad item key")
+        return 'bad_key', 'bad_key'
+    if num_list < len(cart_contents):
+        print("Data type error: contents of each cart must be in a sub-list")
+        return 'sublist_error','sublist_error'
+
+    vol = np.fromiter(items.values(), dtype=np.float64, count=len(items))
+    cart_idx = np.repeat(np.arange(num_list), cart_len)
+    load = np.bincount(cart_idx, weights=vol[pos], minlength=num_list)
+    num_ok = int((load <= cart_cap).sum())
+    return num_ok, num_list - num_ok
+
+def checkAllPoints(items, bin_contents):
+    """ Check to be sure that all items are packed in exactly one bin """
+
+    err_mess = ""
+    keys = list(items.keys())
+    flat = list(chain.from_iterable(bin_contents))
+    pos = _positions(keys, flat)
+    count = np.bincount(pos[pos >= 0], minlength=len(keys))
+
+    ''' Elements that are not item keys also count when assigned more than once '''
+    err_mult = bool(count.size > 0 and count.max() > 1)
+    if not err_mult and np.any(pos < 0):
+        other = [flat[i] for i in np.flatnonzero(pos < 0)]
+        err_mult = len(set(other)) < len(other)
+    if err_mult:
+        err_mess += "At least one item is assigned multiple times.  "
+
+    err_all = bool(np.any(count == 0))
+    if err_all:
+        err_mess += "Some items not assigned to carts.  "
+
+    return err_mult, err_all, err_mess
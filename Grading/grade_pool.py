@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 09:18:33 2026
+
+@author: jrbrad
+
+Parallel grading engine.  Every (submission, problem) pair is a job that
+runs in its own process from sandbox.iter_batch(), at most processes at a
+time; the processes are forked, so the problems reach them without being
+pickled.  Responses are checked in the parent as they stream back, and the
+messages are returned keyed by job so that callers can print them in
+problem order.
+
+A job that runs longer than timeout seconds is killed and reported with
+status 'timeout', or 'memory' when it runs out of its mem_mb megabytes; the
+limits are the same whatever the number of processes, and a long call into
+C code is stopped as surely as a Python loop.  A submission that ends its
+process (os._exit(), a segfault) is reported with status 'crash' for that
+problem alone.  Only processes=1 without limits grades in this process.
+"""
+
+import importlib.util
+import os
+import time
+import sandbox
+
+''' State of in-process grading set by _init_worker() '''
+_problem_data = {}
+_submissions = {}
+_algo_name = None
+
+def load_algo(path, algo_name):
+    ''' Import a submission file and return its algo_name function '''
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, algo_name)
+
+def _init_worker(problem_data, submissions, algo_name):
+    global _problem_data, _submissions, _algo_name
+    _problem_data = problem_data
+    _submissions = dict(submissions)
+    _algo_name = algo_name
+
+def _run_job(job):
+    ''' Run one submission on one problem; returns (job, status, result, seconds) '''
+    name, problem_id = job
+    cap, items = _problem_data[problem_id]
+    start = time.time()
+    try:
+        algo = _submissions[name]
+        if isinstance(algo, str):
+            algo = _submissions[name] = load_algo(algo, _algo_name)
+        result = algo(items.copy(), cap)
+    except MemoryError:
+        return job, 'memory', None, time.time() - start
+    except Exception as e:
+        return job, 'error', f'{type(e).__name__}: {e}', time.time() - start
+    return job, 'ok', result, time.time() - start
+
+def _solve(algo, algo_name, items, cap):
+    ''' Body of a sandboxed job: algo is a function or the path of a submission '''
+    if isinstance(algo, str):
+        algo = load_algo(algo, algo_name)
+    return algo(items, cap)
+
+def _run_sandboxed(jobs, submissions, problem_data, algo_name, processes, timeout, mem_mb):
+    ''' Every job in its own process (sandbox.iter_batch()); yields
+        (job, status, result, seconds) as the jobs finish '''
+    ''' the job's process has its own copy of items, so no copy is made here '''
+    args = [(submissions[name], algo_name, problem_data[problem_id][1], problem_data[problem_id][0])
+            for name, problem_id in jobs]
+    for i, status, result, seconds in sandbox.iter_batch(_solve, args, processes, timeout, mem_mb):
+        yield jobs[i], status, result, seconds
+
+def grade(submissions, problem_data, check, algo_name, processes=None, timeout=None, mem_mb=None):
+    ''' submissions: dictionary {name: function, or path of a .py file defining algo_name}
+        problem_data: dictionary {problem_id: (cap, items)}
+        check: check(problem_id, cap, items, result) returns the message for a
+               returned result (the tuple returned by the algorithm)
+        processes: jobs run at a time, each in its own process (None for
+                   os.cpu_count(); 1 without limits grades in this process)
+        timeout, mem_mb: limits per job in seconds and megabytes (None for no limit)
+        returns a dictionary {(name, problem_id): (status, message, seconds)} '''
+    jobs = [(name, problem_id) for name in submissions for problem_id in problem_data]
+    if processes == 1 and timeout is None and mem_mb is None:
+        _init_worker(problem_data, submissions, algo_name)
+        results = map(_run_job, jobs)
+    else:
+        results = _run_sandboxed(jobs, submissions, problem_data, algo_name, processes, timeout, mem_mb)
+
+    graded = {}
+    for job, status, result, seconds in results:
+        problem_id = job[1]
+        if status == 'ok':
+            cap, items = problem_data[problem_id]
+            message = check(problem_id, cap, items, result)
+        else:
+            message = f'Problem {problem_id}: {algo_name}() {sandbox.describe(status, result, timeout, mem_mb)}'
+        graded[job] = (status, message, seconds)
+    return graded
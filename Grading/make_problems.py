@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:05:52 2026
+
+@author: jrbrad
+
+Generate synthetic problem instances in the SQLite stand-in database
+(problem_sqlite.py) so that the harnesses can be run and timed without the
+course MySQL server.  Examples:
+
+    python make_problems.py amazon --problems 5 --items 1000 100000
+    python make_problems.py cell_tower --problems 3 --items 1000000 --seed 1
+    python make_problems.py knapsack --problems 10 --items 30
+
+Then set db_backend = 'sqlite' in amazonDev.py, cellDev.py or the
+knapsack scripts.
+"""
+
+import argparse
+import time
+import numpy as np
+import problem_sqlite
+
+''' kind: (default database name, number of item data columns) '''
+kinds = {'amazon': ('amazon', 1),
+         'cell_tower': ('cell_tower', 2),
+         'knapsack': ('knapsack_mp', 2)}
+
+def make_amazon(rng, num_items):
+    ''' Item volumes for carts of capacity 100 '''
+    cart_cap = 100
+    vol = rng.integers(1, cart_cap//2 + 1, size=num_items)
+    return cart_cap, [vol]
+
+def make_cell_tower(rng, num_items):
+    ''' Tower (cost, calls) with a budget of about 10% of the total cost '''
+    cost = rng.integers(10, 101, size=num_items) * 1000
+    calls = (cost/1000 * rng.uniform(0.5, 1.5, size=num_items) * 50).astype(np.int64)
+    budget = int(0.1 * cost.sum())
+    return budget, [cost, calls]
+
+def make_knapsack(rng, num_items):
+    ''' Item (volume, value) with a capacity of about 25% of the total volume '''
+    vol = rng.integers(1, 101, size=num_items)
+    value = rng.integers(1, 101, size=num_items)
+    knap_cap = int(0.25 * vol.sum())
+    return knap_cap, [vol, value]
+
+generators = {'amazon': make_amazon, 'cell_tower': make_cell_tower, 'knapsack': make_knapsack}
+
+def make_problems(kind, num_problems, sizes, db=None, seed=None):
+    ''' Create the database for kind with num_problems problems whose item
+        counts cycle through sizes '''
+    db_name, num_values = kinds[kind]
+    db = db_name if db is None else db
+    rng = np.random.default_rng(seed)
+    cnx = problem_sqlite.create_db(db, num_values)
+    for problem_id in range(1, num_problems + 1):
+        num_items = sizes[(problem_id - 1) % len(sizes)]
+        cap, cols = generators[kind](rng, num_items)
+        item_ids = np.arange(1, num_items + 1)
+        rows = zip(item_ids.tolist(), *[col.tolist() for col in cols])
+        problem_sqlite.add_problem(cnx, problem_id, cap, rows)
+    cnx.close()
+    return problem_sqlite.db_file(db)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Create synthetic problems in the SQLite stand-in database')
+    parser.add_argument('kind', choices=sorted(kinds.keys()))
+    parser.add_argument('--problems', type=int, default=5, help='number of problems')
+    parser.add_argument('--items', type=int, nargs='+', default=[1000], help='item counts, cycled over the problems')
+    parser.add_argument('--db', default=None, help='database name (defaults to the course database name)')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.time()
+    fname = make_problems(args.kind, args.problems, args.items, args.db, args.seed)
+    print(f'Wrote {args.problems} {args.kind} problems to {fname} in {time.time() - start:.2f} seconds')
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:27:05 2026
+
+@author: jrbrad
+
+Local on-disk cache of problem instances for the grading harnesses.  Each
+problem is saved as a compressed .npz file of NumPy arrays (item ids and
+one array per data column) named by problem id and a hash of its content,
+so a re-run reads the problems from disk instead of the MySQL server.
+
+Command line use:
+    python problem_cache.py list                     # cached databases
+    python problem_cache.py list amazon              # cached problems
+    python problem_cache.py clear amazon             # invalidate a database
+    python problem_cache.py clear amazon 3 7         # invalidate problems
+"""
+
+import glob
+import hashlib
+import os
+import sys
+import numpy as np
+
+cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'problem_cache')
+
+def _db_dir(db):
+    return os.path.join(cache_dir, db)
+
+def _column(values):
+    ''' Convert one column of a result set to a NumPy array; MySQL DECIMAL
+        values arrive as Decimal objects and are stored as float64 '''
+    arr = np.asarray(values)
+    if arr.dtype == object:
+        arr = arr.astype(np.float64)
+    return arr
+
+def content_hash(cap, arrays):
+    h = hashlib.sha1(repr(cap).encode())
+    for arr in arrays:
+        h.update(arr.dtype.str.encode())
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()[:16]
+
+def load_problem_ids(db):
+    fname = os.path.join(_db_dir(db), 'problem_ids.npy')
+    if os.path.exists(fname):
+        return np.load(fname).tolist()
+    return None
+
+def save_problem_ids(db, problem_ids):
+    os.makedirs(_db_dir(db), exist_ok=True)
+    np.save(os.path.join(_db_dir(db), 'problem_ids.npy'), np.asarray(problem_ids))
+
+def load_problem(db, problem_id):
+    ''' Return (cap, rows) for a cached problem, or None if it is not cached or
+        its content no longer matches the hash in its file name '''
+    for fname in glob.glob(os.path.join(_db_dir(db), f'p{problem_id}_*.npz')):
+        stored_hash = os.path.basename(fname)[:-4].split('_')[-1]
+        with np.load(fname) as data:
+            cap = data['cap'].item()
+            cols = [data[f'col{j}'] for j in range(len(data.files) - 1)]
+        if content_hash(cap, cols) == stored_hash:
+            return cap, list(zip(*[col.tolist() for col in cols]))
+        os.remove(fname)
+    return None
+
+def save_problem(db, problem_id, cap, rows):
+    os.makedirs(_db_dir(db), exist_ok=True)
+    if not isinstance(cap, (int, float)):
+        cap = float(cap)
+    cols = [_column(col) for col in zip(*rows)] if len(rows) > 0 else [np.zeros(0)]
+    clear(db, [problem_id])
+    fname = os.path.join(_db_dir(db), f'p{problem_id}_{content_hash(cap, cols)}.npz')
+    np.savez_compressed(fname, cap=np.asarray(cap), **{f'col{j}':col for j, col in enumerate(cols)})
+
+def clear(db, problem_ids=None):
+    ''' Invalidate the cache for a database, or for some of its problems '''
+    if problem_ids is None:
+        fnames = glob.glob(os.path.join(_db_dir(db), '*.np[yz]'))
+    else:
+        fnames = []
+        for problem_id in problem_ids:
+            fnames += glob.glob(os.path.join(_db_dir(db), f'p{problem_id}_*.npz'))
+    for fname in fnames:
+        os.remove(fname)
+    return len(fnames)
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 2 and sys.argv[1] == 'list':
+        if len(sys.argv) == 2:
+            for db in sorted(os.listdir(cache_dir)) if os.path.isdir(cache_dir) else []:
+                print(db)
+        else:
+            for fname in sorted(glob.glob(os.path.join(_db_dir(sys.argv[2]), '*.np[yz]'))):
+                print(os.path.basename(fname))
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'clear':
+        problem_ids = [int(x) for x in sys.argv[3:]] if len(sys.argv) > 3 else None
+        print(f'Removed {clear(sys.argv[2], problem_ids)} cached file(s) for {sys.argv[2]}')
+    else:
+        print(__doc__)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 09:12:40 2026
+
+@author: jrbrad
+
+Shared problem loader for the MySQL grading harnesses (amazon, cell_tower
+and knapsack).  Connections come from a pool that is created once per
+database, and the capacity and item data for many problems are requested
+in a single multi-statement round trip instead of two fresh connections
+per problem.  load_problem_ids() and load_problems() put the local
+problem_cache in front of the database and only connect on a cache miss.
+Passing backend='sqlite' to db_connect() uses the offline stand-in in
+problem_sqlite.py instead of MySQL.
+"""
+
+import sqlite3
+import problem_cache
+import problem_sqlite
+try:
+    from mysql.connector import pooling
+except ImportError:    # only the SQLite backend is available
+    pooling = None
+
+''' Loader settings '''
+pool_size = 4    # connections kept open per database
+batch_size = 50  # problems requested per round trip
+
+_pools = {}
+
+def db_connect(user, passwd, host, db, backend='mysql'):
+    ''' Return a pooled connection; calling .close() hands it back to the pool
+        backend: 'mysql' or 'sqlite' (user, passwd and host are then ignored) '''
+    if backend == 'sqlite':
+        return problem_sqlite.db_connect(db)
+    elif backend != 'mysql':
+        raise ValueError(f'Unknown database backend: {backend}')
+    if pooling is None:
+        raise ImportError('mysql-connector-python is required for the mysql backend')
+    key = (user, host, db)
+    if key not in _pools:
+        _pools[key] = pooling.MySQLConnectionPool(pool_name=f'{db}_{len(_pools)}',
+                                                  pool_size=pool_size,
+                                                  user=user, passwd=passwd,
+                                                  host=host, db=db)
+    return _pools[key].get_connection()
+
+def _call_many(cnx, calls):
+    ''' Execute several CALL statements in one round trip
+        calls: list of (procedure name, problem id)
+        returns a list with the rows of every result set, in statement order '''
+    if isinstance(cnx, sqlite3.Connection):
+        return [problem_sqlite.callproc(cnx, proc, [arg]) for proc, arg in calls]
+    sql = ' '.join([f'CALL {proc}({int(arg)});' for proc, arg in calls])
+    cursor = cnx.cursor()
+    row_sets = []
+    try:
+        results = cursor.execute(sql, multi=True)
+    except TypeError:
+        ''' mysql-connector 9.2+ dropped multi=True: fall back to one call
+            per statement, still on the same pooled connection '''
+        for proc, arg in calls:
+            cursor.callproc(proc, args=[arg])
+            for result in cursor.stored_results():
+                row_sets.append(result.fetchall())
+                break
+    else:
+        for result in results:
+            if result.with_rows:
+                row_sets.append(result.fetchall())
+    cursor.close()
+    return row_sets
+
+def get_problem_ids(cnx, proc):
+    ''' Problem ids from spGetProblemIds/spGetProblems '''
+    if isinstance(cnx, sqlite3.Connection):
+        return [row[0] for row in problem_sqlite.callproc(cnx, proc)]
+    cursor = cnx.cursor()
+    cursor.callproc(proc)
+    problem_ids = []
+    for result in cursor.stored_results():
+        problem_ids = [row[0] for row in result.fetchall()]
+        break
+    cursor.close()
+    return problem_ids
+
+def get_problems(cnx, problem_ids, cap_proc, data_proc):
+    ''' Capacity (budget) and item rows for every problem in problem_ids
+        cap_proc: spGetCartCap, spGetBudget or spGetKnapsackCap
+        data_proc: spGetData or spGetKnapsackData
+        returns a dictionary {problem_id: (cap, rows)} '''
+    problems = {}
+    for beg in range(0, len(problem_ids), batch_size):
+        batch = problem_ids[beg:beg+batch_size]
+        calls = []
+        for problem_id in batch:
+            calls.append((cap_proc, problem_id))
+            calls.append((data_proc, problem_id))
+        row_sets = _call_many(cnx, calls)
+        if len(row_sets) != 2*len(batch):
+            raise RuntimeError(f'Expected {2*len(batch)} result sets from {cap_proc}/{data_proc}, received {len(row_sets)}')
+        for i, problem_id in enumerate(batch):
+            problems[problem_id] = (row_sets[2*i][0][0], row_sets[2*i+1])
+    return problems
+
+def load_problem_ids(connect, proc, cache=None, refresh=False):
+    ''' Problem ids from the cache named cache (usually the database name) or,
+        if not cached or refresh is True, from the database via connect() '''
+    problem_ids = None
+    if cache is not None and not refresh:
+        problem_ids = problem_cache.load_problem_ids(cache)
+    if problem_ids is None:
+        cnx = connect()
+        problem_ids = get_problem_ids(cnx, proc)
+        cnx.close()
+        if cache is not None:
+            problem_cache.save_problem_ids(cache, problem_ids)
+    return problem_ids
+
+def load_problems(connect, problem_ids, cap_proc, data_proc, cache=None, refresh=False):
+    ''' Same as get_problems() but problems found in the cache are read from
+        disk and the database is only queried for the missing ones '''
+    problems = {}
+    if cache is not None and not refresh:
+        for problem_id in problem_ids:
+            problem = problem_cache.load_problem(cache, problem_id)
+            if problem is not None:
+                problems[problem_id] = problem
+    missing = [problem_id for problem_id in problem_ids if problem_id not in problems]
+    if len(missing) > 0:
+        cnx = connect()
+        fetched = get_problems(cnx, missing, cap_proc, data_proc)
+        cnx.close()
+        if cache is not None:
+            for problem_id, (cap, rows) in fetched.items():
+                problem_cache.save_problem(cache, problem_id, cap, rows)
+                ''' read back so cached and fresh problems have the same types '''
+                fetched[problem_id] = problem_cache.load_problem(cache, problem_id)
+        problems.update(fetched)
+    return {problem_id: problems[problem_id] for problem_id in problem_ids}
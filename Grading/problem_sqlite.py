@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 08:41:16 2026
+
+@author: jrbrad
+
+Offline SQLite stand-in for the course MySQL databases.  Each database is a
+single file, sqlite/<db>.sqlite, with the tables
+
+    problems(problem_id, cap)
+    items(problem_id, item_id, v1, v2)
+    settings(name, value)
+
+and the stored procedures used by the harnesses are mirrored by the SELECT
+statements in procedures.  v2 is only returned when the database was
+created with two data columns (cell_tower and knapsack; amazon items only
+have a volume).  make_problems.py fills these files with synthetic problems.
+"""
+
+import os
+import sqlite3
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sqlite')
+
+procedures = {'spGetProblemIds':   'SELECT problem_id FROM problems ORDER BY problem_id',
+              'spGetProblems':     'SELECT problem_id FROM problems ORDER BY problem_id',
+              'spGetCartCap':      'SELECT cap FROM problems WHERE problem_id = ?',
+              'spGetBudget':       'SELECT cap FROM problems WHERE problem_id = ?',
+              'spGetKnapsackCap':  'SELECT cap FROM problems WHERE problem_id = ?',
+              'spGetData':         'SELECT item_id, v1{v2} FROM items WHERE problem_id = ? ORDER BY item_id',
+              'spGetKnapsackData': 'SELECT item_id, v1{v2} FROM items WHERE problem_id = ? ORDER BY item_id'}
+
+def db_file(db):
+    return os.path.join(data_dir, f'{db}.sqlite')
+
+def db_connect(db):
+    if not os.path.exists(db_file(db)):
+        raise FileNotFoundError(f'No SQLite database for {db}; create one with make_problems.py')
+    return sqlite3.connect(db_file(db))
+
+def callproc(cnx, proc, args=()):
+    ''' Rows returned by the stored procedure proc '''
+    if proc not in procedures:
+        raise ValueError(f'Procedure {proc} is not available in the SQLite backend')
+    num_values = int(cnx.execute("SELECT value FROM settings WHERE name = 'num_values'").fetchone()[0])
+    sql = procedures[proc].format(v2=', v2' if num_values == 2 else '')
+    return cnx.execute(sql, tuple(args)).fetchall()
+
+def create_db(db, num_values):
+    ''' Create an empty database file, replacing any existing one '''
+    os.makedirs(data_dir, exist_ok=True)
+    if os.path.exists(db_file(db)):
+        os.remove(db_file(db))
+    cnx = sqlite3.connect(db_file(db))
+    cnx.execute('CREATE TABLE problems (problem_id INTEGER PRIMARY KEY, cap NUMERIC)')
+    cnx.execute('CREATE TABLE items (problem_id INTEGER, item_id INTEGER, v1 NUMERIC, v2 NUMERIC)')
+    cnx.execute('CREATE INDEX idx_items ON items (problem_id, item_id)')
+    cnx.execute('CREATE TABLE settings (name TEXT PRIMARY KEY, value TEXT)')
+    cnx.execute("INSERT INTO settings VALUES ('num_values', ?)", (str(num_values),))
+    cnx.commit()
+    return cnx
+
+def add_problem(cnx, problem_id, cap, rows):
+    ''' rows: (item_id, v1) or (item_id, v1, v2) tuples '''
+    cnx.execute('INSERT INTO problems VALUES (?, ?)', (problem_id, cap))
+    cnx.executemany('INSERT INTO items VALUES (?, ?, ?, ?)',
+                    ((problem_id, row[0], row[1], row[2] if len(row) > 2 else None) for row in rows))
+    cnx.commit()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 08:36:10 2026
+
+@author: jrbrad
+
+Run student heuristics in a separate worker process with a wall-clock time
+limit and a memory limit, so that a runaway submission is killed and
+recorded instead of hanging the whole grading run.  Every call returns
+(status, result, seconds) where status is one of
+
+    'ok'       result is the value returned by the function
+    'timeout'  the call ran past the time limit and the worker was killed
+    'memory'   the call ran out of memory under the memory limit
+    'error'    the call raised an exception (result is its description)
+    'crash'    the worker process ended without returning, e.g. os._exit()
+               or a segfault (result gives its exit code)
+
+The memory limit uses resource.setrlimit(RLIMIT_AS) and is ignored where
+the resource module is unavailable (Windows).
+"""
+
+import multiprocessing as mp
+from multiprocessing.connection import wait
+import time
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def limit_memory(mem_mb):
+    ''' Cap the address space of the current process at mem_mb megabytes '''
+    if mem_mb is not None and resource is not None:
+        limit = int(mem_mb * 1024**2)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _child(conn, func, args, mem_mb):
+    try:
+        limit_memory(mem_mb)
+        result = ('ok', func(*args))
+    except MemoryError:
+        result = ('memory', None)
+    except BaseException as e:
+        result = ('error', f'{type(e).__name__}: {e}')
+    try:
+        conn.send(result)
+    except Exception as e:
+        conn.send(('error', f'result could not be returned: {type(e).__name__}: {e}'))
+    conn.close()
+
+def describe(status, result, timeout=None, mem_mb=None):
+    ''' Text for a status other than 'ok', for use in grading messages '''
+    if status == 'timeout':
+        return f'exceeded the time limit of {timeout} seconds'
+    elif status == 'memory':
+        return f'exceeded the memory limit of {mem_mb} MB'
+    elif status == 'crash':
+        return f'ended its process without returning ({result})'
+    else:
+        return f'raised {result}'
+
+class _Job:
+    def __init__(self, func, args, timeout, mem_mb):
+        self.conn, child_conn = mp.Pipe(duplex=False)
+        self.proc = mp.Process(target=_child, args=(child_conn, func, args, mem_mb), daemon=True)
+        self.proc.start()
+        child_conn.close()
+        self.start = time.time()
+        self.deadline = None if timeout is None else self.start + timeout
+
+    def collect(self):
+        ''' Result of a finished job (the pipe is readable or closed) '''
+        try:
+            status, result = self.conn.recv()
+        except EOFError:
+            self.proc.join()
+            ''' a SIGKILL from the kernel OOM killer counts as running out of memory '''
+            status = 'memory' if self.proc.exitcode == -9 else 'crash'
+            result = f'exit code {self.proc.exitcode}'
+        self.proc.join()
+        self.conn.close()
+        return status, result, time.time() - self.start
+
+    def kill(self):
+        self.proc.kill()
+        self.proc.join()
+        self.conn.close()
+        return 'timeout', None, time.time() - self.start
+
+def run_limited(func, args, timeout=None, mem_mb=None):
+    ''' Call func(*args) in a new process; returns (status, result, seconds) '''
+    job = _Job(func, args, timeout, mem_mb)
+    if job.conn.poll(timeout):
+        return job.collect()
+    return job.kill()
+
+def iter_batch(func, arg_list, processes=None, timeout=None, mem_mb=None):
+    ''' Call func(*args) for every args in arg_list, at most processes at a
+        time, each in its own process with its own limits
+        yields (i, status, result, seconds) for arg_list[i] as the calls finish '''
+    processes = mp.cpu_count() if processes is None else processes
+    pending = list(enumerate(arg_list))[::-1]
+    running = {}
+    while pending or running:
+        while pending and len(running) < processes:
+            i, args = pending.pop()
+            running[i] = _Job(func, args, timeout, mem_mb)
+        deadlines = [job.deadline for job in running.values() if job.deadline is not None]
+        wait_time = max(0.0, min(deadlines) - time.time()) if deadlines else None
+        ready = wait([job.conn for job in running.values()], wait_time)
+        for i, job in list(running.items()):
+            if job.conn in ready:
+                del running[i]
+                yield (i, *job.collect())
+            elif job.deadline is not None and time.time() >= job.deadline:
+                del running[i]
+                yield (i, *job.kill())
+
+def run_batch(func, arg_list, processes=None, timeout=None, mem_mb=None):
+    ''' iter_batch() collected into a list of (status, result, seconds) in the order of arg_list '''
+    results = [None] * len(arg_list)
+    for i, status, result, seconds in iter_batch(func, arg_list, processes, timeout, mem_mb):
+        results[i] = status, result, seconds
+    return results
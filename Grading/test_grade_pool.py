@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Nov  1 10:12:45 2026
+
+@author: jrbrad
+
+grade_pool.grade() with submissions that end their process or run past the
+time limit: each must become a message for its problems, never a hang.
+
+    python -m pytest Grading/test_grade_pool.py
+"""
+
+import grade_pool
+
+submission_code = {
+    'good': "def algo(items, cap):\n    return sorted(items)[:cap]\n",
+    'exits': "import os\ndef algo(items, cap):\n    os._exit(3)\n",
+    'segfault': ("import faulthandler, os, signal\ndef algo(items, cap):\n"
+                 "    faulthandler.disable()\n    os.kill(os.getpid(), signal.SIGSEGV)\n"),
+    'loops': "def algo(items, cap):\n    while True:\n        pass\n",
+}
+problem_data = {problem_id: (2, {k: k for k in range(5)}) for problem_id in range(3)}
+
+def check(problem_id, cap, items, result):
+    return f'Problem {problem_id}: {len(result)} items'
+
+def write_submissions(folder, names):
+    submissions = {}
+    for name in names:
+        path = folder / f'{name}.py'
+        path.write_text(submission_code[name])
+        submissions[name] = str(path)
+    return submissions
+
+def test_submission_that_exits_its_process(tmp_path):
+    submissions = write_submissions(tmp_path, ['good', 'exits', 'segfault'])
+    graded = grade_pool.grade(submissions, problem_data, check, 'algo', processes=2)
+    for problem_id in problem_data:
+        assert graded[('good', problem_id)][:2] == ('ok', f'Problem {problem_id}: 2 items')
+        for name in ['exits', 'segfault']:
+            status, message, seconds = graded[(name, problem_id)]
+            assert status == 'crash'
+            assert message.startswith(f'Problem {problem_id}: algo() ended its process')
+    assert 'exit code 3' in graded[('exits', 0)][1]
+
+def test_time_limit_with_several_processes(tmp_path):
+    submissions = write_submissions(tmp_path, ['good', 'loops', 'exits'])
+    graded = grade_pool.grade(submissions, problem_data, check, 'algo', processes=2, timeout=1, mem_mb=2000)
+    for problem_id in problem_data:
+        assert graded[('good', problem_id)][0] == 'ok'
+        assert graded[('exits', problem_id)][0] == 'crash'
+        status, message, seconds = graded[('loops', problem_id)]
+        assert status == 'timeout' and seconds < 10
+        assert message == f'Problem {problem_id}: algo() exceeded the time limit of 1 seconds'
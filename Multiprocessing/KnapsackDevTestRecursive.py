@@ -3,14 +3,29 @@
 Spyder Editor
 """
 
-import mysql.connector as mySQL
 import datetime
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Grading'))
+import knapsack_exact
+import problem_db
+import sandbox
 
 """ global MySQL settings """
 mysql_user_name = 'Jim'
 mysql_password = 'MySQL'
 mysql_ip = '127.0.0.1'
 mysql_db = 'knapsack_mp'
+db_backend = 'mysql'   # 'sqlite' uses the offline stand-in created by Grading/make_problems.py
+
+""" local problem cache settings (see Grading/problem_cache.py) """
+use_cache = True       # read problems from the local cache when available
+refresh_cache = False  # set to True to re-download problems after the server copy changes
+
+""" load_knapsack() solver: 'recursive' (m(i, capacity) below) or an exact solver from
+    knapsack_exact.py: 'dp', 'memo', 'bb' or 'auto' """
+knapsack_solver = 'recursive'
 
 def checkCapacity(contents,knapsack_cap):
     """ contents is expected as a dictionaryof the form {item_id:(volume,value), ...} """
@@ -51,6 +66,10 @@ def load_knapsack(things,knapsack_cap):
     items_to_pack = []    # use this list for the indices of the items you load into the knapsack
     
 
+    if knapsack_solver != 'recursive':
+        (value, items_to_pack) = knapsack_exact.solve(things, knapsack_cap, knapsack_solver)
+        return my_team_number_or_name, items_to_pack
+    
     # Convert the things dict to a list
     thingsList = [(k, v) for k, v in things.items()]
     
@@ -74,99 +93,80 @@ def load_knapsack(things,knapsack_cap):
     return my_team_number_or_name, items_to_pack       # use this return statement when you have items to load in the knapsack 
 
 def getDBDataList():
-    cnx = db_connect()
-    cursor = cnx.cursor()
-    #cursor.execute(commandString)
-    cursor.callproc('spGetProblemIds')
-    items = []
-    for result in cursor.stored_results(): #list(cursor):
-        for item in result.fetchall():
-            items.append(item[0])
-        break
-    cursor.close()
-    cnx.close()
-    return items
+    return problem_db.load_problem_ids(db_connect, 'spGetProblemIds',
+                                       cache=mysql_db if use_cache and db_backend == 'mysql' else None, refresh=refresh_cache)
+
+def db_get_all_data(problem_ids):
+    """ Capacity and items for all problems, read from the cache or fetched over one pooled connection """
+    problems = problem_db.load_problems(db_connect, problem_ids, 'spGetKnapsackCap', 'spGetKnapsackData',
+                                        cache=mysql_db if use_cache and db_backend == 'mysql' else None, refresh=refresh_cache)
+    return {problem_id: (knap_cap, {row[0]:(row[1],row[2]) for row in rows}) for problem_id, (knap_cap, rows) in problems.items()}
    
 """ db_get_data connects with the database and returns a dictionary with the problem data """
 def db_get_data(problem_id):
-    cnx = db_connect()
-                        
-    cursor = cnx.cursor()
-    cursor.callproc("spGetKnapsackCap", args=[problem_id])
-    for result in cursor.stored_results():
-        knap_cap = result.fetchall()[0][0]
-        break
-    cursor.close()
-    cnx.close()
-    cnx = db_connect()
-    cursor = cnx.cursor()
-    cursor.callproc('spGetKnapsackData',args=[problem_id])
-    items = {}
-    for result in cursor.stored_results():
-        blank = result.fetchall()
-        break
-    for row in blank:
-        items[row[0]] = (row[1],row[2])
-    cursor.close()
-    cnx.close()
-    return knap_cap, items
+    return db_get_all_data([problem_id])[problem_id]
     
 def db_connect():
-    cnx = mySQL.connect(user=mysql_user_name, passwd=mysql_password,
-                        host=mysql_ip, db=mysql_db)
-    return cnx
+    return problem_db.db_connect(mysql_user_name, mysql_password, mysql_ip, mysql_db, db_backend)
     
-""" Error Messages """
-error_bad_list_key = """ 
-A list was received from load_knapsack() for the item numbers to be loaded into the knapsack.  However, that list contained an element that was not a key in the dictionary of the items that were not yet loaded.   This could be either because the element was non-numeric, it was a key that was already loaded into the knapsack, or it was a numeric value that didn't match with any of the dictionary keys. Please check the list that your load_knapsack function is returning. It will be assumed that the knapsack is fully loaded with any items that may have already been loaded and a score computed accordingly. 
-"""
-error_response_not_list = """
-load_knapsack() returned a response for items to be packed that was not a list.  Scoring will be terminated   """
+if __name__ == '__main__':
+    """ Error Messages """
+    error_bad_list_key = """ 
+    A list was received from load_knapsack() for the item numbers to be loaded into the knapsack.  However, that list contained an element that was not a key in the dictionary of the items that were not yet loaded.   This could be either because the element was non-numeric, it was a key that was already loaded into the knapsack, or it was a numeric value that didn't match with any of the dictionary keys. Please check the list that your load_knapsack function is returning. It will be assumed that the knapsack is fully loaded with any items that may have already been loaded and a score computed accordingly. 
+    """
+    error_response_not_list = """
+    load_knapsack() returned a response for items to be packed that was not a list.  Scoring will be terminated   """
 
-""" Get solutions bassed on sbmission """
-problems = getDBDataList() 
-silent_mode = False    # use this variable to turn on/off appropriate messaging depending on student or instructor use
+    """ Get solutions bassed on sbmission """
+    problems = getDBDataList() 
+    problem_data = db_get_all_data(problems)
+    silent_mode = False    # use this variable to turn on/off appropriate messaging depending on student or instructor use
+    time_limit = 60        # seconds allowed for load_knapsack() on each problem (None for no limit)
+    mem_limit = 4096       # megabytes allowed for load_knapsack() on each problem (None for no limit)
 
-startProbsTime = datetime.datetime.now()
-for problem_id in problems:
-    in_knapsack = {}
-    knapsack_cap, items = db_get_data(problem_id)
-    #finished = False
-    errors = False
-    response = None
+    startProbsTime = datetime.datetime.now()
+    for problem_id in problems:
+        in_knapsack = {}
+        knapsack_cap, items = problem_data[problem_id]
+        #finished = False
+        errors = False
+        response = None
     
-    time_start = datetime.datetime.now()
-    team_num, response = load_knapsack(items,knapsack_cap)
-    exec_time = datetime.datetime.now() - time_start
-    if isinstance(response,list):
-        for this_key in response:
-            if this_key in items.keys():
-                in_knapsack[this_key] = items[this_key]
-                del items[this_key]
-            else:
-                errors = True
-                if silent_mode:
-                    status = "bad_list_key"
+        run_status, result, run_time = sandbox.run_limited(load_knapsack, (items,knapsack_cap), time_limit, mem_limit)
+        exec_time = datetime.timedelta(seconds=run_time)
+        if run_status != 'ok':
+            print("Problem " + str(problem_id) + ": load_knapsack() " + sandbox.describe(run_status, result, time_limit, mem_limit))
+            continue
+        team_num, response = result
+        if isinstance(response,list):
+            for this_key in response:
+                if this_key in items.keys():
+                    in_knapsack[this_key] = items[this_key]
+                    del items[this_key]
                 else:
-                    print("P"+str(problem_id)+"bad_key_")
-                #finished = True
-    else:
-        if silent_mode:
-            status = "P"+str(problem_id)+"_not_list_"
+                    errors = True
+                    if silent_mode:
+                        status = "bad_list_key"
+                    else:
+                        print("P"+str(problem_id)+"bad_key_")
+                    #finished = True
         else:
-            print(error_response_not_list)
+            if silent_mode:
+                status = "P"+str(problem_id)+"_not_list_"
+            else:
+                print(error_response_not_list)
                 
-    if errors == False:
-        if silent_mode:
-            status = "P"+str(problem_id)+"knap_load_"
-        else:
-            print("Knapsack Loaded for Problem ", str(problem_id)," ....") 
-        knapsack_ok = checkCapacity(in_knapsack,knapsack_cap)
-        knapsack_result = knapsack_value(in_knapsack)
-        if silent_mode:
-            print(status+"; knapsack within capacity: "+knapsack_ok)
-        else:
-            print("knapcap: ", knapsack_ok)
-            print("knapsack value : ", knapsack_value(in_knapsack), "     exec time:",exec_time)
+        if errors == False:
+            if silent_mode:
+                status = "P"+str(problem_id)+"knap_load_"
+            else:
+                print("Knapsack Loaded for Problem ", str(problem_id)," ....") 
+            knapsack_ok = checkCapacity(in_knapsack,knapsack_cap)
+            knapsack_result = knapsack_value(in_knapsack)
+            if silent_mode:
+                print(status+"; knapsack within capacity: "+knapsack_ok)
+            else:
+                print("knapcap: ", knapsack_ok)
+                print("knapsack value : ", knapsack_value(in_knapsack), "     exec time:",exec_time)
             
-print('\n\nTotal execution time: ', datetime.datetime.now() - startProbsTime)
\ No newline at end of file
+    print('\n\nTotal execution time: ', datetime.datetime.now() - startProbsTime)
\ No newline at end of file
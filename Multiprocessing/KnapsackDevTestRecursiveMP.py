@@ -3,16 +3,30 @@
 Spyder Editor
 """
 
-import mysql.connector as mySQL
 import datetime
-import multiprocessing
+import os
+import sys
 import time
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Grading'))
+import knapsack_exact
+import problem_db
+import sandbox
+
 """ global MySQL settings """
 mysql_user_name = 'Jim'
 mysql_password = 'MySQL'
 mysql_ip = '127.0.0.1'
 mysql_db = 'knapsack_mp'
+db_backend = 'mysql'   # 'sqlite' uses the offline stand-in created by Grading/make_problems.py
+
+""" local problem cache settings (see Grading/problem_cache.py) """
+use_cache = True       # read problems from the local cache when available
+refresh_cache = False  # set to True to re-download problems after the server copy changes
+
+""" load_knapsack() solver: 'recursive' (m(i, capacity) below) or an exact solver from
+    knapsack_exact.py: 'dp', 'memo', 'bb' or 'auto' """
+knapsack_solver = 'recursive'
 
 def checkCapacity(contents,knapsack_cap):
     """ contents is expected as a dictionaryof the form {item_id:(volume,value), ...} """
@@ -53,6 +67,10 @@ def load_knapsack(things,knapsack_cap):
     items_to_pack = []    # use this list for the indices of the items you load into the knapsack
     
 
+    if knapsack_solver != 'recursive':
+        (value, items_to_pack) = knapsack_exact.solve(things, knapsack_cap, knapsack_solver)
+        return my_team_number_or_name, items_to_pack
+    
     # Convert the things dict to a list
     thingsList = [(k, v) for k, v in things.items()]
     
@@ -76,47 +94,21 @@ def load_knapsack(things,knapsack_cap):
     return my_team_number_or_name, items_to_pack       # use this return statement when you have items to load in the knapsack 
 
 def getDBDataList():
-    cnx = db_connect()
-    cursor = cnx.cursor()
-    #cursor.execute(commandString)
-    cursor.callproc('spGetProblemIds')
-    items = []
-    for result in cursor.stored_results(): #list(cursor):
-        for item in result.fetchall():
-            items.append(item[0])
-        break
-    cursor.close()
-    cnx.close()
-    return items
+    return problem_db.load_problem_ids(db_connect, 'spGetProblemIds',
+                                       cache=mysql_db if use_cache and db_backend == 'mysql' else None, refresh=refresh_cache)
+
+def db_get_all_data(problem_ids):
+    """ Capacity and items for all problems, read from the cache or fetched over one pooled connection """
+    problems = problem_db.load_problems(db_connect, problem_ids, 'spGetKnapsackCap', 'spGetKnapsackData',
+                                        cache=mysql_db if use_cache and db_backend == 'mysql' else None, refresh=refresh_cache)
+    return {problem_id: (knap_cap, {row[0]:(row[1],row[2]) for row in rows}) for problem_id, (knap_cap, rows) in problems.items()}
    
 """ db_get_data connects with the database and returns a dictionary with the problem data """
 def db_get_data(problem_id):
-    cnx = db_connect()
-                        
-    cursor = cnx.cursor()
-    cursor.callproc("spGetKnapsackCap", args=[problem_id])
-    for result in cursor.stored_results():
-        knap_cap = result.fetchall()[0][0]
-        break
-    cursor.close()
-    cnx.close()
-    cnx = db_connect()
-    cursor = cnx.cursor()
-    cursor.callproc('spGetKnapsackData',args=[problem_id])
-    items = {}
-    for result in cursor.stored_results():
-        blank = result.fetchall()
-        break
-    for row in blank:
-        items[row[0]] = (row[1],row[2])
-    cursor.close()
-    cnx.close()
-    return knap_cap, items
+    return db_get_all_data([problem_id])[problem_id]
     
 def db_connect():
-    cnx = mySQL.connect(user=mysql_user_name, passwd=mysql_password,
-                        host=mysql_ip, db=mysql_db)
-    return cnx
+    return problem_db.db_connect(mysql_user_name, mysql_password, mysql_ip, mysql_db, db_backend)
     
 if __name__ == '__main__':
     """ Error Messages """
@@ -132,27 +124,32 @@ if __name__ == '__main__':
     
     
     """ Prepare data for the multiple problems """
+    problem_data = db_get_all_data(problems)
     knapData = []
     for problem_id in problems:
-        knapsack_cap, items = db_get_data(problem_id)
+        knapsack_cap, items = problem_data[problem_id]
         knapData.append((items, knapsack_cap))
         
-    """ Assign problems to pool workers """
+    """ Assign problems to sandboxed worker processes """
+    time_limit = 60     # seconds allowed for load_knapsack() on each problem (None for no limit)
+    mem_limit = 4096    # megabytes allowed for load_knapsack() on each problem (None for no limit)
     startProbsTime = datetime.datetime.now()
-    with multiprocessing.Pool(processes=5) as pool:
-        results = pool.starmap(load_knapsack, knapData)
-        pool.close()
-        pool.join()
+    results = sandbox.run_batch(load_knapsack, knapData, processes=5, timeout=time_limit, mem_mb=mem_limit)
     print('\n\nTotal execution time: ', datetime.datetime.now() - startProbsTime)
     
     for i in range(len(results)):
         #result in results:
         errors = False
         in_knapsack = {}
+        problem_id = problems[i]
+        items, knapsack_cap = knapData[i]
+        run_status, response, run_time = results[i]
+        if run_status != 'ok':
+            print("Problem " + str(problem_id) + ": load_knapsack() " + sandbox.describe(run_status, response, time_limit, mem_limit))
+            continue
         
-        if isinstance(results[i][1],list):
-            items = knapData[i][0]
-            for this_key in results[i][1]:
+        if isinstance(response[1],list):
+            for this_key in response[1]:
                 if this_key in items.keys():
                     in_knapsack[this_key] = items[this_key]
                     del items[this_key]
@@ -177,7 +174,7 @@ if __name__ == '__main__':
             knapsack_result = knapsack_value(in_knapsack)
             if silent_mode:
                 print(status+"; knapsack within capacity: "+str(knapsack_ok)+'    Value: '+str(knapsack_result))
-                print(results[i])
+                print(response)
             else:
                 print("knapcap: ", knapsack_ok)
             
\ No newline at end of file
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 13:40:18 2026
+
+@author: jrbrad
+
+Compare the recursive m(i, capacity) in load_knapsack() with the exact
+solvers in knapsack_exact.py on random problems of increasing size.  The
+recursion and the memoized solver are only run on sizes where they finish
+in reasonable time.
+"""
+
+import time
+import numpy as np
+import knapsack_exact
+import KnapsackDevTestRecursive as harness
+
+def random_things(rng, n):
+    vol = rng.integers(1, 101, size=n)
+    val = rng.integers(1, 101, size=n)
+    return {i+1:(int(vol[i]), int(val[i])) for i in range(n)}, int(0.25*vol.sum())
+
+def run_recursive(things, knapsack_cap):
+    harness.knapsack_solver = 'recursive'
+    items = harness.load_knapsack(things, knapsack_cap)[1]
+    return sum(things[k][1] for k in items), items
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    sizes = [10, 14, 100, 1000, 10000]
+    max_n = {'recursive': 14, 'memo': 100}
+    solvers = {'recursive': run_recursive,
+               'memo': lambda things, cap: knapsack_exact.solve(things, cap, 'memo'),
+               'dp': lambda things, cap: knapsack_exact.solve(things, cap, 'dp'),
+               'bb': lambda things, cap: knapsack_exact.solve(things, cap, 'bb')}
+
+    print(f'{"n":>6} {"capacity":>9} ' + ' '.join([f'{name:>12}' for name in solvers]))
+    for n in sizes:
+        things, knapsack_cap = random_things(rng, n)
+        times, values = [], []
+        for name, solver in solvers.items():
+            if n > max_n.get(name, n):
+                times.append('-')
+                continue
+            start = time.time()
+            value, items = solver(things, knapsack_cap)
+            times.append(f'{time.time() - start:.4f}')
+            values.append(value)
+        assert max(values) - min(values) < 1e-6, f'solvers disagree for n={n}: {values}'
+        print(f'{n:>6} {knapsack_cap:>9} ' + ' '.join([f'{t:>12}' for t in times]))
+    print('Times in seconds; all solvers that ran found the same optimal value')
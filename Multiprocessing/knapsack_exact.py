@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 09:27:51 2026
+
+@author: jrbrad
+
+Exact 0/1 knapsack solvers to use in place of the exponential recursion in
+load_knapsack().  Every solver takes arrays of item volumes and values and
+the knapsack capacity and returns (optimal value, indices of packed items).
+
+    knapsack_dp    bottom-up dynamic program over capacity with NumPy; the
+                   take/skip choice of every (item, capacity) pair is kept
+                   as one bit (np.packbits) for reconstruction; requires
+                   integer volumes and O(n*cap/8) bytes
+    knapsack_memo  top-down version of m(i, capacity) with memoization;
+                   recursion depth grows with n, so keep n to a few thousand
+    knapsack_bb    depth-first branch and bound with the fractional
+                   (LP relaxation) bound; suited to large capacities
+
+solve() applies one of them to the things dictionary used by the harness.
+"""
+
+import bisect
+import functools
+import sys
+import numpy as np
+
+''' Largest choice table (bytes) that 'auto' will allocate for knapsack_dp '''
+dp_max_bytes = 256 * 1024**2
+
+def knapsack_dp(vol, val, cap):
+    vol = np.asarray(vol, dtype=np.int64)
+    val = np.asarray(val, dtype=np.float64)
+    cap = int(cap)
+    n = vol.shape[0]
+    if cap < 0:
+        return 0.0, []
+    best = np.zeros(cap + 1)
+    choice = np.zeros((n, (cap + 8)//8), dtype=np.uint8)
+    for i in range(n):
+        w, v = vol[i], val[i]
+        if w > cap or v <= 0:
+            continue
+        if w == 0:
+            best += v
+            choice[i] = 255
+            continue
+        cand = best[:-w] + v
+        take = cand > best[w:]
+        best[w:] = np.where(take, cand, best[w:])
+        choice[i] = np.packbits(np.concatenate((np.zeros(w, dtype=bool), take)), bitorder='little')
+    ''' Walk back through the choices from the full capacity '''
+    packed = []
+    c = cap
+    for i in range(n - 1, -1, -1):
+        if (choice[i, c >> 3] >> (c & 7)) & 1:
+            packed.append(i)
+            c -= vol[i]
+    packed.reverse()
+    return float(best[cap]), packed
+
+def knapsack_memo(vol, val, cap):
+    vol = list(vol)
+    val = list(val)
+    n = len(vol)
+
+    @functools.lru_cache(maxsize=None)
+    def m(i, capacity):
+        ''' optimal value using the first i items '''
+        if i == 0:
+            return 0
+        if capacity - vol[i - 1] < 0:
+            return m(i - 1, capacity)
+        return max(m(i - 1, capacity), m(i - 1, capacity - vol[i - 1]) + val[i - 1])
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 3*n + 100))
+    try:
+        value = m(n, cap)
+        ''' Reconstruct: item i is packed if it improves on skipping it '''
+        packed = []
+        capacity = cap
+        for i in range(n, 0, -1):
+            if capacity - vol[i - 1] >= 0 and m(i - 1, capacity - vol[i - 1]) + val[i - 1] > m(i - 1, capacity):
+                packed.append(i - 1)
+                capacity -= vol[i - 1]
+    finally:
+        sys.setrecursionlimit(limit)
+        m.cache_clear()
+    packed.reverse()
+    return value, packed
+
+def knapsack_bb(vol, val, cap):
+    vol = np.asarray(vol, dtype=np.float64)
+    val = np.asarray(val, dtype=np.float64)
+    ''' Items with no value never help; zero-volume items are always packed '''
+    free = np.flatnonzero((vol <= 0) & (val > 0))
+    cand = np.flatnonzero((vol > 0) & (vol <= cap) & (val > 0))
+    order = cand[np.argsort(-val[cand]/vol[cand], kind='stable')]
+    w = vol[order].tolist()
+    v = val[order].tolist()
+    n = len(order)
+    cum_w = np.concatenate(([0.0], np.cumsum(w))).tolist()
+    cum_v = np.concatenate(([0.0], np.cumsum(v))).tolist()
+
+    integral = bool(np.all(val[order] == np.round(val[order])))
+
+    def bound(k, room, value):
+        ''' LP bound for items k.. in ratio order with room capacity left
+            (rounded down when all values are integers) '''
+        j = bisect.bisect_right(cum_w, cum_w[k] + room) - 1
+        value += cum_v[j] - cum_v[k]
+        room -= cum_w[j] - cum_w[k]
+        if j < n:
+            value += v[j] * room / w[j]
+        return np.floor(value + 1e-9) if integral else value
+
+    ''' Greedy fill gives the first incumbent '''
+    best_value, best_take, room = 0.0, [], cap
+    for k in range(n):
+        if w[k] <= room:
+            best_take.append(k)
+            best_value += v[k]
+            room -= w[k]
+
+    ''' Depth-first search: take branch first, then skip branch '''
+    stack = [(0, cap, 0.0, ())]
+    while stack:
+        k, room, value, taken = stack.pop()
+        if value > best_value:
+            best_value, best_take = value, list(taken)
+        if k == n or bound(k, room, value) <= best_value:
+            continue
+        stack.append((k + 1, room, value, taken))
+        if w[k] <= room:
+            stack.append((k + 1, room - w[k], value + v[k], taken + (k,)))
+    packed = sorted(free.tolist() + order[best_take].tolist())
+    return best_value + val[free].sum(), packed
+
+def solve(things, knapsack_cap, mode='auto'):
+    ''' things: dictionary {item_id: (volume, value)} as passed to load_knapsack()
+        mode: 'dp', 'memo', 'bb' or 'auto' (dp when the volumes are integers
+              and the choice table fits in dp_max_bytes, bb otherwise)
+        returns (optimal value, list of item ids to pack) '''
+    keys = list(things.keys())
+    vol = np.array([things[k][0] for k in keys], dtype=np.float64)
+    val = np.array([things[k][1] for k in keys], dtype=np.float64)
+    if mode == 'auto':
+        integral = np.all(vol == np.round(vol)) and float(knapsack_cap) == int(knapsack_cap)
+        mode = 'dp' if integral and len(keys) * (int(knapsack_cap) + 8) / 8 <= dp_max_bytes else 'bb'
+    if mode == 'dp':
+        value, packed = knapsack_dp(vol.astype(np.int64), val, int(knapsack_cap))
+    elif mode == 'memo':
+        value, packed = knapsack_memo(vol.tolist(), val.tolist(), knapsack_cap)
+    else:
+        value, packed = knapsack_bb(vol, val, knapsack_cap)
+    return value, [keys[i] for i in packed]
@@ -6,12 +6,24 @@ Created on Tue Feb 20 14:11:57 2024
 """
 
 import numpy as np
+import os
+import sys
 import time
 import multiprocessing as mp
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Assignments', 'numpyDistance'))
+import dist_engine
+import shm_data
 
 def dist_mnist(size):
     p = np.load(f'data/mnist1_{size}.npy').astype(np.float32)
     q = np.load(f'data/mnist2_{size}.npy').astype(np.float32)
+    return dist_pq(p, q, size)
+
+def dist_mnist_shared(size):
+    ''' dist_mnist() with the images read from shared memory set up by shm_data.init_pool() '''
+    return dist_pq(shm_data.data[f'mnist1_{size}'], shm_data.data[f'mnist2_{size}'], size)
+
+def dist_pq(p, q, size):
     assert p.shape[0] == q.shape[0]
     assert p.shape[1] == 784
     assert q.shape[1] == 784
@@ -23,6 +35,13 @@ def dist_mnist(size):
             result[i][j] = np.sqrt(q[i]@q[i]-2*p[j]@q[i]+p[j]@p[j])
     print(f'Done with {size}')
     return result
+
+def knn_mnist(size, k=5):
+    ''' Indices and distances of the k nearest images in mnist1 for every image
+        in mnist2, without computing the full distance matrix '''
+    indices, distances = dist_engine.knn(f'data/mnist2_{size}.npy', f'data/mnist1_{size}.npy', k)
+    print(f'Done with {size}')
+    return indices, distances
     
 if __name__ == '__main__':    
     sizes = [1000, 100, 1000, 100, 10, 1000, 10] # [100 for _ in range(5)] 
@@ -39,4 +58,18 @@ if __name__ == '__main__':
     with mp.Pool(5) as pool:
       result = pool.map(dist_mnist, sizes)
     print(f'Exec. time for paallel execution: {time.time() - start}')
+
+    ''' Multiprocessing with each data set loaded once into shared memory '''
+    start = time.time()
+    files = {f'mnist{i}_{size}':f'data/mnist{i}_{size}.npy' for size in set(sizes) for i in (1, 2)}
+    with shm_data.shared(files, dtype=np.float32) as descriptors:
+        with mp.Pool(5, initializer=shm_data.init_pool, initargs=(descriptors,)) as pool:
+          result = pool.map(dist_mnist_shared, sizes)
+    print(f'Exec. time for parallel execution with shared memory: {time.time() - start}')
+
+    ''' k nearest neighbors only '''
+    start = time.time()
+    with mp.Pool(5) as pool:
+      result = pool.map(knn_mnist, sizes)
+    print(f'Exec. time for parallel k nearest neighbors: {time.time() - start}')
     
\ No newline at end of file